@@ -2,13 +2,11 @@
 Pacote principal do projeto Mod TurboTables em Python.
 """
 
-import re
-from importlib.metadata import PackageNotFoundError, version
-from pathlib import Path
-
-
 def _fallback_version() -> str:
     """Read version straight from pyproject.toml for uninstalled checkouts."""
+    import re
+    from pathlib import Path
+
     pyproject = Path(__file__).resolve().parent / "pyproject.toml"
     try:
         text = pyproject.read_text(encoding="utf-8")
@@ -18,7 +16,16 @@ def _fallback_version() -> str:
     return match.group(1) if match else "0.0.0"
 
 
-try:
-    __version__ = version("turbotab")
-except PackageNotFoundError:
-    __version__ = _fallback_version()
+def __getattr__(name: str) -> str:
+    # importlib.metadata custa dezenas de ms; só é carregado quando alguém
+    # pede __version__ (a CLI, por exemplo, só no --version).
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
+
+    global __version__
+    try:
+        __version__ = version("turbotab")
+    except PackageNotFoundError:
+        __version__ = _fallback_version()
+    return __version__
@@ -2,8 +2,26 @@
 Módulo para cálculos relacionados a agentes e métricas de atendimento.
 """
 
+import json
 import math
-from mod_turbotab.calculations.erlang import erlang_c, erlang_a
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterator, Tuple
+
+from mod_turbotab.calculations import instrumentation as _kernel_stats
+from mod_turbotab.calculations.erlang import (
+    erlang_a,
+    erlang_a_from_c,
+    erlang_b,
+    erlang_b_continuous,
+    erlang_b_iter,
+    erlang_b_profile,
+    erlang_c,
+    erlang_c_from_b,
+    extend_erlang_b_profile,
+)
+from mod_turbotab.calculations.instrumentation import timed
 from mod_turbotab.utils import secs, int_ceiling, min_max
 from mod_turbotab.exceptions import CalculationError, InputValidationError
 
@@ -11,7 +29,80 @@ from mod_turbotab.exceptions import CalculationError, InputValidationError
 # binário de ponto flutuante (ex.: 35.7/0.85 -> 42.00000000000001) faz o
 # ceil contratar um agente a mais e nega caps atingidos exatamente.
 _OCCUPANCY_EPSILON: float = 1e-9
-
+# Largura final (em agentes) do intervalo da raiz no modo contínuo de
+# fractional_agents.
+_CONTINUOUS_TOLERANCE: float = 1e-9
+_CONTINUOUS_MAX_STEPS: int = 100
+_TABLE_FORMAT: str = "turbotab.staffing_table"
+_TABLE_VERSION: int = 1
+# Passos de regula falsi antes da bisseção bit a bit em StaffingTable.
+_TABLE_SECANT_STEPS: int = 8
+
+def _sla_probe(traffic_rate: float, service_time: int, aht: int, patience: float = None) -> Callable[[int, float], float]:
+    """Critério de SLA de :func:`agents_required` em função de ``n`` e ``B(n, A)``."""
+
+    def _sla_at(n: int, b: float) -> float:
+        if traffic_rate / n >= 1:
+            return 0.0
+        c: float = erlang_c_from_b(n, traffic_rate, b)
+        if patience is not None:
+            ea: dict = erlang_a_from_c(n, traffic_rate, patience, aht, c)
+            return ea['sla'](service_time)
+        val: float = 1 - c * math.exp((traffic_rate - n) * service_time / aht)
+        return max(val, 0.0)
+
+    return _sla_at
+
+def _first_agents_meeting(sla: float, traffic_rate: float, sla_at: Callable[[int, float], float], guess: int = None) -> int:
+    """Menor ``n >= ⌈A⌉ + 1`` com ``sla_at(n, B(n, A)) >= sla``.
+
+    O SLA é monótono em n: uma única passada da recorrência de Erlang B,
+    parando no primeiro n que atende o alvo, substitui a bisseção que
+    refazia a recorrência inteira a cada sonda. Com ``guess`` (ex.: a
+    resposta de um intervalo vizinho), o critério só é avaliado a partir do
+    palpite — descendo pelos ``B(n)`` já percorridos ou subindo pela mesma
+    passada —, e não em todo ``n`` desde o piso; o resultado é o mesmo.
+
+    O palpite economiza apenas sondas de SLA: a recorrência de Erlang B
+    ainda parte de ``n = 1`` a cada chamada (o prefixo até o piso via
+    :func:`erlang_b`), porque o ``A`` muda entre intervalos e nenhum
+    ``B(n, A)`` do vizinho serve. Retomá-la no palpite exigiria um
+    ``B(guess, A)`` aproximado e perderia a igualdade bit a bit com
+    :func:`agents_required`.
+    """
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        sla_at = recorder.counting('agents_required', sla_at)
+    lo: int = max(1, int(math.ceil(traffic_rate)) + 1)
+    steps: Iterator[Tuple[int, float]] = erlang_b_iter(traffic_rate, start=lo)
+    if guess is not None and guess > lo:
+        history: list = []
+        for n, b in steps:
+            history.append(b)
+            if n == guess:
+                break
+        if sla_at(guess, history[-1]) >= sla:
+            n = guess
+            while n > lo and sla_at(n - 1, history[n - 1 - lo]) >= sla:
+                n -= 1
+            return n
+    for lo, b in steps:
+        if sla_at(lo, b) >= sla:
+            break
+    return lo
+
+def _occupancy_floor(traffic_rate: float, max_occupancy: float) -> int:
+    """``⌈A / max_occupancy⌉``, com a tolerância de arredondamento da ocupação."""
+    # Caps subnormais (ex.: 5e-324) estouram a divisão para inf; sem o
+    # guard o ceil vira OverflowError com mensagem críptica.
+    occupancy_floor_raw: float = traffic_rate / max_occupancy
+    if not math.isfinite(occupancy_floor_raw):
+        raise InputValidationError(
+            "max_occupancy is too small for the offered traffic (occupancy floor overflows)."
+        )
+    return int(math.ceil(occupancy_floor_raw - _OCCUPANCY_EPSILON))
+
+@timed
 def agents_required(sla: float, service_time: int, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None, max_occupancy: float = None) -> int:
     """Determina o número de agentes necessários para atingir o SLA desejado.
 
@@ -44,43 +135,218 @@ def agents_required(sla: float, service_time: int, contacts_per_interval: float,
         birth_rate: float = contacts_per_interval
         death_rate: float = interval / aht
         traffic_rate: float = birth_rate / death_rate
-
-        def _sla_at(n: int) -> float:
-            if traffic_rate / n >= 1:
-                return 0.0
-            if patience is not None:
-                ea: dict = erlang_a(n, traffic_rate, patience, aht)
-                return ea['sla'](service_time)
-            c: float = erlang_c(n, traffic_rate)
-            val: float = 1 - c * math.exp((traffic_rate - n) * service_time / aht)
-            return max(val, 0.0)
-
-        lo: int = max(1, int(math.ceil(traffic_rate)) + 1)
-        hi: int = lo
-        while _sla_at(hi) < sla:
-            hi *= 2
-        while lo < hi:
-            mid: int = (lo + hi) // 2
-            if _sla_at(mid) >= sla:
-                hi = mid
-            else:
-                lo = mid + 1
+        lo: int = _first_agents_meeting(sla, traffic_rate, _sla_probe(traffic_rate, service_time, aht, patience))
         if max_occupancy is not None:
-            # Caps subnormais (ex.: 5e-324) estouram a divisão para inf; sem o
-            # guard o ceil vira OverflowError com mensagem críptica.
-            occupancy_floor_raw: float = traffic_rate / max_occupancy
-            if not math.isfinite(occupancy_floor_raw):
-                raise InputValidationError(
-                    "max_occupancy is too small for the offered traffic (occupancy floor overflows)."
-                )
-            occupancy_floor: int = int(math.ceil(occupancy_floor_raw - _OCCUPANCY_EPSILON))
-            return max(lo, occupancy_floor)
+            return max(lo, _occupancy_floor(traffic_rate, max_occupancy))
         return lo
     except InputValidationError:
         raise
     except Exception as e:
         raise CalculationError(f"Error in agents_required: {str(e)}") from e
 
+def _float_bits(value: float) -> int:
+    """Padrão de bits de um float >= 0, monótono no valor (vizinhos diferem em 1)."""
+    return struct.unpack('<q', struct.pack('<d', value))[0]
+
+def _bits_float(bits: int) -> float:
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
+
+class StaffingTable:
+    """Tabela pré-calculada de :func:`agents_required` (Erlang C) para um objetivo fixo.
+
+    Para um objetivo ``(sla, service_time, aht)``, o número de agentes
+    requerido é uma função escada não decrescente da carga ofertada ``A``.
+    A tabela guarda, para cada ``n`` de 1 a ``max_agents``, o ponto de
+    quebra ``a_n``: o maior float ``A`` que ``n`` agentes atendem (com
+    ``n >= ⌈A⌉ + 1`` e SLA alcançado ``>= sla``). Uma consulta é uma busca
+    binária em ``a_1 <= a_2 <= ...`` e devolve o mesmo inteiro que
+    :func:`agents_required` — os pontos de quebra são exatos ao último bit,
+    não aproximações.
+
+    A construção parte, para cada ``n``, do intervalo ``[a_{n-1}, n - 1]``:
+    alguns passos de regula falsi sobre o SLA contínuo em ``A`` e, no fim,
+    bisseção sobre o padrão de bits dos floats até restarem dois vizinhos.
+
+    Args:
+        max_agents (int): Maior número de agentes da tabela (>= 1).
+        sla (float): Nível de serviço alvo (ex.: ``0.80``).
+        service_time (int): Tempo alvo de atendimento, em segundos.
+        aht (int): Duração média do contato, em segundos. O objetivo depende
+            de ``service_time / aht``; o par exato é guardado para que o
+            resultado coincida bit a bit com a busca direta.
+
+    Raises:
+        InputValidationError: Se os parâmetros forem inválidos.
+    """
+
+    def __init__(self, max_agents: int, sla: float, service_time: int, aht: int) -> None:
+        if int(max_agents) != max_agents or max_agents < 1:
+            raise InputValidationError("max_agents must be an integer >= 1.")
+        if sla < 0 or service_time < 0 or aht <= 0:
+            raise InputValidationError("Invalid parameters for StaffingTable.")
+        self.max_agents: int = int(max_agents)
+        self.sla: float = sla
+        self.service_time: int = service_time
+        self.aht: int = aht
+        self._breakpoints: array = self._build()
+
+    @property
+    def max_traffic(self) -> float:
+        """Maior carga ofertada (em erlangs) coberta pela tabela."""
+        return self._breakpoints[-1]
+
+    def _meets(self, count: int, intensity: float) -> Tuple[bool, float]:
+        """``(n atende A?, SLA(n, A) - sla)``, com o mesmo critério de :func:`agents_required`."""
+        sla_at = _sla_probe(intensity, self.service_time, self.aht)
+        gap: float = sla_at(count, erlang_b(count, intensity)) - min(self.sla, 1.0)
+        return intensity <= count - 1 and gap >= 0, gap
+
+    def _build(self) -> array:
+        """Calcula ``a_n`` para n = 1..max_agents, com o intervalo aquecido por ``a_{n-1}``."""
+        breakpoints: array = array('d')
+        previous: float = 0.0
+        meets_at: Callable[[int, float], Tuple[bool, float]] = self._meets
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            meets_at = recorder.counting('staffing_table', meets_at)
+        for count in range(1, self.max_agents + 1):
+            low: float = previous
+            high: float = float(count - 1)
+            meets, low_gap = meets_at(count, low)
+            if not meets:
+                # Só em empates de arredondamento: n não ganha carga nenhuma.
+                breakpoints.append(previous)
+                continue
+            meets, high_gap = meets_at(count, high)
+            if meets:
+                breakpoints.append(high)
+                previous = high
+                continue
+            # Regula falsi estreita o intervalo; a bisseção bit a bit fecha.
+            for _ in range(_TABLE_SECANT_STEPS):
+                if low_gap == high_gap:
+                    break
+                point: float = low + low_gap * (high - low) / (low_gap - high_gap)
+                if not low < point < high:
+                    break
+                meets, gap = meets_at(count, point)
+                if meets:
+                    low, low_gap = point, gap
+                else:
+                    high, high_gap = point, gap
+            low_bits: int = _float_bits(low)
+            high_bits: int = _float_bits(high)
+            while high_bits - low_bits > 1:
+                mid_bits: int = (low_bits + high_bits) // 2
+                if meets_at(count, _bits_float(mid_bits))[0]:
+                    low_bits = mid_bits
+                else:
+                    high_bits = mid_bits
+            previous = _bits_float(low_bits)
+            breakpoints.append(previous)
+        return breakpoints
+
+    def lookup(self, traffic_rate: float) -> int:
+        """Agentes requeridos para a carga ofertada ``traffic_rate`` (em erlangs).
+
+        Args:
+            traffic_rate (float): Carga ofertada, em ``[0, max_traffic]``.
+
+        Returns:
+            int: Número de agentes requeridos.
+
+        Raises:
+            InputValidationError: Se a carga estiver fora do intervalo coberto.
+        """
+        if not (0 <= traffic_rate <= self._breakpoints[-1]):
+            raise InputValidationError(
+                f"Offered load must be in the range [0, {self._breakpoints[-1]}] erlangs for this table."
+            )
+        return bisect_left(self._breakpoints, traffic_rate) + 1
+
+    def agents_required(self, contacts_per_interval: float, interval: float = 600.0, max_occupancy: float = None) -> int:
+        """Mesmo resultado de :func:`agents_required` para o objetivo da tabela, sem kernel.
+
+        Args:
+            contacts_per_interval (float): Contatos por intervalo.
+            interval (float, optional): Intervalo de planejamento em segundos. Padrão: 600 (10 minutos).
+            max_occupancy (float, optional): Ocupação máxima tolerada por agente (0 < x <= 1).
+
+        Returns:
+            int: Número de agentes requeridos.
+
+        Raises:
+            InputValidationError: Se os parâmetros forem inválidos ou a carga
+                estiver fora da tabela.
+        """
+        if contacts_per_interval < 0:
+            raise InputValidationError("Invalid parameters for agents_required.")
+        if max_occupancy is not None and not (0 < max_occupancy <= 1):
+            raise InputValidationError("max_occupancy must be in the range (0, 1].")
+        traffic_rate: float = contacts_per_interval / (interval / self.aht)
+        agents: int = self.lookup(traffic_rate)
+        if max_occupancy is not None:
+            return max(agents, _occupancy_floor(traffic_rate, max_occupancy))
+        return agents
+
+    def save(self, path: str) -> None:
+        """Grava a tabela em ``path`` (JSON), para reuso por :meth:`load`.
+
+        Args:
+            path (str): Caminho do arquivo de saída.
+        """
+        document: dict = {
+            "format": _TABLE_FORMAT,
+            "version": _TABLE_VERSION,
+            "sla": self.sla,
+            "service_time": self.service_time,
+            "aht": self.aht,
+            "breakpoints": list(self._breakpoints),
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "StaffingTable":
+        """Carrega uma tabela gravada por :meth:`save`.
+
+        Args:
+            path (str): Caminho do arquivo.
+
+        Returns:
+            StaffingTable: Tabela pronta para consulta, sem recalcular.
+
+        Raises:
+            InputValidationError: Se o arquivo não for uma tabela válida.
+        """
+        try:
+            with open(path, encoding="utf-8") as handle:
+                document: dict = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise InputValidationError(f"Could not read staffing table '{path}': {e}") from e
+        if (
+            not isinstance(document, dict)
+            or document.get("format") != _TABLE_FORMAT
+            or document.get("version") != _TABLE_VERSION
+        ):
+            raise InputValidationError(f"'{path}' is not a version {_TABLE_VERSION} staffing table.")
+        try:
+            breakpoints: array = array('d', document["breakpoints"])
+            sla: float = float(document["sla"])
+            service_time = document["service_time"]
+            aht = document["aht"]
+        except (KeyError, TypeError, ValueError) as e:
+            raise InputValidationError(f"'{path}' is not a valid staffing table: {e!r}") from e
+        if not breakpoints or any(a > b for a, b in zip(breakpoints, breakpoints[1:])):
+            raise InputValidationError(f"'{path}' has malformed breakpoints.")
+        table: StaffingTable = cls.__new__(cls)
+        table.max_agents = len(breakpoints)
+        table.sla = sla
+        table.service_time = service_time
+        table.aht = aht
+        table._breakpoints = breakpoints
+        return table
+
 def occupancy(agents: int, contacts_per_interval: float, aht: int, interval: float = 600.0) -> float:
     """Calcula a ocupação atual (A/N) para um número de agentes.
 
@@ -122,6 +388,7 @@ def is_within_occupancy(agents: int, contacts_per_interval: float, aht: int, max
     return occupancy(agents, contacts_per_interval, aht, interval=interval) <= max_occupancy + _OCCUPANCY_EPSILON
 
 
+@timed
 def asa(agents: float, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None) -> int:
     """Calcula o Average Speed of Answer (ASA) para um dado número de agentes.
 
@@ -158,6 +425,7 @@ def asa(agents: float, contacts_per_interval: float, aht: int, interval: float =
     except Exception as e:
         raise CalculationError(f"Error in asa: {str(e)}") from e
 
+@timed
 def agents_asa(asa_target: float, contacts_per_interval: float, aht: int, interval: float = 600.0) -> int:
     """Determina o número de agentes necessários para atingir o ASA alvo.
 
@@ -181,28 +449,26 @@ def agents_asa(asa_target: float, contacts_per_interval: float, aht: int, interv
         death_rate: float = interval / aht
         traffic_rate: float = birth_rate / death_rate
 
-        def _asa_at(n: int) -> float:
+        def _asa_at(n: int, b: float) -> float:
             utilisation: float = traffic_rate / n
             if utilisation >= 1:
                 return float('inf')
-            c: float = erlang_c(n, traffic_rate)
+            c: float = erlang_c_from_b(n, traffic_rate, b)
             answer_time: float = c / (n * death_rate * (1 - utilisation))
             return answer_time * interval
 
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            _asa_at = recorder.counting('agents_asa', _asa_at)
         lo: int = max(1, int(math.ceil(traffic_rate)) + 1)
-        hi: int = lo
-        while _asa_at(hi) > asa_target:
-            hi *= 2
-        while lo < hi:
-            mid: int = (lo + hi) // 2
-            if _asa_at(mid) <= asa_target:
-                hi = mid
-            else:
-                lo = mid + 1
+        for lo, b in erlang_b_iter(traffic_rate, start=lo):
+            if _asa_at(lo, b) <= asa_target:
+                break
         return lo
     except Exception as e:
         raise CalculationError(f"Error in agents_asa: {str(e)}") from e
 
+@timed
 def nb_agents(contacts_per_interval: float, avg_sa: float, avg_ht: int, interval: float = 600.0) -> int:
     """Calcula o número de agentes necessários com base no ASA médio.
 
@@ -225,15 +491,30 @@ def nb_agents(contacts_per_interval: float, avg_sa: float, avg_ht: int, interval
         birth_rate: float = contacts_per_interval
         death_rate: float = interval / avg_ht
         traffic_rate: float = birth_rate / death_rate
+
+        def _asa_at(n: int) -> int:
+            # Mesma aritmética de asa(), lendo B(n) do perfil em vez de
+            # refazer a recorrência a cada sonda.
+            utilisation: float = traffic_rate / n
+            if utilisation >= 1:
+                utilisation = 0.99
+            c: float = erlang_c_from_b(n, traffic_rate, profile[n])
+            return secs(c / (n * death_rate * (1 - utilisation)))
+
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            _asa_at = recorder.counting('nb_agents', _asa_at)
         lo: int = max(1, int(math.ceil(traffic_rate)) + 1)
         hi: int = lo
-        while asa(float(hi), contacts_per_interval, avg_ht, interval=interval) > avg_sa:
+        profile: array = erlang_b_profile(hi, traffic_rate)
+        while _asa_at(hi) > avg_sa:
             hi *= 2
             if hi > 65535:
                 raise CalculationError("Could not determine the number of agents with nb_agents.")
+            extend_erlang_b_profile(profile, traffic_rate, hi)
         while lo < hi:
             mid: int = (lo + hi) // 2
-            if asa(float(mid), contacts_per_interval, avg_ht, interval=interval) <= avg_sa:
+            if _asa_at(mid) <= avg_sa:
                 hi = mid
             else:
                 lo = mid + 1
@@ -241,6 +522,7 @@ def nb_agents(contacts_per_interval: float, avg_sa: float, avg_ht: int, interval
     except Exception as e:
         raise CalculationError(f"Error in nb_agents: {str(e)}") from e
 
+@timed
 def contact_capacity(no_agents: float, sla: float, service_time: int, aht: int, interval: float = 600.0) -> float:
     """Calcula o número máximo de contatos que podem ser atendidos pelos agentes mantendo o SLA.
 
@@ -263,15 +545,60 @@ def contact_capacity(no_agents: float, sla: float, service_time: int, aht: int,
     try:
         x_no_agent: int = int(no_agents)
         contacts: int = int_ceiling(interval / aht) * x_no_agent
-        x_agent: int = agents_required(sla, service_time, contacts, aht, interval=interval)
-        while x_agent > x_no_agent and contacts > 0:
-            contacts -= 1
-            x_agent = agents_required(sla, service_time, contacts, aht, interval=interval)
-        return float(contacts)
+
+        def _fits(volume: int) -> bool:
+            return agents_required(sla, service_time, volume, aht, interval=interval) <= x_no_agent
+
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            _fits = recorder.counting('contact_capacity', _fits)
+        if _fits(contacts):
+            return float(contacts)
+        # agents_required é monótono no volume: a resposta é o maior volume
+        # em [0, contacts) que cabe em x_no_agent — o mesmo que o decremento
+        # de um em um encontrava, com O(log contacts) buscas de staffing.
+        fits: int = 0
+        exceeds: int = contacts
+        while exceeds - fits > 1:
+            probe: int = (fits + exceeds) // 2
+            if _fits(probe):
+                fits = probe
+            else:
+                exceeds = probe
+        return float(fits)
     except Exception as e:
         raise CalculationError(f"Error in contact_capacity: {str(e)}") from e
 
-def fractional_agents(sla: float, service_time: int, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None, max_occupancy: float = None) -> float:
+def _continuous_root(gap: Callable[[float], float], low: float, low_gap: float, high: float, high_gap: float) -> float:
+    """Raiz de ``gap`` em ``[low, high]`` pelo método de Illinois (regula falsi modificada).
+
+    Supõe ``low_gap < 0 < high_gap`` e ``gap`` contínua e crescente; cada passo
+    custa uma avaliação e o intervalo nunca deixa de conter a raiz.
+    """
+    side: int = 0
+    for _ in range(_CONTINUOUS_MAX_STEPS):
+        if high - low <= _CONTINUOUS_TOLERANCE:
+            break
+        point: float = high - high_gap * (high - low) / (high_gap - low_gap)
+        if not low < point < high:
+            point = 0.5 * (low + high)
+        value: float = gap(point)
+        if value == 0:
+            return point
+        if value > 0:
+            high, high_gap = point, value
+            if side == 1:
+                low_gap *= 0.5
+            side = 1
+        else:
+            low, low_gap = point, value
+            if side == -1:
+                high_gap *= 0.5
+            side = -1
+    return high
+
+@timed
+def fractional_agents(sla: float, service_time: int, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None, max_occupancy: float = None, continuous: bool = False) -> float:
     """Calcula o número fracionário de agentes necessários para atingir o SLA desejado.
 
     Args:
@@ -286,6 +613,11 @@ def fractional_agents(sla: float, service_time: int, contacts_per_interval: floa
             Se None, mantém o comportamento original (sem teto de ocupação). Quando definido,
             o resultado é ``max(erlang, A / max_occupancy)`` — sem ceil, coerente com a
             filosofia do caminho fracionário de deixar todo arredondamento ao chamador.
+        continuous (bool, optional): Se True, resolve ``SLA(x) = sla`` sobre
+            :func:`~mod_turbotab.calculations.erlang.erlang_b_continuous` em vez
+            de interpolar linearmente entre ``n - 1`` e ``n`` agentes. O
+            resultado é suave e monótono no volume; pode ficar abaixo de
+            ``⌈A⌉ + 1``, o piso da busca inteira. Padrão: False.
 
     Returns:
         float: Número fracionário de agentes.
@@ -304,31 +636,46 @@ def fractional_agents(sla: float, service_time: int, contacts_per_interval: floa
         death_rate: float = interval / aht
         traffic_rate: float = birth_rate / death_rate
 
-        def _sla_at(n: int) -> float:
+        def _sla_at(n: int, b: float) -> float:
             if traffic_rate / n >= 1:
                 return 0.0
+            c: float = erlang_c_from_b(n, traffic_rate, b)
             if patience is not None:
-                ea: dict = erlang_a(n, traffic_rate, patience, aht)
+                ea: dict = erlang_a_from_c(n, traffic_rate, patience, aht, c)
                 return min_max(ea['sla'](service_time), 0.0, 1.0)
-            c: float = erlang_c(n, traffic_rate)
             val: float = 1 - c * math.exp((traffic_rate - n) * service_time / aht)
             return min_max(val, 0.0, 1.0)
 
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            _sla_at = recorder.counting('fractional_agents', _sla_at)
+        # Mesma passada única de agents_required, começando um agente antes
+        # para que o SLA de n - 1 (usado na interpolação) saia da mesma
+        # recorrência.
         lo: int = max(1, int(math.ceil(traffic_rate)) + 1)
-        hi: int = lo
-        while _sla_at(hi) < sla:
-            hi *= 2
-        while lo < hi:
-            mid: int = (lo + hi) // 2
-            if _sla_at(mid) >= sla:
-                hi = mid
-            else:
-                lo = mid + 1
         no_agents: int = lo
-        sl_queued: float = _sla_at(no_agents)
-        last_slq: float = _sla_at(no_agents - 1) if no_agents > 1 else 0.0
+        sl_queued: float = 0.0
+        last_slq: float = 0.0
+        for no_agents, b in erlang_b_iter(traffic_rate, start=max(1, lo - 1)):
+            sl_queued = _sla_at(no_agents, b)
+            if no_agents >= lo and sl_queued >= sla:
+                break
+            last_slq = sl_queued
         no_agents_sng: float = float(no_agents)
-        if sl_queued > sla and (sl_queued - last_slq) > 0:
+        if continuous:
+            if sl_queued > sla:
+                # Raiz entre o último inteiro que não atinge o SLA (ou A, onde
+                # o SLA vale 0) e no_agents.
+                low: float = float(no_agents - 1) if no_agents > lo else traffic_rate
+                low_gap: float = (last_slq if no_agents > lo else 0.0) - sla
+                no_agents_sng = _continuous_root(
+                    lambda x: _sla_at(x, erlang_b_continuous(x, traffic_rate)) - sla,
+                    low,
+                    low_gap,
+                    float(no_agents),
+                    sl_queued - sla,
+                )
+        elif sl_queued > sla and (sl_queued - last_slq) > 0:
             one_agent_effect: float = sl_queued - last_slq
             fract: float = sla - last_slq
             no_agents_sng = (fract / one_agent_effect) + (no_agents - 1)
@@ -347,18 +694,30 @@ def fractional_agents(sla: float, service_time: int, contacts_per_interval: floa
     except Exception as e:
         raise CalculationError(f"Error in fractional_agents: {str(e)}") from e
 
-def fractional_contact_capacity(no_agents: float, sla: float, service_time: int, aht: int, interval: float = 600.0) -> float:
+@timed
+def fractional_contact_capacity(no_agents: float, sla: float, service_time: int, aht: int, interval: float = 600.0, whole_contacts: bool = False) -> float:
     """Calcula o número máximo de contatos que podem ser atendidos por um número fracionário de agentes mantendo o SLA.
 
+    O staffing fracionário não é monótono no volume: logo após ``A`` cruzar
+    um inteiro, o piso ``ceil(A) + 1`` sobe e a interpolação de
+    :func:`fractional_agents` mergulha. Dentro de cada faixa de mesmo
+    ``ceil(A)`` ele é monótono, e o menor valor da faixa está no seu início.
+    A busca desce faixa a faixa a partir do teto, testando só o início de
+    cada uma, e bisseca dentro da primeira faixa que cabe — primeiro nos
+    inteiros (mesmo resultado da antiga varredura de um em um), depois em
+    contatos contínuos até ``1e-9`` relativo.
+
     Args:
         no_agents (float): Número fracionário de agentes disponíveis.
         sla (float): SLA alvo (ex: 0.85).
         service_time (int): Tempo alvo de atendimento (em segundos).
         aht (int): Duração média do contato (em segundos).
         interval (float, optional): Intervalo de planejamento em segundos. Padrão: 600 (10 minutos).
+        whole_contacts (bool, optional): Se True, retorna só contatos inteiros
+            (o piso da capacidade), como nas versões anteriores. Padrão: False.
 
     Returns:
-        float: Número máximo de contatos atendidos.
+        float: Número máximo de contatos atendidos (fracionário, ou inteiro com ``whole_contacts``).
 
     Raises:
         InputValidationError: Se os parâmetros forem inválidos.
@@ -368,11 +727,66 @@ def fractional_contact_capacity(no_agents: float, sla: float, service_time: int,
         raise InputValidationError("Invalid parameters for fractional_contact_capacity.")
     try:
         x_no_agent: float = no_agents
-        contacts: int = int_ceiling((interval / aht) * x_no_agent)
-        x_agent: float = fractional_agents(sla, service_time, contacts, aht, interval=interval)
-        while x_agent > x_no_agent and contacts > 0:
-            contacts -= 1
-            x_agent = fractional_agents(sla, service_time, contacts, aht, interval=interval)
-        return float(contacts)
+        death_rate: float = interval / aht
+
+        def _fits(contacts: float) -> bool:
+            return fractional_agents(sla, service_time, contacts, aht, interval=interval) <= x_no_agent
+
+        def _band(contacts: float) -> int:
+            # Mesma conta de fractional_agents para A, para as faixas coincidirem.
+            return math.ceil(contacts / death_rate)
+
+        def _band_start(band: int, floor_at: float, integral: bool) -> float:
+            # Menor ponto >= floor_at cuja faixa é ``band``.
+            x: float = max(floor_at, (band - 1) * death_rate)
+            if integral:
+                x = max(floor_at, float(math.floor(x)))
+                while _band(x) < band:
+                    x += 1
+                while x - 1 >= floor_at and _band(x - 1) >= band:
+                    x -= 1
+                return x
+            while _band(x) < band:
+                x = math.nextafter(x, math.inf)
+            while x > floor_at and _band(math.nextafter(x, -math.inf)) >= band:
+                x = math.nextafter(x, -math.inf)
+            return x
+
+        def _last_fit(lo: float, hi: float, integral: bool) -> float:
+            # Maior ponto de [lo, hi] que cabe, sabendo que lo cabe e que
+            # _fits é monótono no trecho.
+            if _fits(hi):
+                return hi
+            tolerance: float = 1 if integral else 1e-9 * max(1.0, hi)
+            while hi - lo > tolerance:
+                middle: float = (lo + hi) // 2 if integral else (lo + hi) / 2
+                if _fits(middle):
+                    lo = middle
+                else:
+                    hi = middle
+            return lo
+
+        def _search(lo: float, hi: float, integral: bool) -> float:
+            # Desce as faixas de hi até lo; devolve -1 se nenhum ponto cabe.
+            top: float = hi
+            while top >= lo:
+                start: float = _band_start(_band(top), lo, integral)
+                if _fits(start):
+                    return _last_fit(start, top, integral)
+                top = start - 1 if integral else math.nextafter(start, -math.inf)
+            return -1.0
+
+        recorder = _kernel_stats._active
+        if recorder is not None:
+            _fits = recorder.counting('fractional_contact_capacity', _fits)
+        contacts: int = int_ceiling(death_rate * x_no_agent)
+        whole: float = _search(0.0, float(contacts), integral=True)
+        if whole < 0:
+            return 0.0
+        if whole_contacts or whole == contacts:
+            return whole
+        # whole + 1 não cabe; a fronteira contínua está em [whole, whole + 1).
+        upper: float = math.nextafter(whole + 1, -math.inf)
+        return _search(whole, upper, integral=False)
     except Exception as e:
         raise CalculationError(f"Error in fractional_contact_capacity: {str(e)}") from e
@@ -0,0 +1,198 @@
+"""
+Planejamento intradiário: a cadeia de headcount para todos os intervalos de um dia.
+
+Um dia de 48-96 intervalos chamaria :func:`agents_required_with_shrinkage`
+uma vez por intervalo, cada busca partindo do zero. :func:`plan_intraday`
+resolve o dia numa chamada:
+
+- intervalos com o mesmo ``(volume, AHT)`` (madrugadas zeradas, platôs)
+  reaproveitam o resultado já calculado;
+- cada busca parte de um palpite derivado do intervalo vizinho, escalando o
+  excedente ``N - A`` por ``√A`` (staffing de raiz quadrada), e só avalia o
+  SLA em torno dele (a recorrência de Erlang B em si é refeita por
+  intervalo; o palpite poupa as sondas, não os passos).
+
+O resultado de cada intervalo é idêntico ao de :func:`agents_required`
+seguido de :func:`scheduled_agents` e :func:`rostered_agents`.
+:func:`iter_plan_intraday` faz o mesmo de forma preguiçosa, para
+arquivos de previsão grandes demais para a memória.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from mod_turbotab.agents.capacity import _first_agents_meeting, _occupancy_floor, _sla_probe
+from mod_turbotab.agents.roster import rostered_agents
+from mod_turbotab.agents.shrinkage import _validate_shrinkage, scheduled_agents
+from mod_turbotab.calculations.instrumentation import timed
+from mod_turbotab.exceptions import CalculationError, InputValidationError
+
+# Resultados ``(volume, AHT)`` guardados por iter_plan_intraday: o bastante
+# para os platôs de um dia, sem crescer com o tamanho do arquivo.
+_SOLVED_MAX_ENTRIES = 128
+
+
+def _warm_guess(traffic_rate: float, previous: Optional[tuple]) -> Optional[int]:
+    """Palpite para a busca do intervalo a partir do ``(A, N)`` do vizinho."""
+    if previous is None:
+        return None
+    previous_traffic, previous_agents = previous
+    if previous_traffic <= 0 or traffic_rate <= 0:
+        return None
+    excess: float = (previous_agents - previous_traffic) * math.sqrt(traffic_rate / previous_traffic)
+    return int(math.ceil(traffic_rate + excess))
+
+
+def iter_plan_intraday(
+    intervals: Iterable[Tuple[float, int]],
+    sla: float,
+    service_time: int,
+    interval: float = 600.0,
+    shrinkage: float = 0.0,
+    shifts: float = None,
+    patience: float = None,
+    max_occupancy: float = None,
+) -> Iterator[dict]:
+    """Gera a cadeia de headcount intervalo a intervalo, sem materializar o dia.
+
+    Versão preguiçosa de :func:`plan_intraday` para entradas grandes: cada
+    ``(contatos, aht)`` é consumido e resolvido antes do próximo, com o mesmo
+    palpite do vizinho e o mesmo reaproveitamento de ``(volume, AHT)``
+    repetidos, este limitado aos últimos ``_SOLVED_MAX_ENTRIES`` pares (LRU):
+    a memória não cresce com o arquivo. Quem chama reinicia o estado a cada
+    fila/dia chamando de novo.
+
+    Args:
+        intervals (Iterable[tuple[float, int]]): Pares ``(contatos, aht)`` em ordem.
+        sla (float): Nível de serviço alvo (ex.: ``0.80``).
+        service_time (int): Tempo alvo de atendimento, em segundos.
+        interval (float, optional): Duração de cada intervalo em segundos. Padrão: 600.
+        shrinkage (float, optional): Shrinkage combinado em ``[0.0, 1.0)``. Padrão: 0.0.
+        shifts (float, optional): Multiplicador de turnos (``>= 1.0``); se
+            informado, inclui ``rostered_agents``. Padrão: None.
+        patience (float, optional): Paciência média para Erlang A. ``None``
+            usa Erlang C puro.
+        max_occupancy (float, optional): Ocupação máxima tolerada por agente
+            (0 < x <= 1). ``None`` desativa o teto de ocupação.
+
+    Yields:
+        dict: ``contacts_per_interval``, ``aht``, ``productive_agents``,
+            ``scheduled_agents`` (e ``rostered_agents``) de cada intervalo.
+
+    Raises:
+        InputValidationError: Se os parâmetros ou algum intervalo forem inválidos.
+        CalculationError: Se ocorrer erro durante o cálculo.
+    """
+    if sla < 0 or service_time < 0:
+        raise InputValidationError("Invalid parameters for plan_intraday.")
+    if max_occupancy is not None and not (0 < max_occupancy <= 1):
+        raise InputValidationError("max_occupancy must be in the range (0, 1].")
+    _validate_shrinkage(shrinkage)
+    target: float = min(sla, 1.0)
+    solved: OrderedDict = OrderedDict()
+    previous: Optional[tuple] = None
+    for index, (volume, aht) in enumerate(intervals):
+        if volume < 0 or aht <= 0:
+            raise InputValidationError(f"Invalid parameters for plan_intraday (interval {index}).")
+        try:
+            key: tuple = (float(volume), aht)
+            productive: Optional[int] = solved.get(key)
+            traffic_rate: float = volume / (interval / aht)
+            if productive is not None:
+                solved.move_to_end(key)
+            else:
+                productive = _first_agents_meeting(
+                    target,
+                    traffic_rate,
+                    _sla_probe(traffic_rate, service_time, aht, patience),
+                    guess=_warm_guess(traffic_rate, previous),
+                )
+                if max_occupancy is not None:
+                    productive = max(productive, _occupancy_floor(traffic_rate, max_occupancy))
+                solved[key] = productive
+                if len(solved) > _SOLVED_MAX_ENTRIES:
+                    solved.popitem(last=False)
+            previous = (traffic_rate, productive)
+            scheduled: int = scheduled_agents(productive, shrinkage)
+            row: dict = {
+                'contacts_per_interval': volume,
+                'aht': aht,
+                'productive_agents': productive,
+                'scheduled_agents': scheduled,
+            }
+            if shifts is not None:
+                row['rostered_agents'] = rostered_agents(scheduled, shifts)
+        except InputValidationError:
+            raise
+        except Exception as e:
+            raise CalculationError(f"Error in plan_intraday: {str(e)}") from e
+        yield row
+
+
+@timed
+def plan_intraday(
+    contacts: Sequence[float],
+    ahts: Union[int, Sequence[int]],
+    sla: float,
+    service_time: int,
+    interval: float = 600.0,
+    shrinkage: float = 0.0,
+    shifts: float = None,
+    patience: float = None,
+    max_occupancy: float = None,
+) -> dict:
+    """Calcula a cadeia de headcount de cada intervalo do dia e os totais diários.
+
+    Args:
+        contacts (Sequence[float]): Contatos de cada intervalo, em ordem.
+        ahts (int | Sequence[int]): AHT (em segundos) de cada intervalo, ou um
+            único AHT para o dia todo.
+        sla (float): Nível de serviço alvo (ex.: ``0.80``).
+        service_time (int): Tempo alvo de atendimento, em segundos.
+        interval (float, optional): Duração de cada intervalo em segundos. Padrão: 600.
+        shrinkage (float, optional): Shrinkage combinado em ``[0.0, 1.0)``. Padrão: 0.0.
+        shifts (float, optional): Multiplicador de turnos (``>= 1.0``); se
+            informado, inclui ``rostered_agents``. Padrão: None.
+        patience (float, optional): Paciência média para Erlang A. ``None``
+            usa Erlang C puro.
+        max_occupancy (float, optional): Ocupação máxima tolerada por agente
+            (0 < x <= 1). ``None`` desativa o teto de ocupação.
+
+    Returns:
+        dict: ``intervals``, uma lista com ``contacts_per_interval``, ``aht``,
+            ``productive_agents``, ``scheduled_agents`` (e ``rostered_agents``)
+            por intervalo, e ``totals``, com a soma de contatos e de cada
+            headcount (em agentes-intervalo).
+
+    Raises:
+        InputValidationError: Se os parâmetros forem inválidos.
+        CalculationError: Se ocorrer erro durante o cálculo.
+    """
+    ahts = [ahts] * len(contacts) if isinstance(ahts, (int, float)) else list(ahts)
+    if len(ahts) != len(contacts):
+        raise InputValidationError(
+            f"contacts and ahts must have the same length. Received: {len(contacts)} and {len(ahts)}."
+        )
+    # Valida o dia inteiro antes de calcular: nenhum resultado parcial.
+    for index, (volume, aht) in enumerate(zip(contacts, ahts)):
+        if volume < 0 or aht <= 0:
+            raise InputValidationError(f"Invalid parameters for plan_intraday (interval {index}).")
+    rows: list = list(iter_plan_intraday(
+        zip(contacts, ahts),
+        sla,
+        service_time,
+        interval=interval,
+        shrinkage=shrinkage,
+        shifts=shifts,
+        patience=patience,
+        max_occupancy=max_occupancy,
+    ))
+    totals: dict = {
+        'contacts_per_interval': sum(row['contacts_per_interval'] for row in rows),
+        'productive_agents': sum(row['productive_agents'] for row in rows),
+        'scheduled_agents': sum(row['scheduled_agents'] for row in rows),
+    }
+    if shifts is not None:
+        totals['rostered_agents'] = sum(row['rostered_agents'] for row in rows)
+    return {'intervals': rows, 'totals': totals}
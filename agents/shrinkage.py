@@ -14,6 +14,7 @@ Este módulo implementa a **Opção A** (ajuste pós-cálculo) do spec da issue
 import math
 
 from mod_turbotab.agents.capacity import agents_required
+from mod_turbotab.calculations.instrumentation import timed
 from mod_turbotab.exceptions import InputValidationError
 
 # Tolerância para divisões exatas que estouram o teto por erro de float
@@ -174,6 +175,7 @@ def shrinkage_factor(
     return total
 
 
+@timed
 def agents_required_with_shrinkage(
     sla: float,
     service_time: int,
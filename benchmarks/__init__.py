@@ -0,0 +1,5 @@
+"""
+Suíte de benchmarks do mod_turbotab (fora do pacote distribuído).
+
+Execute com ``python benchmarks/run.py``; veja :mod:`benchmarks.run`.
+"""
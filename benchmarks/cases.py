@@ -0,0 +1,186 @@
+"""
+Casos de benchmark: kernels, buscas de staffing e pontos de entrada da CLI.
+
+Cada caso é um par ``(nome, fábrica)``; a fábrica monta as entradas e devolve
+a função sem argumentos que será cronometrada, de modo que a preparação
+(importar módulos, gerar o stdin do batch) fica fora da medição. Os nomes são
+estáveis: são as chaves comparadas contra a baseline.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Diretório que contém o pacote mod_turbotab (o pai do checkout).
+PACKAGE_PARENT: Path = Path(__file__).resolve().parents[2]
+
+# (servidores, intensidade) por porte do kernel.
+KERNEL_SIZES: Tuple[Tuple[str, int, float], ...] = (
+    ("small", 10, 8.0),
+    ("medium", 200, 180.0),
+    ("huge", 20000, 19800.0),
+)
+
+# Linhas do stdin dos casos de batch (cenários de staffing variados).
+BATCH_LINES: int = 2000
+
+
+def _kernel_cases() -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    from mod_turbotab.calculations.erlang import erlang_a, erlang_b, erlang_b_large, erlang_c
+
+    cases: list = []
+    for size, servers, intensity in KERNEL_SIZES:
+        cases.append((f"erlang.b.{size}", lambda s=servers, a=intensity: lambda: erlang_b(s, a)))
+        cases.append((f"erlang.c.{size}", lambda s=servers, a=intensity: lambda: erlang_c(s, a)))
+        cases.append((f"erlang.a.{size}", lambda s=servers, a=intensity: lambda: erlang_a(s, a, 60, 180)))
+    cases.append(("erlang.b_large.1e6", lambda: lambda: erlang_b_large(1_000_000, 999_000.0)))
+    return cases
+
+
+def _staffing_cases() -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    from mod_turbotab.agents.capacity import agents_required, contact_capacity, fractional_agents
+
+    variants: tuple = (
+        ("plain", {}),
+        ("patience", {"patience": 60}),
+        ("max_occupancy", {"max_occupancy": 0.85}),
+    )
+    cases: list = []
+    for volume_name, volume in (("medium", 25), ("large", 2000)):
+        for variant, extra in variants:
+            cases.append((
+                f"staffing.agents_required.{volume_name}.{variant}",
+                lambda v=volume, kw=extra: lambda: agents_required(0.80, 20, v, 180, **kw),
+            ))
+            cases.append((
+                f"staffing.fractional_agents.{volume_name}.{variant}",
+                lambda v=volume, kw=extra: lambda: fractional_agents(0.80, 20, v, 180, **kw),
+            ))
+    cases.append((
+        "staffing.fractional_agents.medium.continuous",
+        lambda: lambda: fractional_agents(0.80, 20, 25, 180, continuous=True),
+    ))
+    cases.append(("staffing.contact_capacity.medium", lambda: lambda: contact_capacity(11, 0.80, 20, 180)))
+    cases.append(("staffing.contact_capacity.large", lambda: lambda: contact_capacity(620, 0.80, 20, 180)))
+    return cases
+
+
+def _other_cases() -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    from mod_turbotab.calculations.multi_skill import MultiSkillPlanner, _allocate_pools, agents_required_multi
+    from mod_turbotab.calculations.traffic import traffic
+    from mod_turbotab.simulation.multi_skill import simulate_multi_skill
+    from mod_turbotab.trunks.trunks import number_trunks
+
+    groups: list = [
+        {"name": "billing", "contacts_per_interval": 25, "aht": 180},
+        {"name": "tech", "contacts_per_interval": 20, "aht": 240},
+        {"name": "sales", "contacts_per_interval": 40, "aht": 300},
+    ]
+    pools: list = [
+        {"skills": ["billing"], "count": 8},
+        {"skills": ["tech"], "count": 9},
+        {"skills": ["sales"], "count": 20},
+        {"skills": ["billing", "tech"], "count": 6},
+        {"skills": ["tech", "sales"], "count": 4},
+    ]
+    return [
+        ("trunks.number_trunks.medium", lambda: lambda: number_trunks(200, 180.0)),
+        ("trunks.number_trunks.large", lambda: lambda: number_trunks(5000, 4900.0)),
+        ("traffic.traffic.medium", lambda: lambda: traffic(200, 0.01)),
+        ("traffic.traffic.large", lambda: lambda: traffic(5000, 0.01)),
+        ("multi_skill.agents_required_multi", lambda: lambda: agents_required_multi(groups, pools, 0.80, 20)),
+        ("multi_skill.allocation.1800_pools", lambda: _allocation_case(_allocate_pools)),
+        ("multi_skill.planner.set_pool_count", lambda: _what_if(MultiSkillPlanner(groups, pools, 0.80, 20))),
+        (
+            "simulation.multi_skill.2_replications",
+            lambda: lambda: simulate_multi_skill(groups, pools, 20, intervals=2, replications=2),
+        ),
+    ]
+
+
+def _allocation_case(allocate: Callable[[list, list], object]) -> Callable[[], object]:
+    # Escala de produção: 1.800 pools (combinações distintas de skills) e
+    # 120 skills, com demandas já ajustadas — só o fluxo máximo é medido.
+    import random
+
+    rng = random.Random(1800)
+    per_skill: list = [{"name": f"s{i}", "adjusted_hc": 20 * rng.randint(0, 30)} for i in range(120)]
+    names: list = [s["name"] for s in per_skill]
+    pools: list = [{"skills": rng.sample(names, rng.randint(1, 4)), "count": rng.randint(0, 15)} for _ in range(1800)]
+    return lambda: allocate(per_skill, pools)
+
+
+def _what_if(planner: object) -> Callable[[], object]:
+    # Alterna o pool compartilhado entre cobrir e não cobrir o requisito, de
+    # modo que cada chamada cancele ou reencaminhe fluxo.
+    counts: list = [6, 1]
+
+    def toggle() -> object:
+        counts.reverse()
+        return planner.set_pool_count(3, counts[0])
+
+    return toggle
+
+
+def _run_cli(*args: str, stdin: bytes = None) -> Callable[[], object]:
+    command: list = [sys.executable, *args]
+    env: dict = {**os.environ, "PYTHONPATH": str(PACKAGE_PARENT)}
+
+    def run() -> object:
+        return subprocess.run(
+            command,
+            input=stdin,
+            stdout=subprocess.DEVNULL,
+            cwd=PACKAGE_PARENT,
+            env=env,
+            check=True,
+        )
+
+    return run
+
+
+def _batch_stdin() -> bytes:
+    lines: list = []
+    for index in range(BATCH_LINES):
+        inputs: dict = {
+            "sla": 0.80,
+            "service_time": 20,
+            "contacts_per_interval": 10 + index % 400,
+            "aht": 120 + 30 * (index % 7),
+            "shrinkage": 0.3,
+        }
+        lines.append(json.dumps({"calculation": "staffing.required", "inputs": inputs}))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _cli_cases() -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    return [
+        # Piso do interpretador: desconta-se dele o custo de importar a CLI.
+        ("cli.python_startup", lambda: _run_cli("-c", "pass")),
+        ("cli.cold_start.help", lambda: _run_cli("-m", "mod_turbotab.cli", "--help")),
+        (
+            "cli.cold_start.erlang_b",
+            lambda: _run_cli("-m", "mod_turbotab.cli", "erlang", "b", "--servers", "10", "--intensity", "8", "--json"),
+        ),
+        (
+            "cli.cold_start.staffing_required",
+            lambda: _run_cli(
+                "-m", "mod_turbotab.cli", "staffing", "required", "--sla", "0.80", "--service-time", "20",
+                "--contacts-per-interval", "25", "--aht", "180", "--shrinkage", "0.3", "--json",
+            ),
+        ),
+        ("cli.batch.workers=1", lambda: _run_cli("-m", "mod_turbotab.cli", "batch", stdin=_batch_stdin())),
+        # Um worker por CPU: comparado a workers=1, mede a escala do pool.
+        (
+            "cli.batch.workers=all",
+            lambda: _run_cli("-m", "mod_turbotab.cli", "batch", "--workers", "0", stdin=_batch_stdin()),
+        ),
+    ]
+
+
+def all_cases() -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    """Lista todos os casos ``(nome, fábrica)`` na ordem de execução."""
+    return [*_kernel_cases(), *_staffing_cases(), *_other_cases(), *_cli_cases()]
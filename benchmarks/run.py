@@ -0,0 +1,234 @@
+"""
+Executa a suíte de benchmarks e compara com uma baseline salva.
+
+Cada caso é calibrado para rodar ao menos ``--min-time`` segundos por
+repetição e repetido ``--repeat`` vezes; o JSON guarda o melhor e a mediana
+do tempo por chamada. A comparação usa o melhor tempo, o menos sensível a
+ruído do sistema, e falha (status 1) quando algum caso fica mais lento que
+a baseline além de ``--threshold``.
+
+Uso típico::
+
+    python benchmarks/run.py --output baseline.json
+    python benchmarks/run.py --baseline baseline.json --threshold 0.10
+    python benchmarks/run.py --select 'erlang.*' --select 'staffing.*'
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+RESULTS_FORMAT: str = "turbotab.benchmarks"
+RESULTS_VERSION: int = 1
+DEFAULT_REPEAT: int = 5
+DEFAULT_MIN_TIME: float = 0.1
+DEFAULT_THRESHOLD: float = 0.10
+
+
+def measure(func: Callable[[], object], repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME) -> dict:
+    """Cronometra ``func`` com ``time.perf_counter``.
+
+    O número de chamadas por repetição dobra até a repetição durar ao menos
+    ``min_time`` segundos (chamadas lentas, como subprocessos da CLI, rodam
+    uma vez por repetição).
+
+    Args:
+        func (Callable[[], object]): Função sem argumentos a medir.
+        repeat (int, optional): Número de repetições. Padrão: 5.
+        min_time (float, optional): Duração mínima de cada repetição, em segundos. Padrão: 0.1.
+
+    Returns:
+        dict: ``best`` e ``median`` (segundos por chamada), ``number`` e ``repeat``.
+    """
+    number: int = 1
+    while True:
+        start: float = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed: float = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings: list = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _environment() -> dict:
+    import mod_turbotab
+
+    return {
+        "turbotab": mod_turbotab.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_cases(cases: list, repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME, log: Optional[Callable[[str], None]] = None) -> dict:
+    """Mede cada caso ``(nome, fábrica)`` e monta o documento de resultados.
+
+    Args:
+        cases (list): Pares ``(nome, fábrica)``, como em :func:`benchmarks.cases.all_cases`.
+        repeat (int, optional): Repetições por caso. Padrão: 5.
+        min_time (float, optional): Duração mínima de cada repetição, em segundos. Padrão: 0.1.
+        log (Callable[[str], None], optional): Recebe uma linha de progresso por caso.
+
+    Returns:
+        dict: Documento JSON com ``format``, ``version``, ``environment`` e ``results``.
+    """
+    results: dict = {}
+    for name, factory in cases:
+        results[name] = measure(factory(), repeat=repeat, min_time=min_time)
+        if log is not None:
+            log(f"{name:<52} {_format_seconds(results[name]['best']):>10}")
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "environment": _environment(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Compara dois documentos de resultados pelo melhor tempo de cada caso.
+
+    Args:
+        current (dict): Resultados da execução atual.
+        baseline (dict): Resultados de referência.
+        threshold (float, optional): Variação relativa tolerada (``0.10`` = 10%). Padrão: 0.10.
+
+    Returns:
+        list[dict]: Uma linha por caso com ``name``, ``baseline``, ``current``,
+            ``ratio`` (atual/baseline) e ``status``: ``"regression"``,
+            ``"improvement"``, ``"ok"``, ``"new"`` (só na execução atual) ou
+            ``"missing"`` (só na baseline).
+    """
+    for document in (current, baseline):
+        if document.get("format") != RESULTS_FORMAT or document.get("version") != RESULTS_VERSION:
+            raise ValueError(f"Not a {RESULTS_FORMAT} v{RESULTS_VERSION} results file.")
+    now: dict = current["results"]
+    before: dict = baseline["results"]
+    rows: list = []
+    for name in [*now, *(name for name in before if name not in now)]:
+        old: Optional[float] = before[name]["best"] if name in before else None
+        new: Optional[float] = now[name]["best"] if name in now else None
+        ratio: Optional[float] = new / old if old and new is not None else None
+        if old is None:
+            status: str = "new"
+        elif new is None:
+            status = "missing"
+        elif ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": old, "current": new, "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def _format_comparison(rows: list) -> str:
+    lines: list = [f"{'case':<52} {'baseline':>10} {'current':>10} {'ratio':>7}  status"]
+    for row in rows:
+        ratio: str = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        lines.append(
+            f"{row['name']:<52} {_format_seconds(row['baseline']):>10} "
+            f"{_format_seconds(row['current']):>10} {ratio:>7}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks/run.py",
+        description="Run the mod_turbotab benchmark suite and compare against a baseline.",
+    )
+    parser.add_argument("--select", action="append", metavar="PATTERN", help="Only run cases matching this glob (repeatable).")
+    parser.add_argument("--list", action="store_true", help="List case names and exit.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Repetitions per case (default {DEFAULT_REPEAT}).")
+    parser.add_argument(
+        "--min-time", type=float, default=DEFAULT_MIN_TIME,
+        help=f"Minimum seconds per repetition (default {DEFAULT_MIN_TIME}).",
+    )
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument("--baseline", help="Compare against a previous JSON results file.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative slowdown reported as a regression (default {DEFAULT_THRESHOLD}).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    from mod_turbotab.benchmarks.cases import all_cases
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or args.min_time < 0 or args.threshold < 0:
+        parser.error("--repeat must be >= 1; --min-time and --threshold must be >= 0.")
+    def selected(name: str) -> bool:
+        return not args.select or any(fnmatch.fnmatchcase(name, pattern) for pattern in args.select)
+
+    cases: list = [case for case in all_cases() if selected(case[0])]
+    if args.list:
+        print("\n".join(name for name, _ in cases))
+        return 0
+    if not cases:
+        parser.error("no benchmark case matches --select.")
+    baseline: Optional[dict] = None
+    if args.baseline:
+        # Lida antes de medir: um caminho errado não deve custar a suíte inteira.
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("format") != RESULTS_FORMAT or baseline.get("version") != RESULTS_VERSION:
+            parser.error(f"{args.baseline} is not a {RESULTS_FORMAT} v{RESULTS_VERSION} results file.")
+        # Casos fora do --select não contam como "missing".
+        baseline["results"] = {name: value for name, value in baseline["results"].items() if selected(name)}
+
+    document: dict = run_cases(cases, repeat=args.repeat, min_time=args.min_time, log=lambda line: print(line, file=sys.stderr))
+    text: str = json.dumps(document, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    if baseline is None:
+        return 0
+    rows: list = compare(document, baseline, threshold=args.threshold)
+    print(_format_comparison(rows), file=sys.stderr)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
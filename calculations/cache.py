@@ -0,0 +1,153 @@
+"""
+Cache opcional e limitado para os kernels escalares de Erlang.
+
+Planejamentos reavaliam os mesmos pares ``(servidores, intensidade)`` o tempo
+todo — intervalos vizinhos com o mesmo volume, métricas de fila calculadas
+em sequência para o mesmo staffing. Com um :class:`KernelCache` ativo,
+:func:`~mod_turbotab.calculations.erlang.erlang_b`,
+:func:`~mod_turbotab.calculations.erlang.erlang_c` e
+:func:`~mod_turbotab.calculations.erlang.erlang_a` consultam o cache antes de
+calcular. Sem cache ativo (o padrão) o custo é uma leitura de atributo.
+
+Uso típico::
+
+    with KernelCache(maxsize=4096) as cache:
+        plan = [queue_time(...) for interval in day]
+    cache.stats()  # {'hits': ..., 'misses': ..., 'evictions': ..., ...}
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from mod_turbotab.exceptions import InputValidationError
+
+# Políticas de remoção aceitas por KernelCache.
+EVICTION_POLICIES: tuple = ("lru", "fifo")
+DEFAULT_MAXSIZE: int = 4096
+
+# Cache consultado pelos kernels; None desliga a memoização.
+_active: Optional["KernelCache"] = None
+_MISSING: Any = object()
+
+class KernelCache:
+    """Cache limitado de resultados dos kernels de Erlang, com estatísticas.
+
+    As chaves são normalizadas pelos kernels (ex.: Erlang B usa ``int(servers)``,
+    pois só a parte inteira entra na recorrência), de modo que ``10`` e
+    ``10.0`` compartilham a mesma entrada. Os contadores acumulam até
+    :meth:`clear` e podem ser exportados com :meth:`stats`.
+
+    Também é um gerenciador de contexto: dentro do ``with`` ele é o cache
+    ativo; na saída, o cache anterior (ou nenhum) volta a valer.
+
+    Args:
+        maxsize (int, optional): Número máximo de entradas (>= 1). Padrão: 4096.
+        policy (str, optional): ``"lru"`` remove a entrada usada há mais tempo;
+            ``"fifo"`` remove a inserida há mais tempo, sem reordenar em
+            acertos. Padrão: ``"lru"``.
+
+    Raises:
+        InputValidationError: Se ``maxsize`` ou ``policy`` forem inválidos.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, policy: str = "lru") -> None:
+        if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 1:
+            raise InputValidationError("maxsize must be an integer >= 1.")
+        if policy not in EVICTION_POLICIES:
+            raise InputValidationError(f"policy must be one of {', '.join(EVICTION_POLICIES)}.")
+        self.maxsize: int = maxsize
+        self.policy: str = policy
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        # O modo serve atende conexões em threads; a ordem do OrderedDict
+        # precisa de exclusão mútua entre consulta e remoção.
+        self._lock: threading.Lock = threading.Lock()
+        self._previous: list = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Devolve o valor de ``key`` ou o sentinela interno, contando acerto/falha."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Guarda ``value`` em ``key``, removendo a entrada mais antiga se o cache estiver cheio."""
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = value
+                return
+            if len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._entries[key] = value
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """Retorna os contadores para exportação de métricas.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``size``, ``maxsize``
+                e ``hit_rate`` (0.0 quando ainda não houve consultas).
+        """
+        with self._lock:
+            lookups: int = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __enter__(self) -> "KernelCache":
+        global _active
+        self._previous.append(_active)
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        global _active
+        _active = self._previous.pop()
+
+def enable_cache(maxsize: int = DEFAULT_MAXSIZE, policy: str = "lru") -> KernelCache:
+    """Ativa um novo cache global para os kernels e o retorna.
+
+    Args:
+        maxsize (int, optional): Número máximo de entradas. Padrão: 4096.
+        policy (str, optional): ``"lru"`` ou ``"fifo"``. Padrão: ``"lru"``.
+
+    Returns:
+        KernelCache: O cache ativo, para consulta de :meth:`KernelCache.stats`.
+    """
+    global _active
+    _active = KernelCache(maxsize, policy)
+    return _active
+
+def disable_cache() -> None:
+    """Desativa a memoização dos kernels (o cache ativo é descartado)."""
+    global _active
+    _active = None
+
+def active_cache() -> Optional[KernelCache]:
+    """Retorna o cache em uso pelos kernels, ou None se a memoização estiver desligada."""
+    return _active
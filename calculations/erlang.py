@@ -3,6 +3,13 @@ Módulo que contém funções relacionadas às fórmulas de Erlang.
 """
 
 import math
+import sys
+from array import array
+from typing import Any, Iterator, Sequence, Tuple, Union
+
+from mod_turbotab.calculations import cache as _kernel_cache
+from mod_turbotab.calculations import instrumentation as _kernel_stats
+from mod_turbotab.exceptions import InputValidationError
 from mod_turbotab.utils import min_max
 
 def erlang_b(servers: float, intensity: float) -> float:
@@ -18,11 +25,320 @@ def erlang_b(servers: float, intensity: float) -> float:
     if servers < 0 or intensity < 0:
         return 0.0
     max_iterate: int = int(servers)
+    recorder = _kernel_stats._active
+    store = _kernel_cache._active
+    if store is not None:
+        # Só a parte inteira de servers entra na recorrência.
+        key: tuple = ('b', max_iterate, float(intensity))
+        cached = store.get(key)
+        if cached is not _kernel_cache._MISSING:
+            if recorder is not None:
+                recorder.kernel('erlang_b')
+            return cached
+    if recorder is not None:
+        recorder.kernel('erlang_b', max_iterate)
     last: float = 1.0
     for count in range(1, max_iterate + 1):
         b: float = (intensity * last) / (count + intensity * last)
         last = b
-    return min_max(b, 0.0, 1.0)
+    b = min_max(b, 0.0, 1.0)
+    if store is not None:
+        store.put(key, b)
+    return b
+
+def erlang_b_iter(intensity: float, start: int = 1) -> Iterator[Tuple[int, float]]:
+    """Percorre a recorrência de Erlang B uma única vez, de ``start`` para cima.
+
+    Gera ``(n, B(n, A))`` para ``n = start, start + 1, ...`` sem recalcular o
+    prefixo a cada passo: buscas de dimensionamento avaliam o critério em
+    cada ``n`` e param no primeiro que o atende, em vez de chamar
+    :func:`erlang_b` do zero para cada sonda. Os valores são bit a bit
+    idênticos aos de ``erlang_b(n, intensity)``.
+
+    Args:
+        intensity (float): Taxa de tráfego.
+        start (int, optional): Primeiro número de servidores gerado (>= 1).
+            O prefixo ``B(start - 1)`` é calculado uma única vez. Padrão: 1.
+
+    Yields:
+        tuple[int, float]: Número de servidores e probabilidade de bloqueio.
+    """
+    count: int = max(1, int(start)) - 1
+    last: float = erlang_b(count, intensity) if count >= 1 else 1.0
+    first: int = count
+    recorder = _kernel_stats._active
+    try:
+        while True:
+            count += 1
+            last = (intensity * last) / (count + intensity * last)
+            yield count, last
+    finally:
+        # Os passos só são conhecidos quando a busca abandona o gerador.
+        if recorder is not None:
+            recorder.kernel('erlang_b_iter', count - first)
+
+def erlang_b_profile(max_servers: int, intensity: float) -> array:
+    """Calcula ``B(n, A)`` para todo ``n`` de 0 a ``max_servers`` numa única passada.
+
+    A recorrência de :func:`erlang_b` já produz todos esses valores no
+    caminho até ``max_servers``; o perfil os guarda num ``array('d')``
+    compacto para que buscas indexem ``profile[n]`` em vez de chamar o
+    kernel repetidamente. ``profile[0] = B(0) = 1`` e ``profile[n]`` é
+    bit a bit igual a ``erlang_b(n, intensity)`` para ``n >= 1``.
+
+    Args:
+        max_servers (int): Maior número de servidores do perfil.
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        array.array: Probabilidades de bloqueio, com ``max_servers + 1`` posições.
+
+    Raises:
+        InputValidationError: Se ``max_servers`` ou ``intensity`` forem negativos.
+    """
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_b_profile')
+    return extend_erlang_b_profile(array('d', [1.0]), intensity, max_servers)
+
+def extend_erlang_b_profile(profile: array, intensity: float, max_servers: int) -> array:
+    """Estende in place um perfil de Erlang B até ``max_servers``.
+
+    Continua a recorrência a partir do último valor guardado, de modo que
+    buscas com limite superior crescente (ex.: dobrando ``hi``) nunca
+    refazem o prefixo já calculado.
+
+    Args:
+        profile (array.array): Perfil gerado por :func:`erlang_b_profile`
+            para a mesma ``intensity``.
+        intensity (float): Taxa de tráfego.
+        max_servers (int): Novo maior número de servidores do perfil.
+
+    Returns:
+        array.array: O próprio ``profile``, já estendido.
+
+    Raises:
+        InputValidationError: Se ``max_servers`` ou ``intensity`` forem negativos.
+    """
+    if max_servers < 0 or intensity < 0:
+        raise InputValidationError("max_servers and intensity must be non-negative.")
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('extend_erlang_b_profile', max(0, int(max_servers) + 1 - len(profile)))
+    last: float = profile[-1]
+    for count in range(len(profile), int(max_servers) + 1):
+        last = (intensity * last) / (count + intensity * last)
+        profile.append(last)
+    return profile
+
+# Fração desprezada da distribuição de Poisson em erlang_b_large: e^-37 < 2^-53.
+_LARGE_TAIL_LOG: float = 37.0
+# Coeficientes da série de Stirling (Loader, 2000) para n > 15.
+_STIRLING_S0: float = 1.0 / 12
+_STIRLING_S1: float = 1.0 / 360
+_STIRLING_S2: float = 1.0 / 1260
+_STIRLING_S3: float = 1.0 / 1680
+_STIRLING_S4: float = 1.0 / 1188
+_HALF_LOG_2PI: float = 0.5 * math.log(2 * math.pi)
+
+def _stirlerr(n: int) -> float:
+    """``ln(n!) - [(n + 1/2) ln n - n + ln(2π)/2]``, sem cancelamento para n grande."""
+    if n <= 15:
+        return math.lgamma(n + 1.0) - (n + 0.5) * math.log(n) + n - _HALF_LOG_2PI
+    nn: float = float(n) * n
+    if n > 500:
+        return (_STIRLING_S0 - _STIRLING_S1 / nn) / n
+    if n > 80:
+        return (_STIRLING_S0 - (_STIRLING_S1 - _STIRLING_S2 / nn) / nn) / n
+    if n > 35:
+        return (_STIRLING_S0 - (_STIRLING_S1 - (_STIRLING_S2 - _STIRLING_S3 / nn) / nn) / nn) / n
+    return (_STIRLING_S0 - (_STIRLING_S1 - (_STIRLING_S2 - (_STIRLING_S3 - _STIRLING_S4 / nn) / nn) / nn) / nn) / n
+
+def _bd0(x: float, mean: float) -> float:
+    """Desvio ``x ln(x / mean) + mean - x`` calculado de forma estável (Loader, 2000)."""
+    if abs(x - mean) < 0.1 * (x + mean):
+        v: float = (x - mean) / (x + mean)
+        s: float = (x - mean) * v
+        ej: float = 2 * x * v
+        v *= v
+        j: int = 1
+        while True:
+            ej *= v
+            s1: float = s + ej / (2 * j + 1)
+            if s1 == s:
+                return s1
+            s = s1
+            j += 1
+    return x * math.log(x / mean) + mean - x
+
+def erlang_b_large(servers: float, intensity: float) -> float:
+    """Calcula Erlang B com custo proporcional a ``√A``, para milhares de servidores.
+
+    Escreve ``1 / B(N, A) = Σ_{k<=N} P(k) / P(N)``, com ``P`` a distribuição
+    de Poisson de média ``A``, e despreza os termos que não alteram o
+    resultado em precisão dupla:
+
+    - abaixo da moda, a recorrência ``1/B_n = 1 + (n / A) / B_{n-1}``
+      começa em ``min(N, ⌊A⌋) - m``, com ``m = ⌈√(2 A L)⌉`` e
+      ``L = 37 + ln(1 + A)``. Pela cota de Chernoff, a massa descartada em
+      relação à mantida é no máximo ``e^-37 ≈ 8.5e-17 < 2^-53``;
+    - bem acima da moda (``N > ⌊A⌋ + L/3 + √(L²/9 + 2 A L)``, cota de
+      Bernstein para a cauda superior), ``Σ_{k<=N} P(k) = 1`` em precisão
+      dupla e ``B = P(N)``, avaliado em espaço log pelo método de Loader.
+
+    Cota de erro relativo em relação à recorrência exata de :func:`erlang_b`:
+    ``e^-37 + 2 (k + 1) · 2^-53`` no ramo da recorrência, com
+    ``k <= m + L/3 + √(L²/9 + 2 A L)`` passos (≈ 2e-12 para ``A = 10⁶`` no
+    pior caso; o erro observado fica perto de ``1e-14``), e
+    ``(|ln B| + 8) · 2^-53`` no ramo de Loader.
+
+    Args:
+        servers (float): Número de linhas telefônicas (usa a parte inteira).
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        float: Probabilidade de bloqueio (entre 0 e 1).
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    count_max: int = int(servers)
+    if count_max == 0:
+        return 1.0
+    if intensity == 0:
+        return 0.0
+    tail: float = _LARGE_TAIL_LOG + math.log1p(intensity)
+    below: int = math.ceil(math.sqrt(2 * intensity * tail))
+    above: int = math.ceil(tail / 3 + math.sqrt(tail * tail / 9 + 2 * intensity * tail))
+    mode: int = int(intensity)
+    recorder = _kernel_stats._active
+    if count_max > mode + above:
+        if recorder is not None:
+            recorder.kernel('erlang_b_large')
+        log_pmf: float = -_stirlerr(count_max) - _bd0(float(count_max), intensity) - _HALF_LOG_2PI - 0.5 * math.log(count_max)
+        return min_max(math.exp(log_pmf), 0.0, 1.0)
+    start: int = max(0, min(count_max, mode) - below)
+    if recorder is not None:
+        recorder.kernel('erlang_b_large', count_max - start)
+    # 1/B(start) aproximado só pelo termo k = start (exato quando start = 0).
+    inverse: float = 1.0
+    for count in range(start + 1, count_max + 1):
+        inverse = 1.0 + inverse * count / intensity
+    return min_max(1.0 / inverse, 0.0, 1.0)
+
+def erlang_c_large(servers: float, intensity: float) -> float:
+    """Calcula Erlang C sobre :func:`erlang_b_large`, com o mesmo custo e cota de erro.
+
+    Args:
+        servers (float): Número de agentes.
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        float: Probabilidade de enfileiramento (entre 0 e 1).
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_c_large')
+    return erlang_c_from_b(servers, intensity, erlang_b_large(servers, intensity))
+
+# Critério de parada (precisão dupla) e piso contra divisão por zero no
+# método de Lentz para a fração contínua da gama incompleta.
+_GAMMA_EPSILON: float = 2.0 ** -53
+_GAMMA_TINY: float = 1e-300
+_GAMMA_MAX_TERMS: int = 1000
+
+def _inverse_b_fraction(fraction: float, intensity: float) -> float:
+    """``1 / B(f, A)`` para ``0 <= f < 1`` e ``A > 0``, via gama incompleta superior.
+
+    ``1 / B(f, A) = e^A A^-f Γ(f + 1, A)``. Para ``A < f + 2`` usa
+    ``Γ(s, A) = Γ(s) - γ(s, A)`` com a série de ``γ`` (aqui ``Q(s, A) >= 0.2``,
+    sem cancelamento relevante); caso contrário, a fração contínua de
+    ``Γ(s, A)`` pelo método de Lentz modificado, em que o fator
+    ``e^A A^-f`` se cancela e nada estoura.
+    """
+    if fraction == 0:
+        return 1.0
+    shape: float = fraction + 1.0
+    if intensity < shape + 1.0:
+        term: float = intensity / shape
+        total: float = term
+        for k in range(1, _GAMMA_MAX_TERMS):
+            term *= intensity / (shape + k)
+            total += term
+            if term < total * _GAMMA_EPSILON:
+                break
+        return math.exp(intensity) * intensity ** -fraction * math.gamma(shape) - total
+    b: float = intensity + 1.0 - shape
+    c: float = 1.0 / _GAMMA_TINY
+    d: float = 1.0 / b
+    h: float = d
+    for i in range(1, _GAMMA_MAX_TERMS):
+        an: float = -i * (i - shape)
+        b += 2.0
+        d = an * d + b
+        if abs(d) < _GAMMA_TINY:
+            d = _GAMMA_TINY
+        c = b + an / c
+        if abs(c) < _GAMMA_TINY:
+            c = _GAMMA_TINY
+        d = 1.0 / d
+        delta: float = d * c
+        h *= delta
+        if abs(delta - 1.0) < _GAMMA_EPSILON:
+            break
+    return intensity * h
+
+def erlang_b_continuous(servers: float, intensity: float) -> float:
+    """Calcula Erlang B para um número real de servidores (continuação analítica).
+
+    ``B(x, A) = A^x e^-A / Γ(x + 1, A)``, com ``Γ`` a gama incompleta
+    superior. A parte fracionária ``f`` de ``servers`` sai da gama
+    incompleta e a parte inteira da recorrência usual
+    ``B(f + k) = A B(f + k - 1) / (f + k + A B(f + k - 1))``, válida para
+    ``x`` real. Diferente de :func:`erlang_b`, que trunca ``servers``, o
+    resultado é contínuo e estritamente decrescente em ``servers``; em
+    valores inteiros é bit a bit igual a :func:`erlang_b`.
+
+    Args:
+        servers (float): Número (real) de servidores.
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        float: Probabilidade de bloqueio (entre 0 e 1).
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    count_max: int = int(servers)
+    fraction: float = servers - count_max
+    if intensity == 0:
+        return 1.0 if servers == 0 else 0.0
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_b_continuous', count_max)
+    last: float = 1.0 / _inverse_b_fraction(fraction, intensity)
+    for count in range(1, count_max + 1):
+        last = (intensity * last) / ((fraction + count) + intensity * last)
+    return min_max(last, 0.0, 1.0)
+
+def erlang_c_continuous(servers: float, intensity: float) -> float:
+    """Calcula Erlang C para um número real de agentes, sobre :func:`erlang_b_continuous`.
+
+    Args:
+        servers (float): Número (real) de agentes.
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        float: Probabilidade de enfileiramento (entre 0 e 1).
+    """
+    if servers < 0 or intensity < 0:
+        return 0.0
+    if servers == 0:
+        return 1.0
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_c_continuous')
+    return erlang_c_from_b(servers, intensity, erlang_b_continuous(servers, intensity))
 
 def erlang_b_ext(servers: float, intensity: float, retry: float) -> float:
     """Calcula a probabilidade de bloqueio com a fórmula estendida de Erlang B.
@@ -39,6 +355,9 @@ def erlang_b_ext(servers: float, intensity: float, retry: float) -> float:
         return 0.0
     max_iterate: int = int(servers)
     retries: float = min_max(retry, 0.0, 1.0)
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_b_ext', max_iterate)
     last: float = 1.0
     for count in range(1, max_iterate + 1):
         b: float = (intensity * last) / (count + intensity * last)
@@ -63,6 +382,9 @@ def engset_b(servers: float, events: float, intensity: float) -> float:
     max_iterate: int = int(servers)
     val: float = intensity
     ev: float = events
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('engset_b', max_iterate)
     last: float = 1.0
     for count in range(1, max_iterate + 1):
         b: float = (last * (count / ((ev - count) * val))) + 1
@@ -81,10 +403,62 @@ def erlang_c(servers: float, intensity: float) -> float:
     """
     if servers < 0 or intensity < 0:
         return 0.0
-    b: float = erlang_b(servers, intensity)
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_c')
+    store = _kernel_cache._active
+    if store is None:
+        return erlang_c_from_b(servers, intensity, erlang_b(servers, intensity))
+    key: tuple = ('c', float(servers), float(intensity))
+    c = store.get(key)
+    if c is _kernel_cache._MISSING:
+        c = erlang_c_from_b(servers, intensity, erlang_b(servers, intensity))
+        store.put(key, c)
+    return c
+
+def erlang_c_from_b(servers: float, intensity: float, b: float) -> float:
+    """Converte uma probabilidade de bloqueio Erlang B na de enfileiramento Erlang C.
+
+    Permite que buscas que já têm ``B(n, A)`` em mãos (ex.: via
+    :func:`erlang_b_iter`) obtenham ``C(n, A)`` sem refazer a recorrência.
+
+    Args:
+        servers (float): Número de agentes.
+        intensity (float): Taxa de tráfego.
+        b (float): Probabilidade de bloqueio ``B(servers, intensity)``.
+
+    Returns:
+        float: Probabilidade de enfileiramento (entre 0 e 1).
+    """
     c: float = b / (((intensity / servers) * b) + (1 - (intensity / servers)))
     return min_max(c, 0.0, 1.0)
 
+def erlang_c_profile(max_servers: int, intensity: float) -> array:
+    """Calcula ``C(n, A)`` para todo ``n`` de 0 a ``max_servers`` numa única passada.
+
+    Contraparte Erlang C de :func:`erlang_b_profile`: ``profile[0] = 1``
+    (sem agentes todo contato espera) e ``profile[n]`` é bit a bit igual a
+    ``erlang_c(n, intensity)`` para ``n >= 1``.
+
+    Args:
+        max_servers (int): Maior número de agentes do perfil.
+        intensity (float): Taxa de tráfego.
+
+    Returns:
+        array.array: Probabilidades de enfileiramento, com ``max_servers + 1`` posições.
+
+    Raises:
+        InputValidationError: Se ``max_servers`` ou ``intensity`` forem negativos.
+    """
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_c_profile')
+    blocking: array = erlang_b_profile(max_servers, intensity)
+    profile: array = array('d', [1.0])
+    for count in range(1, len(blocking)):
+        profile.append(erlang_c_from_b(count, intensity, blocking[count]))
+    return profile
+
 def erlang_a(servers: float, intensity: float, patience: float, aht: float) -> dict:
     """Calcula métricas de fila com abandono usando o modelo Erlang A (M/M/N+M).
 
@@ -106,12 +480,42 @@ def erlang_a(servers: float, intensity: float, patience: float, aht: float) -> d
     """
     if servers <= 0 or intensity <= 0 or patience <= 0 or aht <= 0:
         return {'pw': 0.0, 'asa': 0.0, 'abandon_rate': 0.0, 'sla': lambda t: 1.0}
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_a')
+    store = _kernel_cache._active
+    if store is None:
+        return erlang_a_from_c(servers, intensity, patience, aht, erlang_c(servers, intensity))
+    key: tuple = ('a', float(servers), float(intensity), float(patience), float(aht))
+    metrics = store.get(key)
+    if metrics is _kernel_cache._MISSING:
+        metrics = erlang_a_from_c(servers, intensity, patience, aht, erlang_c(servers, intensity))
+        store.put(key, metrics)
+    # Cópia rasa: quem chama pode alterar o dict sem corromper o cache.
+    return dict(metrics)
+
+def erlang_a_from_c(servers: float, intensity: float, patience: float, aht: float, c: float) -> dict:
+    """Calcula as métricas Erlang A a partir de uma probabilidade Erlang C já conhecida.
+
+    Mesmo resultado de :func:`erlang_a`, sem reavaliar ``erlang_c`` — útil
+    quando a busca já percorreu a recorrência até ``servers``.
+
+    Args:
+        servers (float): Número de agentes.
+        intensity (float): Taxa de tráfego (erlangs).
+        patience (float): Paciência média do cliente (em segundos).
+        aht (float): Duração média da chamada (em segundos).
+        c (float): Probabilidade de enfileiramento ``C(servers, intensity)``.
 
+    Returns:
+        dict: Mesmas chaves de :func:`erlang_a` (``pw``, ``asa``,
+            ``abandon_rate``, ``sla``).
+    """
+    if servers <= 0 or intensity <= 0 or patience <= 0 or aht <= 0:
+        return {'pw': 0.0, 'asa': 0.0, 'abandon_rate': 0.0, 'sla': lambda t: 1.0}
     theta: float = 1.0 / patience
     rho: float = intensity / servers
 
-    c: float = erlang_c(servers, intensity)
-
     if rho >= 1.0:
         alpha: float = theta * aht
         pw: float = min_max(c / (c + (1 - c) * (1 + alpha)), 0.0, 1.0)
@@ -153,3 +557,176 @@ def erlang_a(servers: float, intensity: float, patience: float, aht: float) -> d
         'abandon_rate': abandon_rate,
         'sla': sla_func
     }
+
+def _as_servers(servers: Any, size: int) -> list:
+    """Normaliza ``servers`` (escalar ou sequência) para uma lista de floats do tamanho do lote."""
+    if isinstance(servers, (int, float)):
+        return [float(servers)] * size
+    values: list = [float(s) for s in servers]
+    if len(values) != size:
+        raise InputValidationError("servers and intensities must have the same length.")
+    return values
+
+def _numpy_for(*values: Any) -> Any:
+    """Devolve o módulo numpy se algum argumento for um ``ndarray``, senão ``None``.
+
+    O numpy nunca é importado aqui: se o chamador passou um ``ndarray``, o
+    módulo já está em ``sys.modules``. Assim a dependência continua opcional
+    e o caminho em Python puro não paga o custo de importação.
+    """
+    np = sys.modules.get("numpy")
+    if np is not None and any(isinstance(v, np.ndarray) for v in values):
+        return np
+    return None
+
+def _erlang_b_lockstep(limits: list, intensities: list) -> list:
+    """Roda a recorrência de Erlang B sobre o lote inteiro, um ``count`` por vez."""
+    last: list = [1.0] * len(intensities)
+    top: int = max(limits, default=0)
+    if all(limit == top for limit in limits):
+        for count in range(1, top + 1):
+            last = [(a * l) / (count + a * l) for a, l in zip(intensities, last)]
+        return last
+    for count in range(1, top + 1):
+        last = [
+            (a * l) / (count + a * l) if count <= limit else l
+            for a, l, limit in zip(intensities, last, limits)
+        ]
+    return last
+
+def _erlang_b_lockstep_numpy(np: Any, servers: Any, intensities: Any) -> Any:
+    """Versão numpy de :func:`_erlang_b_lockstep` (mesmas operações IEEE, mesmos bits)."""
+    a = np.asarray(intensities, dtype=np.float64)
+    n = np.broadcast_to(np.asarray(servers, dtype=np.float64), a.shape)
+    limits = np.where(n >= 0, np.floor(n), 0).astype(np.int64)
+    last = np.ones_like(a)
+    top: int = int(limits.max()) if limits.size else 0
+    for count in range(1, top + 1):
+        step = (a * last) / (count + a * last)
+        last = np.where(limits >= count, step, last)
+    return a, n, last
+
+def erlang_b_many(servers: Union[float, Sequence[float]], intensities: Sequence[float]) -> Any:
+    """Calcula Erlang B para um lote de intensidades numa única passada da recorrência.
+
+    A recorrência avança em passo único sobre o vetor inteiro (um ``count``
+    por vez para todos os elementos), evitando uma chamada Python por par.
+    Os resultados são bit a bit idênticos aos de :func:`erlang_b` chamada
+    elemento a elemento. Com menos de um servidor (``0 <= servers < 1``) o
+    bloqueio é ``B(0) = 1``.
+
+    Args:
+        servers (float | Sequence[float]): Número de linhas — um escalar
+            comum a todo o lote ou uma sequência do mesmo tamanho de
+            ``intensities``.
+        intensities (Sequence[float]): Taxas de tráfego (``list``,
+            ``array.array`` ou ``numpy.ndarray``).
+
+    Returns:
+        array.array | numpy.ndarray: Probabilidades de bloqueio (``array('d')``;
+            ``ndarray`` de float64 quando a entrada é numpy).
+
+    Raises:
+        InputValidationError: Se ``servers`` for uma sequência de tamanho diferente.
+    """
+    np = _numpy_for(servers, intensities)
+    recorder = _kernel_stats._active
+    if np is not None:
+        a, n, last = _erlang_b_lockstep_numpy(np, servers, intensities)
+        if recorder is not None:
+            recorder.kernel('erlang_b_many', int(np.where(n >= 0, np.floor(n), 0).sum()))
+        return np.where((n < 0) | (a < 0), 0.0, np.clip(last, 0.0, 1.0))
+    values: list = [float(a) for a in intensities]
+    counts: list = _as_servers(servers, len(values))
+    limits: list = [int(n) if n >= 0 else 0 for n in counts]
+    if recorder is not None:
+        recorder.kernel('erlang_b_many', sum(limits))
+    last = _erlang_b_lockstep(limits, values)
+    return array('d', (
+        0.0 if n < 0 or a < 0 else min_max(b, 0.0, 1.0)
+        for n, a, b in zip(counts, values, last)
+    ))
+
+def erlang_c_many(servers: Union[float, Sequence[float]], intensities: Sequence[float]) -> Any:
+    """Calcula Erlang C para um lote de intensidades numa única passada da recorrência.
+
+    Versão em lote de :func:`erlang_c`, com os mesmos resultados bit a bit.
+    Com menos de um servidor todo contato espera (``C = 1``).
+
+    Args:
+        servers (float | Sequence[float]): Número de agentes (escalar ou por elemento).
+        intensities (Sequence[float]): Taxas de tráfego.
+
+    Returns:
+        array.array | numpy.ndarray: Probabilidades de enfileiramento.
+
+    Raises:
+        InputValidationError: Se ``servers`` for uma sequência de tamanho diferente.
+    """
+    np = _numpy_for(servers, intensities)
+    recorder = _kernel_stats._active
+    if np is not None:
+        a, n, last = _erlang_b_lockstep_numpy(np, servers, intensities)
+        if recorder is not None:
+            recorder.kernel('erlang_c_many', int(np.where(n >= 0, np.floor(n), 0).sum()))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = a / n
+            c = np.clip(last / ((ratio * last) + (1 - ratio)), 0.0, 1.0)
+        c = np.where(n < 1, 1.0, c)
+        return np.where((n < 0) | (a < 0), 0.0, c)
+    values: list = [float(a) for a in intensities]
+    counts: list = _as_servers(servers, len(values))
+    limits: list = [int(n) if n >= 0 else 0 for n in counts]
+    if recorder is not None:
+        recorder.kernel('erlang_c_many', sum(limits))
+    last = _erlang_b_lockstep(limits, values)
+    return array('d', (
+        0.0 if n < 0 or a < 0 else 1.0 if n < 1 else erlang_c_from_b(n, a, b)
+        for n, a, b in zip(counts, values, last)
+    ))
+
+def erlang_a_many(servers: Union[float, Sequence[float]], intensities: Sequence[float], patience: float, aht: float, target_time: float = None) -> dict:
+    """Calcula as métricas Erlang A para um lote de intensidades.
+
+    A parte cara (Erlang C) sai de :func:`erlang_c_many`; as métricas de
+    abandono são aplicadas elemento a elemento com a mesma aritmética de
+    :func:`erlang_a`, então os valores coincidem bit a bit.
+
+    Args:
+        servers (float | Sequence[float]): Número de agentes (escalar ou por elemento).
+        intensities (Sequence[float]): Taxas de tráfego (erlangs).
+        patience (float): Paciência média do cliente (em segundos).
+        aht (float): Duração média da chamada (em segundos).
+        target_time (float, optional): Tempo alvo para calcular o SLA de
+            cada elemento. Se None, a chave ``sla`` não é incluída.
+
+    Returns:
+        dict: Vetores ``pw``, ``asa`` e ``abandon_rate`` (e ``sla`` quando
+            ``target_time`` é informado), no mesmo tipo de
+            :func:`erlang_b_many`.
+
+    Raises:
+        InputValidationError: Se ``servers`` for uma sequência de tamanho diferente.
+    """
+    np = _numpy_for(servers, intensities)
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        recorder.kernel('erlang_a_many')
+    values: list = [float(a) for a in intensities]
+    counts: list = _as_servers(servers, len(values))
+    cs = erlang_c_many(counts, values)
+    keys: tuple = ('pw', 'asa', 'abandon_rate') + (('sla',) if target_time is not None else ())
+    columns: dict = {key: array('d') for key in keys}
+    for n, a, c in zip(counts, values, cs):
+        if n <= 0 or a <= 0 or patience <= 0 or aht <= 0:
+            metrics: dict = erlang_a(n, a, patience, aht)
+        else:
+            metrics = erlang_a_from_c(n, a, patience, aht, c)
+        columns['pw'].append(metrics['pw'])
+        columns['asa'].append(metrics['asa'])
+        columns['abandon_rate'].append(metrics['abandon_rate'])
+        if target_time is not None:
+            columns['sla'].append(metrics['sla'](target_time))
+    if np is not None:
+        return {key: np.asarray(column, dtype=np.float64) for key, column in columns.items()}
+    return columns
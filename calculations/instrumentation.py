@@ -0,0 +1,155 @@
+"""
+Instrumentação opcional dos kernels de Erlang e das buscas de staffing.
+
+Quando um cálculo demora, os contadores mostram onde: quantas vezes cada
+kernel de :mod:`~mod_turbotab.calculations.erlang` rodou, quantos passos de
+recorrência somaram, quantas sondas cada busca fez (o critério de SLA em
+:func:`~mod_turbotab.agents.capacity.agents_required`, a bisseção de
+:func:`~mod_turbotab.agents.capacity.contact_capacity`, a varredura de
+:func:`~mod_turbotab.trunks.trunks.number_trunks`, ...) e o tempo de parede
+de cada função de topo. As conversões O(1) (``erlang_c_from_b``,
+``erlang_a_from_c``), chamadas a cada passo das buscas, ficam de fora: as
+sondas da busca já as contam. Sem um :class:`KernelStats` ativo (o padrão), o
+custo nos kernels é uma leitura de atributo e um teste contra ``None``.
+
+Uso típico::
+
+    with KernelStats() as stats:
+        agents_required(0.80, 20, 25, 180)
+    stats.stats()  # {'kernel_calls': {'erlang_b': 1}, 'search_probes': {...}, ...}
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# Coletor consultado pelos kernels; None desliga a instrumentação.
+_active: Optional["KernelStats"] = None
+
+
+class KernelStats:
+    """Contadores de kernels, passos de recorrência, sondas de busca e tempos.
+
+    É um gerenciador de contexto, como
+    :class:`~mod_turbotab.calculations.cache.KernelCache`: dentro do
+    ``with`` ele é o coletor ativo; na saída, o anterior (ou nenhum) volta a
+    valer. Os tempos só contam a chamada mais externa de cada função
+    instrumentada, então uma busca que chama outra não soma o tempo duas
+    vezes.
+    """
+
+    def __init__(self) -> None:
+        self.kernel_calls: dict = {}
+        self.recurrence_iterations: int = 0
+        self.search_probes: dict = {}
+        self.timings: dict = {}
+        # Profundidade de chamadas cronometradas por thread: no modo serve,
+        # duas conexões simultâneas não podem esconder o tempo uma da outra.
+        self._local: threading.local = threading.local()
+        self._started: Optional[float] = None
+        self._elapsed: float = 0.0
+        # O modo serve atende conexões em threads; os contadores são
+        # atualizados sob o mesmo lock.
+        self._lock: threading.Lock = threading.Lock()
+        self._previous: list = []
+
+    def kernel(self, name: str, iterations: int = 0) -> None:
+        """Conta uma chamada do kernel ``name`` e seus passos de recorrência."""
+        with self._lock:
+            self.kernel_calls[name] = self.kernel_calls.get(name, 0) + 1
+            self.recurrence_iterations += iterations
+
+    def probe(self, search: str, count: int = 1) -> None:
+        """Conta ``count`` avaliações do critério da busca ``search``."""
+        with self._lock:
+            self.search_probes[search] = self.search_probes.get(search, 0) + count
+
+    def counting(self, search: str, criterion: Callable[..., Any]) -> Callable[..., Any]:
+        """Envolve ``criterion`` para que cada chamada conte como sonda de ``search``."""
+
+        def counted(*args: Any) -> Any:
+            self.probe(search)
+            return criterion(*args)
+
+        return counted
+
+    def _time(self, name: str, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        local: threading.local = self._local
+        if getattr(local, 'depth', 0):
+            return func(*args, **kwargs)
+        local.depth = 1
+        start: float = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed: float = time.perf_counter() - start
+            local.depth = 0
+            with self._lock:
+                entry: dict = self.timings.setdefault(name, {'calls': 0, 'seconds': 0.0})
+                entry['calls'] += 1
+                entry['seconds'] += elapsed
+
+    def clear(self) -> None:
+        """Zera todos os contadores."""
+        with self._lock:
+            self.kernel_calls = {}
+            self.recurrence_iterations = 0
+            self.search_probes = {}
+            self.timings = {}
+            self._elapsed = 0.0
+            if self._started is not None:
+                self._started = time.perf_counter()
+
+    def stats(self) -> dict:
+        """Retorna os contadores para exportação (ex.: o bloco ``diagnostics`` da CLI).
+
+        Returns:
+            dict: ``kernel_calls`` e ``search_probes`` (contagens por nome),
+                ``recurrence_iterations``, ``timings`` (``calls`` e
+                ``seconds`` por função de topo) e ``wall_time`` (segundos
+                dentro do ``with``).
+        """
+        with self._lock:
+            wall_time: float = self._elapsed
+            if self._started is not None:
+                wall_time += time.perf_counter() - self._started
+            return {
+                'kernel_calls': dict(sorted(self.kernel_calls.items())),
+                'recurrence_iterations': self.recurrence_iterations,
+                'search_probes': dict(sorted(self.search_probes.items())),
+                'timings': {name: dict(entry) for name, entry in sorted(self.timings.items())},
+                'wall_time': wall_time,
+            }
+
+    def __enter__(self) -> "KernelStats":
+        global _active
+        self._previous.append(_active)
+        _active = self
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        global _active
+        _active = self._previous.pop()
+        self._elapsed += time.perf_counter() - self._started
+        self._started = None
+
+
+def timed(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Decora uma função de topo para que o coletor ativo registre seu tempo de parede."""
+    name: str = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        recorder = _active
+        if recorder is None:
+            return func(*args, **kwargs)
+        return recorder._time(name, func, args, kwargs)
+
+    return wrapper
+
+
+def active_stats() -> Optional[KernelStats]:
+    """Retorna o coletor em uso, ou None se a instrumentação estiver desligada."""
+    return _active
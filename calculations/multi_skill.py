@@ -16,11 +16,12 @@ Opção A — implementada aqui. Trata cada grupo de skill como uma fila Erlang
     roteamento por prioridade reformula significativamente a distribuição de
     carga ofertada.
 
-Opção B — TODO (fora do escopo deste wish). Simulação Monte Carlo de chegadas
-    entre grupos de skill, com agentes modelados como vetores de skill e
-    roteamento por prioridade. A mais precisa das três, mas o harness de
-    simulação vive em ``simulation/intraday.py``; integrar após esse módulo
-    estabilizar. Viável em Python puro via ``random``.
+Opção B — implementada em :mod:`mod_turbotab.simulation.multi_skill`.
+    Simulação Monte Carlo de eventos discretos entre grupos de skill, com
+    agentes modelados como máscaras de bits de skill e roteamento por
+    prioridade; reporta SLA/ASA por skill com intervalos de confiança. A mais
+    precisa das três e a referência para calibrar o ``sharing_factor`` quando
+    o overlap é grande. Python puro via ``random``.
 
 Opção C — TODO (fora do escopo deste wish). Erlang C estendido (ECCS): uma
     aproximação analítica construída decompondo o sistema multi-skill em
@@ -47,21 +48,28 @@ O algoritmo da Opção A:
 5. Agrega os totais: soma ingênua (sem sharing), soma ajustada (com sharing),
    economia, e se o requisito resultante cabe nos ``agent_pools``
    declarados. A checagem de viabilidade resolve o problema de alocação
-   subjacente de forma exata via fluxo máximo bipartite (Edmonds-Karp, Python
-   puro), de modo que pools compartilhados sobrepostos não sejam contados em
-   dobro entre skills.
+   subjacente de forma exata via fluxo máximo bipartite (Dinic, Python puro),
+   de modo que pools compartilhados sobrepostos não sejam contados em dobro
+   entre skills; o fluxo resultante é devolvido como a alocação pool -> skill.
 
 A função retorna um dict estruturado (sem efeitos colaterais, sem I/O),
 adequado para alimentar a saída ``--json`` da CLI caso a superfície da CLI
 venha a expor isso futuramente.
+
+Para sessões what-if (mexer no ``count`` de um pool ou no volume de uma skill e
+perguntar de novo se cabe), :class:`MultiSkillPlanner` mantém o grafo residual
+e o fluxo entre as mudanças e só reencaminha o que a mudança desfez.
 """
 
 import math
+from collections import deque
 
 from mod_turbotab.agents.capacity import agents_required
+from mod_turbotab.calculations.instrumentation import timed
 from mod_turbotab.exceptions import InputValidationError
 
 
+@timed
 def agents_required_multi(
     skill_groups: list,
     agent_pools: list,
@@ -97,7 +105,7 @@ def agents_required_multi(
             (Erlang C puro).
 
     Returns:
-        dict: Estrutura ``{"per_skill": [...], "totals": {...}}``:
+        dict: Estrutura ``{"per_skill": [...], "allocation": [...], "totals": {...}}``:
 
             ``per_skill`` — uma entrada por skill, com:
                 - ``name`` (str)
@@ -110,6 +118,14 @@ def agents_required_multi(
                 - ``eligible_pool_hc`` (int, capacidade dos pools que atendem
                   esta skill)
 
+            ``allocation`` — uma entrada por pool, na ordem de
+            ``agent_pools``, com a alocação do fluxo máximo:
+                - ``skills`` e ``count`` (ecoados do pool)
+                - ``assigned`` (dict skill -> agentes alocados)
+                - ``idle`` (int, agentes do pool sem skill atribuída)
+              Quando ``fits_in_pool_capacity`` é False, é a maior cobertura
+              parcial possível.
+
             ``totals`` — agregados:
                 - ``naive_total_hc`` (int, soma dos baselines)
                 - ``adjusted_total_hc`` (int, soma dos ajustados)
@@ -124,6 +140,290 @@ def agents_required_multi(
     Raises:
         InputValidationError: Se as entradas forem inválidas.
     """
+    _validate_inputs(skill_groups, agent_pools, sla, service_time, interval, sharing_factor, patience)
+
+    cross_skilled_set = set()
+    for pool in agent_pools:
+        if len(pool["skills"]) > 1 and pool["count"] > 0:
+            for sk in pool["skills"]:
+                cross_skilled_set.add(sk)
+
+    per_skill: list = []
+    for sg in skill_groups:
+        name: str = sg["name"]
+        offered, baseline_hc = _baseline(sg, sla, service_time, interval, patience)
+        is_cross_skilled: bool = name in cross_skilled_set
+        adjusted_hc: int = _adjusted_hc(offered, baseline_hc, is_cross_skilled, sharing_factor)
+
+        # Capacidade elegível: soma dos pools que atendem este skill (campo
+        # de diagnóstico; a viabilidade real é decidida por fluxo máximo).
+        eligible_hc: int = sum(
+            p["count"] for p in agent_pools if name in p["skills"]
+        )
+
+        per_skill.append(
+            _skill_entry(name, offered, baseline_hc, adjusted_hc, is_cross_skilled, eligible_hc)
+        )
+
+    covered, allocation = _allocate_pools(per_skill, agent_pools)
+
+    return {
+        "per_skill": per_skill,
+        "allocation": allocation,
+        "totals": _totals(per_skill, agent_pools, covered, sharing_factor),
+    }
+
+
+class MultiSkillPlanner:
+    """Sessão what-if sobre um cenário multi-skill, com o fluxo máximo mantido entre mudanças.
+
+    Recebe as mesmas entradas de :func:`agents_required_multi` e resolve a
+    alocação uma vez. Depois disso, cada mudança — ``count`` de um pool,
+    volume de uma skill, skill acrescentada ou retirada de um pool, pool novo
+    — ajusta só as capacidades afetadas no grafo residual e reencaminha o
+    fluxo a partir do estado anterior, em vez de reconstruir e resolver a rede
+    inteira. Uma skill só volta ao Erlang quando o seu volume muda; se a
+    topologia troca o seu status cross-skilled, o sharing factor é reaplicado
+    ao baseline guardado.
+
+    Uso típico::
+
+        planner = MultiSkillPlanner(groups, pools, sla=0.80, service_time=20)
+        planner.set_pool_count(2, 4)     # False: não cabe mais
+        planner.add_pool_skill(0, "tech")
+        planner.result()                 # mesma estrutura de agents_required_multi
+
+    Os métodos de mudança validam como :func:`agents_required_multi` e
+    retornam ``fits`` já atualizado. As listas passadas ao construtor são
+    copiadas; índices de pool seguem a ordem de ``agent_pools``, com pools
+    novos no fim.
+
+    Raises:
+        InputValidationError: Se as entradas forem inválidas.
+    """
+
+    def __init__(
+        self,
+        skill_groups: list,
+        agent_pools: list,
+        sla: float,
+        service_time: int,
+        interval: float = 600.0,
+        sharing_factor: float = 0.9,
+        patience: float = None,
+    ) -> None:
+        _validate_inputs(skill_groups, agent_pools, sla, service_time, interval, sharing_factor, patience)
+        self.sla: float = sla
+        self.service_time: int = service_time
+        self.interval: float = interval
+        self.sharing_factor: float = sharing_factor
+        self.patience: float = patience
+
+        self._groups: dict = {sg["name"]: dict(sg) for sg in skill_groups}
+        self._pools: list = [{"skills": list(p["skills"]), "count": p["count"]} for p in agent_pools]
+        self._offered: dict = {}
+        self._baseline_hc: dict = {}
+        for name, sg in self._groups.items():
+            self._offered[name], self._baseline_hc[name] = _baseline(sg, sla, service_time, interval, patience)
+        # Quantos pools cross-skilled com agentes cobrem cada skill.
+        self._cross_pools: dict = dict.fromkeys(self._groups, 0)
+        for pool in self._pools:
+            for sk in self._cross_skills(pool):
+                self._cross_pools[sk] += 1
+        self._demands: dict = {
+            name: _adjusted_hc(self._offered[name], self._baseline_hc[name], self._cross_pools[name] > 0, sharing_factor)
+            for name in self._groups
+        }
+        self._demand_total: int = sum(self._demands.values())
+
+        network, sink, source_edges, pool_edges, sink_edges = _build_network(self._demands, self._pools)
+        self._network: _FlowNetwork = network
+        self._sink: int = sink
+        self._source_edges: list = source_edges
+        self._pool_edges: list = pool_edges
+        self._sink_edges: dict = sink_edges
+        self._skill_nodes: dict = {name: network.head[edge ^ 1] for name, edge in sink_edges.items()}
+        self._pool_nodes: list = [network.head[edge] for edge in source_edges]
+        self._flow: int = network.max_flow(_SOURCE, sink, self._demand_total)
+        self._stale: bool = False
+
+    @property
+    def fits(self) -> bool:
+        """Se os pools cobrem o HC ajustado de todas as skills (``fits_in_pool_capacity``)."""
+        return self._flow >= self._demand_total
+
+    def set_pool_count(self, index: int, count: int) -> bool:
+        """Muda o número de agentes do pool ``index``.
+
+        Returns:
+            bool: ``fits`` após a mudança.
+        """
+        pool: dict = self._pool(index)
+        if count < 0:
+            raise InputValidationError("pool.count must not be negative.")
+        before: list = self._cross_skills(pool)
+        pool["count"] = count
+        self._set_capacity(self._source_edges[index], int(count))
+        for edge in self._pool_edges[index].values():
+            self._set_capacity(edge, int(count))
+        self._recount_cross(before, pool)
+        return self._resolve()
+
+    def set_skill_volume(self, name: str, contacts_per_interval: float) -> bool:
+        """Muda o volume previsto da skill ``name`` e redimensiona só ela.
+
+        Returns:
+            bool: ``fits`` após a mudança.
+        """
+        if name not in self._groups:
+            raise InputValidationError(f"unknown skill: '{name}'.")
+        if contacts_per_interval < 0:
+            raise InputValidationError(f"invalid contacts_per_interval for '{name}'.")
+        sg: dict = self._groups[name]
+        sg["contacts_per_interval"] = contacts_per_interval
+        self._offered[name], self._baseline_hc[name] = _baseline(
+            sg, self.sla, self.service_time, self.interval, self.patience
+        )
+        self._refresh_demand(name)
+        return self._resolve()
+
+    def add_pool_skill(self, index: int, skill: str) -> bool:
+        """Passa a atender ``skill`` com o pool ``index``.
+
+        Returns:
+            bool: ``fits`` após a mudança.
+        """
+        pool: dict = self._pool(index)
+        if skill in pool["skills"]:
+            raise InputValidationError("pool.skills must not repeat the same skill.")
+        if skill not in self._groups:
+            raise InputValidationError(f"pool references unknown skill: '{skill}'.")
+        before: list = self._cross_skills(pool)
+        pool["skills"].append(skill)
+        self._pool_edges[index][skill] = self._network.add_edge(
+            self._pool_nodes[index], self._skill_nodes[skill], int(pool["count"])
+        )
+        self._stale = True
+        self._recount_cross(before, pool)
+        return self._resolve()
+
+    def remove_pool_skill(self, index: int, skill: str) -> bool:
+        """Deixa de atender ``skill`` com o pool ``index``.
+
+        Returns:
+            bool: ``fits`` após a mudança.
+        """
+        pool: dict = self._pool(index)
+        if skill not in pool["skills"]:
+            raise InputValidationError(f"pool does not serve skill: '{skill}'.")
+        if len(pool["skills"]) == 1:
+            raise InputValidationError("pool.skills must be a non-empty list.")
+        before: list = self._cross_skills(pool)
+        # A aresta fica na rede com capacidade zero; só o fluxo dela é desfeito.
+        self._set_capacity(self._pool_edges[index].pop(skill), 0)
+        pool["skills"].remove(skill)
+        self._recount_cross(before, pool)
+        return self._resolve()
+
+    def add_pool(self, skills: list, count: int) -> int:
+        """Acrescenta um pool e retorna o seu índice (o próximo após os existentes)."""
+        pool: dict = {"skills": skills, "count": count}
+        _validate_pool(pool, self._groups)
+        pool = {"skills": list(skills), "count": count}
+        network: _FlowNetwork = self._network
+        node: int = network.add_node()
+        self._pools.append(pool)
+        self._pool_nodes.append(node)
+        self._source_edges.append(network.add_edge(_SOURCE, node, int(count)))
+        self._pool_edges.append(
+            {sk: network.add_edge(node, self._skill_nodes[sk], int(count)) for sk in pool["skills"]}
+        )
+        self._stale = True
+        self._recount_cross([], pool)
+        self._resolve()
+        return len(self._pools) - 1
+
+    def result(self) -> dict:
+        """Retorna o estado corrente no formato de :func:`agents_required_multi`.
+
+        A alocação é a do fluxo mantido pela sessão; pode diferir da de uma
+        chamada nova a :func:`agents_required_multi` quando houver mais de
+        uma alocação ótima, mas ``per_skill`` e ``totals`` coincidem.
+        """
+        per_skill: list = []
+        for name in self._groups:
+            eligible_hc: int = sum(p["count"] for p in self._pools if name in p["skills"])
+            per_skill.append(
+                _skill_entry(
+                    name,
+                    self._offered[name],
+                    self._baseline_hc[name],
+                    self._demands[name],
+                    self._cross_pools[name] > 0,
+                    eligible_hc,
+                )
+            )
+        return {
+            "per_skill": per_skill,
+            "allocation": _pool_allocation(self._network, self._pools, self._pool_edges),
+            "totals": _totals(per_skill, self._pools, self._flow, self.sharing_factor),
+        }
+
+    def _pool(self, index: int) -> dict:
+        if not 0 <= index < len(self._pools):
+            raise InputValidationError(f"unknown pool index: {index}.")
+        return self._pools[index]
+
+    @staticmethod
+    def _cross_skills(pool: dict) -> list:
+        return list(pool["skills"]) if _is_cross_pool(pool) else []
+
+    def _recount_cross(self, before: list, pool: dict) -> None:
+        # Atualiza a contagem de pools cross-skilled e reaplica o sharing
+        # factor às skills cujo status mudou.
+        after: list = self._cross_skills(pool)
+        for sk in before:
+            self._cross_pools[sk] -= 1
+        for sk in after:
+            self._cross_pools[sk] += 1
+        for sk in set(before).symmetric_difference(after):
+            self._refresh_demand(sk)
+
+    def _refresh_demand(self, name: str) -> None:
+        demand: int = _adjusted_hc(
+            self._offered[name], self._baseline_hc[name], self._cross_pools[name] > 0, self.sharing_factor
+        )
+        self._demand_total += demand - self._demands[name]
+        self._demands[name] = demand
+        self._set_capacity(self._sink_edges[name], demand)
+
+    def _set_capacity(self, edge: int, capacity: int) -> None:
+        network: _FlowNetwork = self._network
+        previous: int = network.cap[edge] + network.cap[edge ^ 1]
+        cancelled: int = network.set_capacity(edge, capacity, _SOURCE, self._sink)
+        self._flow -= cancelled
+        # Reduzir capacidade sem cancelar fluxo não cria caminho aumentante:
+        # o fluxo continua máximo e não há o que procurar.
+        if cancelled or capacity > previous:
+            self._stale = True
+
+    def _resolve(self) -> bool:
+        if self._stale and self._flow < self._demand_total:
+            self._flow += self._network.max_flow(_SOURCE, self._sink, self._demand_total - self._flow)
+        self._stale = False
+        return self.fits
+
+
+def _validate_inputs(
+    skill_groups: list,
+    agent_pools: list,
+    sla: float,
+    service_time: int,
+    interval: float,
+    sharing_factor: float,
+    patience: float,
+) -> None:
+    """Valida as entradas de :func:`agents_required_multi` e de :class:`MultiSkillPlanner`."""
     if not isinstance(skill_groups, list) or not skill_groups:
         raise InputValidationError("skill_groups must be a non-empty list.")
     if not isinstance(agent_pools, list) or not agent_pools:
@@ -138,6 +438,15 @@ def agents_required_multi(
         raise InputValidationError("interval must be > 0.")
     if patience is not None and patience <= 0:
         raise InputValidationError("patience must be > 0 when provided.")
+    _validate_topology(skill_groups, agent_pools)
+
+
+def _validate_topology(skill_groups: list, agent_pools: list) -> None:
+    """Valida os grupos de skill e os pools que os atendem."""
+    if not isinstance(skill_groups, list) or not skill_groups:
+        raise InputValidationError("skill_groups must be a non-empty list.")
+    if not isinstance(agent_pools, list) or not agent_pools:
+        raise InputValidationError("agent_pools must be a non-empty list.")
 
     seen_names = set()
     for sg in skill_groups:
@@ -160,162 +469,331 @@ def agents_required_multi(
             )
 
     for pool in agent_pools:
-        if "skills" not in pool or "count" not in pool:
-            raise InputValidationError(
-                "agent_pool requires the keys: skills, count."
-            )
-        if not isinstance(pool["skills"], list) or not pool["skills"]:
-            raise InputValidationError(
-                "pool.skills must be a non-empty list."
-            )
-        if len(set(pool["skills"])) != len(pool["skills"]):
-            raise InputValidationError(
-                "pool.skills must not repeat the same skill."
-            )
-        if pool["count"] < 0:
-            raise InputValidationError("pool.count must not be negative.")
-        for sk in pool["skills"]:
-            if sk not in seen_names:
-                raise InputValidationError(
-                    f"pool references unknown skill: '{sk}'."
-                )
+        _validate_pool(pool, seen_names)
 
-    cross_skilled_set = set()
-    for pool in agent_pools:
-        if len(pool["skills"]) > 1 and pool["count"] > 0:
-            for sk in pool["skills"]:
-                cross_skilled_set.add(sk)
 
-    per_skill: list = []
-    for sg in skill_groups:
-        name: str = sg["name"]
-        contacts: float = float(sg["contacts_per_interval"])
-        aht: int = int(sg["aht"])
-        offered: float = contacts * aht / interval
-
-        if contacts == 0:
-            # Skill sem volume previsto: demanda zero — sem o HC mínimo de 1
-            # que agents_required retorna e sem exigir cobertura por pool.
-            baseline_hc: int = 0
-        else:
-            baseline_hc = agents_required(
-                sla=sla,
-                service_time=service_time,
-                contacts_per_interval=contacts,
-                aht=aht,
-                interval=interval,
-                patience=patience,
+def _validate_pool(pool: dict, skill_names) -> None:
+    if "skills" not in pool or "count" not in pool:
+        raise InputValidationError(
+            "agent_pool requires the keys: skills, count."
+        )
+    if not isinstance(pool["skills"], list) or not pool["skills"]:
+        raise InputValidationError(
+            "pool.skills must be a non-empty list."
+        )
+    if len(set(pool["skills"])) != len(pool["skills"]):
+        raise InputValidationError(
+            "pool.skills must not repeat the same skill."
+        )
+    if pool["count"] < 0:
+        raise InputValidationError("pool.count must not be negative.")
+    for sk in pool["skills"]:
+        if sk not in skill_names:
+            raise InputValidationError(
+                f"pool references unknown skill: '{sk}'."
             )
 
-        is_cross_skilled: bool = name in cross_skilled_set
-        if is_cross_skilled and baseline_hc > 0:
-            traffic_floor: int = int(math.ceil(offered)) + 1
-            shared_target: int = int(math.ceil(baseline_hc * sharing_factor))
-            adjusted_hc: int = max(traffic_floor, shared_target)
-        else:
-            adjusted_hc = baseline_hc
-
-        occupancy_adjusted: float = (
-            offered / adjusted_hc if adjusted_hc > 0 else 0.0
-        )
 
-        # Capacidade elegível: soma dos pools que atendem este skill (campo
-        # de diagnóstico; a viabilidade real é decidida por fluxo máximo).
-        eligible_hc: int = sum(
-            p["count"] for p in agent_pools if name in p["skills"]
-        )
+def _is_cross_pool(pool: dict) -> bool:
+    return len(pool["skills"]) > 1 and pool["count"] > 0
+
+
+def _baseline(sg: dict, sla: float, service_time: int, interval: float, patience: float) -> tuple:
+    """Retorna ``(tráfego ofertado, HC single-skill)`` de um grupo de skill."""
+    contacts: float = float(sg["contacts_per_interval"])
+    aht: int = int(sg["aht"])
+    offered: float = contacts * aht / interval
+
+    if contacts == 0:
+        # Skill sem volume previsto: demanda zero — sem o HC mínimo de 1
+        # que agents_required retorna e sem exigir cobertura por pool.
+        return offered, 0
+    baseline_hc: int = agents_required(
+        sla=sla,
+        service_time=service_time,
+        contacts_per_interval=contacts,
+        aht=aht,
+        interval=interval,
+        patience=patience,
+    )
+    return offered, baseline_hc
+
+
+def _adjusted_hc(offered: float, baseline_hc: int, cross_skilled: bool, sharing_factor: float) -> int:
+    if cross_skilled and baseline_hc > 0:
+        traffic_floor: int = int(math.ceil(offered)) + 1
+        shared_target: int = int(math.ceil(baseline_hc * sharing_factor))
+        return max(traffic_floor, shared_target)
+    return baseline_hc
+
+
+def _skill_entry(
+    name: str,
+    offered: float,
+    baseline_hc: int,
+    adjusted_hc: int,
+    cross_skilled: bool,
+    eligible_hc: int,
+) -> dict:
+    occupancy_adjusted: float = (
+        offered / adjusted_hc if adjusted_hc > 0 else 0.0
+    )
+    return {
+        "name": name,
+        "offered_traffic": offered,
+        "baseline_hc": baseline_hc,
+        "adjusted_hc": adjusted_hc,
+        "cross_skilled": cross_skilled,
+        "occupancy_adjusted": occupancy_adjusted,
+        "eligible_pool_hc": eligible_hc,
+    }
 
-        per_skill.append(
-            {
-                "name": name,
-                "offered_traffic": offered,
-                "baseline_hc": baseline_hc,
-                "adjusted_hc": adjusted_hc,
-                "cross_skilled": is_cross_skilled,
-                "occupancy_adjusted": occupancy_adjusted,
-                "eligible_pool_hc": eligible_hc,
-            }
-        )
 
+def _totals(per_skill: list, agent_pools: list, covered: int, sharing_factor: float) -> dict:
     naive_total: int = sum(s["baseline_hc"] for s in per_skill)
     adjusted_total: int = sum(s["adjusted_hc"] for s in per_skill)
     offered_total: float = sum(s["offered_traffic"] for s in per_skill)
     pool_capacity: int = sum(p["count"] for p in agent_pools)
 
     return {
-        "per_skill": per_skill,
-        "totals": {
-            "naive_total_hc": naive_total,
-            "adjusted_total_hc": adjusted_total,
-            "savings_hc": naive_total - adjusted_total,
-            "offered_traffic_total": offered_total,
-            "pool_capacity_hc": pool_capacity,
-            "fits_in_pool_capacity": _pools_cover_requirement(per_skill, agent_pools),
-            "sharing_factor": sharing_factor,
-        },
+        "naive_total_hc": naive_total,
+        "adjusted_total_hc": adjusted_total,
+        "savings_hc": naive_total - adjusted_total,
+        "offered_traffic_total": offered_total,
+        "pool_capacity_hc": pool_capacity,
+        "fits_in_pool_capacity": covered >= adjusted_total,
+        "sharing_factor": sharing_factor,
     }
 
 
-def _pools_cover_requirement(per_skill: list, agent_pools: list) -> bool:
-    """Decide se os pools cobrem o HC ajustado via fluxo máximo (Edmonds-Karp).
+# Fonte da rede de alocação; o sumidouro depende do número de pools e skills.
+_SOURCE: int = 0
+
+
+class _FlowNetwork:
+    """Rede de fluxo com adjacência em listas paralelas, resolvida por Dinic.
+
+    Cada aresta ``e`` guarda destino (``head[e]``) e capacidade residual
+    (``cap[e]``); a reversa é sempre ``e ^ 1``, de modo que o fluxo numa
+    aresta é a capacidade residual da sua reversa. ``max_flow`` parte do
+    fluxo já presente no grafo residual, então aumentar capacidades e chamar
+    de novo só procura os caminhos aumentantes que faltam.
+    """
+
+    def __init__(self, nodes: int) -> None:
+        self.head: list = []
+        self.cap: list = []
+        self.adjacency: list = [[] for _ in range(nodes)]
+
+    def add_edge(self, u: int, v: int, cap: int) -> int:
+        """Adiciona a aresta ``u -> v`` e sua reversa; retorna o índice da direta."""
+        edge: int = len(self.head)
+        self.head.append(v)
+        self.cap.append(cap)
+        self.adjacency[u].append(edge)
+        self.head.append(u)
+        self.cap.append(0)
+        self.adjacency[v].append(edge + 1)
+        return edge
+
+    def add_node(self) -> int:
+        """Acrescenta um nó isolado e retorna seu índice."""
+        self.adjacency.append([])
+        return len(self.adjacency) - 1
+
+    def flow(self, edge: int) -> int:
+        """Fluxo corrente na aresta direta ``edge``."""
+        return self.cap[edge ^ 1]
+
+    def set_capacity(self, edge: int, capacity: int, source: int, sink: int) -> int:
+        """Muda a capacidade da aresta direta ``edge`` mantendo o fluxo válido.
+
+        Se o fluxo corrente passar da nova capacidade, o excedente é retirado
+        dos caminhos fonte -> ``edge`` -> sumidouro que o carregam (a rede
+        precisa ser acíclica, como a de alocação de pools).
+
+        Returns:
+            int: Unidades de fluxo canceladas; ``max_flow`` pode tentar
+                reencaminhá-las.
+        """
+        carried: int = self.cap[edge ^ 1]
+        if capacity >= carried:
+            self.cap[edge] = capacity - carried
+            return 0
+        excess: int = carried - capacity
+        self.cap[edge] = 0
+        self.cap[edge ^ 1] = capacity
+        self._withdraw(self.head[edge ^ 1], source, excess, backward=True)
+        self._withdraw(self.head[edge], sink, excess, backward=False)
+        return excess
+
+    def _withdraw(self, start: int, stop: int, amount: int, backward: bool) -> None:
+        # Desfaz ``amount`` unidades de fluxo entre ``start`` e ``stop`` seguindo
+        # arestas que carregam fluxo: para trás pelas reversas (índices ímpares)
+        # até a fonte, ou para frente pelas diretas (pares) até o sumidouro. A
+        # conservação de fluxo garante que sempre há uma aresta a seguir.
+        head: list = self.head
+        cap: list = self.cap
+        adjacency: list = self.adjacency
+        parity: int = 1 if backward else 0
+        while amount > 0 and start != stop:
+            path: list = []
+            bottleneck: int = amount
+            u: int = start
+            while u != stop:
+                for edge in adjacency[u]:
+                    if edge & 1 == parity and cap[edge ^ parity ^ 1] > 0:
+                        break
+                forward: int = edge ^ parity
+                if cap[forward ^ 1] < bottleneck:
+                    bottleneck = cap[forward ^ 1]
+                path.append(forward)
+                u = head[edge]
+            for forward in path:
+                cap[forward] += bottleneck
+                cap[forward ^ 1] -= bottleneck
+            amount -= bottleneck
+
+    def _levels(self, source: int, sink: int) -> list:
+        # BFS no grafo residual: nível de cada nó a partir da fonte (-1 = inalcançável).
+        head: list = self.head
+        cap: list = self.cap
+        adjacency: list = self.adjacency
+        level: list = [-1] * len(adjacency)
+        level[source] = 0
+        queue: deque = deque([source])
+        while queue:
+            u: int = queue.popleft()
+            next_level: int = level[u] + 1
+            for edge in adjacency[u]:
+                v: int = head[edge]
+                if cap[edge] > 0 and level[v] < 0:
+                    level[v] = next_level
+                    if v == sink:
+                        return level
+                    queue.append(v)
+        return level
+
+    def max_flow(self, source: int, sink: int, limit: int) -> int:
+        """Aumenta o fluxo até ``limit`` unidades adicionais e retorna quanto aumentou.
+
+        Fases de Dinic: BFS de níveis e, em cada fase, caminhos aumentantes
+        por DFS iterativa com ponteiro de arco corrente (cada aresta saturada
+        ou sem saída é descartada de vez na fase).
+        """
+        head: list = self.head
+        cap: list = self.cap
+        adjacency: list = self.adjacency
+        pushed_total: int = 0
+        while pushed_total < limit:
+            level: list = self._levels(source, sink)
+            if level[sink] < 0:
+                break
+            arc: list = [0] * len(adjacency)
+            path: list = []
+            u: int = source
+            while pushed_total < limit:
+                if u == sink:
+                    bottleneck: int = limit - pushed_total
+                    for edge in path:
+                        if cap[edge] < bottleneck:
+                            bottleneck = cap[edge]
+                    for edge in path:
+                        cap[edge] -= bottleneck
+                        cap[edge ^ 1] += bottleneck
+                    pushed_total += bottleneck
+                    path = []
+                    u = source
+                    continue
+                edges: list = adjacency[u]
+                i: int = arc[u]
+                wanted: int = level[u] + 1
+                while i < len(edges):
+                    edge = edges[i]
+                    if cap[edge] > 0 and level[head[edge]] == wanted:
+                        break
+                    i += 1
+                arc[u] = i
+                if i < len(edges):
+                    path.append(edges[i])
+                    u = head[edges[i]]
+                elif u == source:
+                    break
+                else:
+                    # Beco sem saída: tira o nó da fase e recua um arco.
+                    level[u] = -1
+                    edge = path.pop()
+                    u = head[edge ^ 1]
+                    arc[u] += 1
+        return pushed_total
+
+
+def _build_network(demands: dict, agent_pools: list) -> tuple:
+    """Monta a rede de alocação pools -> skills.
 
     Modela o problema de alocação como um grafo bipartite: fonte -> pool
     (capacidade ``count``), pool -> skill que ele atende (capacidade
-    ilimitada) e skill -> sumidouro (capacidade ``adjusted_hc``). Os pools
+    ``count``) e skill -> sumidouro (capacidade ``adjusted_hc``). Os pools
     cobrem o requisito se, e somente se, o fluxo máximo igualar a demanda
     total — checagens agregadas ou por skill deixam passar déficits em
     subconjuntos sobrepostos (ex.: duas skills de 10 disputando um único
     pool compartilhado de 10).
-    """
-    demand_total: int = sum(s["adjusted_hc"] for s in per_skill)
-    if demand_total == 0:
-        return True
 
+    Args:
+        demands (dict): ``adjusted_hc`` por nome de skill, na ordem das skills.
+        agent_pools (list[dict]): Pools no formato de :func:`agents_required_multi`.
+
+    Returns:
+        tuple: ``(rede, sumidouro, arestas fonte -> pool, arestas pool -> skill,
+            arestas skill -> sumidouro)``; as arestas pool -> skill vêm como
+            um dict skill -> aresta por pool.
+    """
     # Nós: 0 = fonte, 1..P = pools, P+1..P+S = skills, último = sumidouro.
-    source: int = 0
     pool_base: int = 1
     skill_base: int = pool_base + len(agent_pools)
-    sink: int = skill_base + len(per_skill)
-    skill_index = {s["name"]: skill_base + i for i, s in enumerate(per_skill)}
+    sink: int = skill_base + len(demands)
+    skill_index = {name: skill_base + i for i, name in enumerate(demands)}
 
-    capacity: dict = {}
+    network = _FlowNetwork(sink + 1)
+    source_edges: list = []
+    pool_edges: list = []
+    for i, pool in enumerate(agent_pools):
+        count: int = int(pool["count"])
+        source_edges.append(network.add_edge(_SOURCE, pool_base + i, count))
+        pool_edges.append(
+            {sk: network.add_edge(pool_base + i, skill_index[sk], count) for sk in pool["skills"]}
+        )
+    sink_edges: dict = {
+        name: network.add_edge(skill_index[name], sink, int(demand)) for name, demand in demands.items()
+    }
+    return network, sink, source_edges, pool_edges, sink_edges
 
-    def _add_edge(u: int, v: int, cap: int) -> None:
-        capacity.setdefault(u, {})[v] = capacity.get(u, {}).get(v, 0) + cap
-        capacity.setdefault(v, {}).setdefault(u, 0)
 
-    for i, pool in enumerate(agent_pools):
-        _add_edge(source, pool_base + i, int(pool["count"]))
-        for sk in pool["skills"]:
-            _add_edge(pool_base + i, skill_index[sk], int(pool["count"]))
-    for s in per_skill:
-        _add_edge(skill_index[s["name"]], sink, int(s["adjusted_hc"]))
-
-    max_flow: int = 0
-    while True:
-        # BFS por caminho aumentante.
-        parent = {source: None}
-        queue = [source]
-        while queue and sink not in parent:
-            u = queue.pop(0)
-            for v, cap in capacity.get(u, {}).items():
-                if cap > 0 and v not in parent:
-                    parent[v] = u
-                    queue.append(v)
-        if sink not in parent:
-            break
-        bottleneck = demand_total
-        v = sink
-        while parent[v] is not None:
-            u = parent[v]
-            bottleneck = min(bottleneck, capacity[u][v])
-            v = u
-        v = sink
-        while parent[v] is not None:
-            u = parent[v]
-            capacity[u][v] -= bottleneck
-            capacity[v][u] += bottleneck
-            v = u
-        max_flow += bottleneck
-
-    return max_flow >= demand_total
+def _pool_allocation(network: _FlowNetwork, agent_pools: list, pool_edges: list) -> list:
+    """Lê do fluxo corrente a alocação de cada pool (``assigned`` por skill e ``idle``)."""
+    allocation: list = []
+    for pool, edges in zip(agent_pools, pool_edges):
+        assigned = {sk: network.flow(edges[sk]) for sk in pool["skills"]}
+        allocation.append(
+            {
+                "skills": list(pool["skills"]),
+                "count": pool["count"],
+                "assigned": assigned,
+                "idle": int(pool["count"]) - sum(assigned.values()),
+            }
+        )
+    return allocation
+
+
+def _allocate_pools(per_skill: list, agent_pools: list) -> tuple:
+    """Aloca os agentes dos pools às skills via fluxo máximo (Dinic).
+
+    Returns:
+        tuple: ``(fluxo máximo, alocação)``, em que a alocação tem uma
+            entrada por pool (na ordem de ``agent_pools``) com ``skills``,
+            ``count``, ``assigned`` (agentes por skill) e ``idle``.
+    """
+    demands = {s["name"]: int(s["adjusted_hc"]) for s in per_skill}
+    network, sink, _, pool_edges, _ = _build_network(demands, agent_pools)
+    max_flow: int = network.max_flow(_SOURCE, sink, sum(demands.values()))
+    return max_flow, _pool_allocation(network, agent_pools, pool_edges)
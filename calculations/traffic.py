@@ -2,57 +2,257 @@
 Módulo para cálculos relacionados à intensidade de tráfego.
 """
 
-from mod_turbotab.calculations.erlang import erlang_b
+import json
+import math
+from array import array
+from typing import Callable, Sequence
 
-MAX_ACCURACY: float = 0.00001
-MAX_LOOPS: int = 100
-
-def looping_traffic(trunks: float, blocking: float, increment: float, max_intensity: float, min_intensity: float) -> float:
-    """Aproxima iterativamente a intensidade de tráfego para um dado número de trunks e bloqueio.
+from mod_turbotab.calculations import instrumentation as _kernel_stats
+from mod_turbotab.calculations.erlang import erlang_b, erlang_b_large
+from mod_turbotab.calculations.instrumentation import timed
+from mod_turbotab.exceptions import CalculationError, InputValidationError
 
-    Args:
-        trunks (float): Número de trunks.
-        blocking (float): Fator de bloqueio desejado.
-        increment (float): Incremento inicial.
-        max_intensity (float): Valor máximo de intensidade considerado.
-        min_intensity (float): Valor mínimo de intensidade considerado.
+MAX_LOOPS: int = 100
+# Tolerância absoluta padrão (em erlangs) da inversão de Erlang B em traffic().
+DEFAULT_TOLERANCE: float = 1e-9
+# Graus de serviço pré-calculados por padrão em TrafficTable.
+DEFAULT_BLOCKINGS: tuple = (0.001, 0.005, 0.01, 0.02, 0.05)
+_TABLE_FORMAT: str = "turbotab.traffic_table"
+_TABLE_VERSION: int = 1
 
-    Returns:
-        float: Intensidade de tráfego aproximada.
-    """
-    min_i: float = min_intensity
-    intensity: float = min_i
-    loop_no: int = 0
-    while increment >= MAX_ACCURACY and loop_no < MAX_LOOPS:
-        b: float = erlang_b(trunks, intensity)
-        if b > blocking:
-            max_intensity = intensity
-            increment /= 10
-            intensity = min_i
-        min_i = intensity
-        intensity += increment
-        loop_no += 1
-    return min_i
-
-def traffic(servers: float, blocking: float) -> float:
+@timed
+def traffic(servers: float, blocking: float, tolerance: float = DEFAULT_TOLERANCE) -> float:
     """Calcula a intensidade de tráfego (em erlangs) para um dado número de servidores e bloqueio.
 
+    Inverte Erlang B em ``A`` por Newton salvaguardado: o intervalo
+    ``[lo, hi]`` com ``B(lo) < blocking <= B(hi)`` é mantido a cada passo, e
+    qualquer passo de Newton que saia dele vira bisseção. A derivada é
+    analítica — da recorrência, ``dB/dA = B (N/A - 1 + B)`` — então cada
+    iteração custa uma única avaliação do kernel e a convergência é
+    quadrática perto da raiz.
+
     Args:
         servers (float): Número de trunks disponíveis.
-        blocking (float): Fator de bloqueio alcançado.
+        blocking (float): Fator de bloqueio alcançado (menor que 1).
+        tolerance (float, optional): Tolerância absoluta da raiz, em erlangs.
+            Padrão: 1e-9.
 
     Returns:
         float: Intensidade de tráfego.
+
+    Raises:
+        InputValidationError: Se ``tolerance`` não for positiva ou ``blocking >= 1``.
+        CalculationError: Se a iteração não convergir.
     """
+    if not (tolerance > 0):
+        raise InputValidationError("tolerance must be > 0.")
     trunks_val: float = float(int(servers))
-    if servers < 1 or blocking < 0:
+    if servers < 1 or blocking <= 0:
         return 0.0
-    max_i: float = trunks_val
-    b: float = erlang_b(servers, max_i)
-    while b < blocking:
-        max_i *= 2
-        b = erlang_b(servers, max_i)
-    incr: float = 1.0
-    while incr <= max_i / 100:
-        incr *= 10
-    return looping_traffic(trunks_val, blocking, incr, max_i, 0.0)
+    if blocking >= 1:
+        raise InputValidationError("blocking must be < 1.")
+    blocking_at = erlang_b
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        blocking_at = recorder.counting('traffic', erlang_b)
+    lo: float = 0.0
+    hi: float = trunks_val
+    while blocking_at(trunks_val, hi) < blocking:
+        lo = hi
+        hi *= 2
+    return _invert_erlang_b(trunks_val, blocking, tolerance, lo, hi)
+
+def _invert_erlang_b(trunks_val: float, blocking: float, tolerance: float, lo: float, hi: float, kernel: Callable[[float, float], float] = erlang_b) -> float:
+    """Newton salvaguardado de :func:`traffic` sobre um intervalo já válido.
+
+    Exige ``B(lo) < blocking <= B(hi)``; parte de ``hi`` e nunca sai do
+    intervalo. ``kernel`` avalia ``B(n, A)`` (padrão: :func:`erlang_b`).
+    """
+    intensity: float = hi
+    blocking_at = kernel
+    recorder = _kernel_stats._active
+    if recorder is not None:
+        blocking_at = recorder.counting('traffic', kernel)
+    for _ in range(MAX_LOOPS):
+        b: float = blocking_at(trunks_val, intensity)
+        if b == blocking:
+            return intensity
+        if b < blocking:
+            lo = intensity
+        else:
+            hi = intensity
+        slope: float = b * (trunks_val / intensity - 1 + b)
+        if slope > 0:
+            candidate: float = intensity - (b - blocking) / slope
+        else:
+            candidate = 0.5 * (lo + hi)
+        # Um passo de Newton abaixo de 1 ulp devolve o próprio extremo: é
+        # convergência, não motivo para bisseção.
+        if not (lo <= candidate <= hi):
+            candidate = 0.5 * (lo + hi)
+        if abs(candidate - intensity) <= tolerance or hi - lo <= tolerance:
+            return candidate
+        intensity = candidate
+    raise CalculationError("traffic did not converge; increase the tolerance.")
+
+class TrafficTable:
+    """Tabela pré-calculada de Erlang B inverso para consultas em massa.
+
+    Guarda, para cada grau de serviço, o tráfego máximo ofertado
+    ``traffic(n, blocking)`` de ``n = 1`` a ``max_servers`` num
+    ``array('d')``. Cada consulta é O(1): leitura direta para servidores
+    inteiros e interpolação linear entre ``floor`` e ``ceil`` para
+    servidores fracionários (com ``A(0) = 0``). A tabela pode ser salva em
+    arquivo e recarregada, para que execuções repetidas da CLI não refaçam
+    o cálculo.
+
+    A construção aproveita que ``A(n)`` cresce com ``n``: o intervalo de
+    cada inversão começa em ``A(n - 1)``, então poucas iterações de Newton
+    bastam por entrada. Cada iteração avalia ``B(n, A)`` com
+    :func:`~mod_turbotab.calculations.erlang.erlang_b_large`, em ``O(√A)``
+    passos em vez dos ``n`` da recorrência completa: a tabela inteira custa
+    ``O(N^1.5)`` por grau de serviço, não ``O(N²)``. Os valores coincidem com
+    :func:`traffic` dentro de ``tolerance`` (mais o ruído de arredondamento
+    do kernel truncado, ~1e-14 relativo, que só aparece para ``A`` grande).
+
+    Args:
+        max_servers (int): Maior número de servidores da tabela (>= 1).
+        blockings (Sequence[float], optional): Graus de serviço, cada um em
+            (0, 1). Padrão: 0.001, 0.005, 0.01, 0.02 e 0.05.
+        tolerance (float, optional): Tolerância absoluta de cada inversão,
+            em erlangs. Padrão: 1e-9.
+
+    Raises:
+        InputValidationError: Se os parâmetros forem inválidos.
+    """
+
+    def __init__(self, max_servers: int, blockings: Sequence[float] = DEFAULT_BLOCKINGS, tolerance: float = DEFAULT_TOLERANCE) -> None:
+        if int(max_servers) != max_servers or max_servers < 1:
+            raise InputValidationError("max_servers must be an integer >= 1.")
+        if not blockings:
+            raise InputValidationError("blockings must not be empty.")
+        for blocking in blockings:
+            if not (0 < blocking < 1):
+                raise InputValidationError("Each blocking level must be in the range (0, 1).")
+        if not (tolerance > 0):
+            raise InputValidationError("tolerance must be > 0.")
+        self.max_servers: int = int(max_servers)
+        self.tolerance: float = tolerance
+        self._levels: dict = {
+            float(blocking): self._build_level(float(blocking))
+            for blocking in sorted(set(blockings))
+        }
+
+    @property
+    def blockings(self) -> tuple:
+        """Graus de serviço disponíveis, em ordem crescente."""
+        return tuple(self._levels)
+
+    def _build_level(self, blocking: float) -> array:
+        """Inverte Erlang B para n = 1..max_servers, com intervalo aquecido pelo n anterior."""
+        level: array = array('d', [0.0])
+        previous: float = 0.0
+        gap: float = 1.0
+        for count in range(1, self.max_servers + 1):
+            trunks_val: float = float(count)
+            # B(n, A(n - 1)) < B(n - 1, A(n - 1)) = blocking: A(n - 1) já é
+            # um limite inferior válido. ``A(n)`` cresce quase linearmente,
+            # então ``A(n - 1)`` mais o último incremento cai colado à raiz e
+            # o superior só precisa de uma folga pequena acima dele.
+            guess: float = previous + gap
+            margin: float = gap * 1e-3 + self.tolerance
+            lo: float = previous
+            hi: float = guess + margin
+            while erlang_b_large(trunks_val, hi) < blocking:
+                lo = hi
+                margin *= 4
+                hi = guess + margin
+            intensity: float = _invert_erlang_b(trunks_val, blocking, self.tolerance, lo, hi, erlang_b_large)
+            gap = intensity - previous
+            previous = intensity
+            level.append(intensity)
+        return level
+
+    def lookup(self, servers: float, blocking: float) -> float:
+        """Consulta o tráfego máximo ofertado para ``servers`` e ``blocking``.
+
+        Args:
+            servers (float): Número de servidores, em ``[0, max_servers]``;
+                valores fracionários são interpolados linearmente.
+            blocking (float): Grau de serviço — deve ser um dos níveis da tabela.
+
+        Returns:
+            float: Intensidade de tráfego (em erlangs).
+
+        Raises:
+            InputValidationError: Se ``blocking`` não estiver na tabela ou
+                ``servers`` estiver fora do intervalo coberto.
+        """
+        level = self._levels.get(float(blocking))
+        if level is None:
+            raise InputValidationError(
+                f"blocking {blocking} is not in the table (available: {list(self._levels)})."
+            )
+        if not (0 <= servers <= self.max_servers):
+            raise InputValidationError(
+                f"servers must be in the range [0, {self.max_servers}] for this table."
+            )
+        floor_n: int = int(servers)
+        fraction: float = servers - floor_n
+        if fraction == 0:
+            return level[floor_n]
+        return level[floor_n] + fraction * (level[floor_n + 1] - level[floor_n])
+
+    def save(self, path: str) -> None:
+        """Grava a tabela em ``path`` (JSON), para reuso por :meth:`load`.
+
+        Args:
+            path (str): Caminho do arquivo de saída.
+        """
+        document: dict = {
+            "format": _TABLE_FORMAT,
+            "version": _TABLE_VERSION,
+            "max_servers": self.max_servers,
+            "tolerance": self.tolerance,
+            "levels": {repr(blocking): list(level) for blocking, level in self._levels.items()},
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "TrafficTable":
+        """Carrega uma tabela gravada por :meth:`save`.
+
+        Args:
+            path (str): Caminho do arquivo.
+
+        Returns:
+            TrafficTable: Tabela pronta para consulta, sem recalcular.
+
+        Raises:
+            InputValidationError: Se o arquivo não for uma tabela válida.
+        """
+        try:
+            with open(path, encoding="utf-8") as handle:
+                document: dict = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise InputValidationError(f"Could not read traffic table '{path}': {e}") from e
+        if (
+            not isinstance(document, dict)
+            or document.get("format") != _TABLE_FORMAT
+            or document.get("version") != _TABLE_VERSION
+        ):
+            raise InputValidationError(f"'{path}' is not a version {_TABLE_VERSION} traffic table.")
+        table: TrafficTable = cls.__new__(cls)
+        table._levels = {}
+        try:
+            table.max_servers = int(document["max_servers"])
+            table.tolerance = float(document["tolerance"])
+            for key, values in document["levels"].items():
+                level: array = array('d', values)
+                if len(level) != table.max_servers + 1 or not all(math.isfinite(v) for v in level):
+                    raise InputValidationError(f"'{path}' has a malformed level for blocking {key}.")
+                table._levels[float(key)] = level
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise InputValidationError(f"'{path}' is not a valid traffic table: {e!r}") from e
+        return table
@@ -2,69 +2,190 @@
 
 from __future__ import annotations
 
+import time
+
+# Início do import deste módulo, para o span de import do --profile.
+_IMPORT_STARTED = time.perf_counter_ns()
+
 import argparse
+import importlib
 import json
 import sys
-from collections.abc import Callable
-from typing import Any
-
-from mod_turbotab import __version__
-from mod_turbotab.agents.capacity import (
-    agents_asa,
-    agents_required,
-    asa,
-    contact_capacity,
-    fractional_agents,
-    fractional_contact_capacity,
-    nb_agents,
-)
-from mod_turbotab.agents.roster import rostered_agents, rostered_fractional_agents
-from mod_turbotab.agents.shrinkage import scheduled_agents, scheduled_fractional_agents
-from mod_turbotab.calculations.erlang import (
-    engset_b,
-    erlang_a,
-    erlang_b,
-    erlang_b_ext,
-    erlang_c,
-)
-from mod_turbotab.calculations.traffic import traffic
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
 from mod_turbotab.exceptions import CalculationError, InputValidationError
-from mod_turbotab.queues.queues import (
-    queue_size,
-    queue_time,
-    queued,
-    service_time,
-    sla_metric,
-)
-from mod_turbotab.trunks.trunks import number_trunks, trunks_required
 
 
 DEFAULT_INTERVAL = 600.0
+DEFAULT_CHUNK_SIZE = 256
 
 
 def main(argv: list[str] | None = None) -> int:
     """Executa a interface de linha de comando do turbotab."""
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
+    global _profiler
+    if argv is None:
+        argv = sys.argv[1:]
+    # O --profile é lido (e retirado) antes do argparse para que a montagem
+    # do parser também entre nos spans.
+    trace, argv = _profile_target(argv)
+    if trace is None:
+        return _run(argv)
+    _profiler = _Profiler()
+    _profiler.add("import mod_turbotab.cli", _IMPORT_STARTED, _IMPORT_FINISHED)
+    try:
+        with _span("main"):
+            return _run(argv)
+    finally:
+        profiler, _profiler = _profiler, None
+        profiler.report(trace)
+
+
+def _run(argv: list[str]) -> int:
+    # Só a categoria pedida é montada; ajuda geral, --version e categorias
+    # desconhecidas continuam vendo a árvore completa.
+    category = argv[0] if argv and argv[0] in _CATEGORY_COMMANDS else None
+    with _span("build parser"):
+        parser = build_parser(category)
+    with _span("parse args"):
+        args = parser.parse_args(argv)
+
+    if hasattr(args, "stream"):
+        return args.stream(args)
     if not hasattr(args, "handler"):
         args.help_parser.print_help()
         return 0
 
     try:
-        payload = args.handler(args)
+        with _span(f"handle {args.calculation}"):
+            if args.stats:
+                from mod_turbotab.calculations.instrumentation import KernelStats
+
+                with KernelStats() as stats:
+                    payload = args.handler(args)
+                payload["diagnostics"] = stats.stats()
+            else:
+                payload = args.handler(args)
     except (InputValidationError, CalculationError, ValueError, ZeroDivisionError) as exc:
         print(f"turbotab: error: {exc}", file=sys.stderr)
         return 2
 
-    if args.json:
-        print(json.dumps(payload, sort_keys=True, ensure_ascii=False))
-    else:
-        print(_format_text(payload))
+    with _span("serialize"):
+        text = json.dumps(payload, sort_keys=True, ensure_ascii=False) if args.json else _format_text(payload)
+    with _span("write output"):
+        print(text)
     return 0
 
 
-def build_parser() -> argparse.ArgumentParser:
+# Coletor de spans do --profile; None (o padrão) desliga a coleta.
+_profiler: _Profiler | None = None
+
+
+def _profile_target(argv: list[str]) -> tuple[str | None, list[str]]:
+    """Separa o ``--profile`` de ``argv``: ``(destino, argv sem a flag)``.
+
+    O destino é ``"-"`` (stderr) para ``--profile`` e ``PATH`` para
+    ``--profile=PATH``, ou None sem a flag. O caminho só vem colado ao ``=``:
+    ``--profile staffing required`` não toma ``staffing`` por arquivo.
+    """
+    for index, token in enumerate(argv):
+        if token == "--":
+            break
+        if token == "--profile" or token.startswith("--profile="):
+            return token.partition("=")[2] or "-", argv[:index] + argv[index + 1 :]
+    return None, argv
+
+
+class _Span:
+    """Intervalo do --profile medido em ``perf_counter_ns`` (relógio monotônico)."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if _profiler is not None:
+            _profiler.add(self.name, self.start, time.perf_counter_ns())
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _span(name: str) -> _Span | _NoSpan:
+    """Span nomeado quando o --profile está ativo; senão, um contexto vazio."""
+    return _NO_SPAN if _profiler is None else _Span(name)
+
+
+class _Profiler:
+    """Spans de uma execução, emitidos no stderr ou como trace do Chrome."""
+
+    def __init__(self) -> None:
+        self.spans: list[tuple[str, int, int]] = []
+
+    def add(self, name: str, start: int, end: int) -> None:
+        self.spans.append((name, start, end))
+
+    def _ordered(self) -> list[tuple[str, int, int, int]]:
+        """Spans por início (os externos antes), com a profundidade de aninhamento."""
+        ordered = sorted(self.spans, key=lambda span: (span[1], -span[2]))
+        open_ends: list[int] = []
+        rows = []
+        for name, start, end in ordered:
+            while open_ends and start >= open_ends[-1]:
+                open_ends.pop()
+            rows.append((name, start, end, len(open_ends)))
+            open_ends.append(end)
+        return rows
+
+    def report(self, target: str) -> None:
+        rows = self._ordered()
+        if target == "-":
+            width = max((len(name) + 2 * depth for name, _, _, depth in rows), default=0)
+            lines = ["turbotab: profile (ms)"]
+            for name, start, end, depth in rows:
+                label = "  " * depth + name
+                lines.append(f"  {label:<{width}}  {(end - start) / 1e6:10.3f}")
+            print("\n".join(lines), file=sys.stderr)
+            return
+        import os
+
+        origin = rows[0][1] if rows else 0
+        events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0, "args": {"name": "turbotab"}},
+        ]
+        for name, start, end, _ in rows:
+            events.append({
+                "name": name,
+                "cat": "turbotab",
+                "ph": "X",
+                "ts": (start - origin) / 1e3,
+                "dur": (end - start) / 1e3,
+                "pid": os.getpid(),
+                "tid": 0,
+            })
+        try:
+            with open(target, "w", encoding="utf-8") as handle:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        except OSError as exc:
+            print(f"turbotab: error: could not write profile trace: {exc}", file=sys.stderr)
+
+
+def build_parser(category: str | None = None) -> argparse.ArgumentParser:
+    """Monta o parser; com ``category``, só os subcomandos dessa categoria."""
     parser = argparse.ArgumentParser(
         prog="turbotab",
         description=(
@@ -72,22 +193,50 @@ def build_parser() -> argparse.ArgumentParser:
             "capacity calculations."
         ),
     )
-    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--version", action=_VersionAction)
     parser.set_defaults(help_parser=parser)
 
     categories = parser.add_subparsers(dest="category", metavar="category")
-    _add_staffing_commands(categories)
-    _add_sla_commands(categories)
-    _add_queue_commands(categories)
-    _add_telecom_commands(categories)
-    _add_agents_commands(categories)
-    _add_queues_commands(categories)
-    _add_erlang_commands(categories)
-    _add_traffic_commands(categories)
-    _add_trunks_commands(categories)
+    for name, add_commands in _CATEGORY_COMMANDS.items():
+        if category is None or name == category:
+            add_commands(categories)
     return parser
 
 
+class _VersionAction(argparse.Action):
+    """``--version`` que só resolve a versão do pacote quando é pedido."""
+
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, **kwargs: Any) -> None:
+        super().__init__(
+            option_strings,
+            dest=dest,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help="show program's version number and exit",
+        )
+
+    def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace, values: Any, option_string: str | None = None) -> None:
+        from mod_turbotab import __version__
+
+        print(f"{parser.prog} {__version__}")
+        parser.exit()
+
+
+def _lazy(module: str, name: str) -> Callable[..., Any]:
+    """Adia o import de ``mod_turbotab.<module>`` até o handler rodar."""
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        qualified = f"mod_turbotab.{module}"
+        if qualified in sys.modules:
+            return getattr(sys.modules[qualified], name)(*args, **kwargs)
+        with _span(f"import {qualified}"):
+            target = getattr(importlib.import_module(qualified), name)
+        return target(*args, **kwargs)
+
+    call.__name__ = name
+    return call
+
+
 def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
     parser = categories.add_parser("staffing", help="Intent-first staffing calculations for agents.")
     parser.set_defaults(help_parser=parser)
@@ -104,12 +253,12 @@ def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.Argum
     _add_max_occupancy_arg(required)
     _add_shrinkage_arg(required)
     _add_shifts_arg(required)
-    required.set_defaults(
-        handler=lambda args: _handle_headcount_chain(
-            args, "staffing.required", agents_required, scheduled_agents, rostered_agents
-        ),
-        calculation="staffing.required",
+    required.add_argument(
+        "--table",
+        default=None,
+        help="Answer from a precomputed table written by 'staffing table' (same --sla, --service-time and --aht).",
     )
+    required.set_defaults(handler=_handle_staffing_required, calculation="staffing.required")
 
     asa_parser = commands.add_parser("asa", help="Calculate average speed of answer in seconds.")
     _add_output_arg(asa_parser)
@@ -118,7 +267,7 @@ def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.Argum
     _add_aht_arg(asa_parser)
     _add_interval_arg(asa_parser)
     _add_patience_arg(asa_parser)
-    _set_handler(asa_parser, "staffing.asa", "seconds", "asa", asa)
+    _set_handler(asa_parser, "staffing.asa", "seconds", "asa", _lazy("agents.capacity", "asa"))
 
     capacity = commands.add_parser("capacity", help="Calculate maximum contacts for a staffed SLA target.")
     _add_output_arg(capacity)
@@ -133,7 +282,7 @@ def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.Argum
     _add_service_time_arg(capacity)
     _add_aht_arg(capacity)
     _add_interval_arg(capacity)
-    _set_handler(capacity, "staffing.capacity", "contacts_per_interval", "contact_capacity", contact_capacity)
+    _set_handler(capacity, "staffing.capacity", "contacts_per_interval", "contact_capacity", _lazy("agents.capacity", "contact_capacity"))
 
     fractional_required = commands.add_parser(
         "fractional-required",
@@ -147,15 +296,16 @@ def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.Argum
     _add_interval_arg(fractional_required)
     _add_patience_arg(fractional_required)
     _add_max_occupancy_arg(fractional_required)
+    _add_continuous_arg(fractional_required)
     _add_shrinkage_arg(fractional_required)
     _add_shifts_arg(fractional_required)
     fractional_required.set_defaults(
         handler=lambda args: _handle_headcount_chain(
             args,
             "staffing.fractional_required",
-            fractional_agents,
-            scheduled_fractional_agents,
-            rostered_fractional_agents,
+            _lazy("agents.capacity", "fractional_agents"),
+            _lazy("agents.shrinkage", "scheduled_fractional_agents"),
+            _lazy("agents.roster", "rostered_fractional_agents"),
         ),
         calculation="staffing.fractional_required",
     )
@@ -176,13 +326,84 @@ def _add_staffing_commands(categories: argparse._SubParsersAction[argparse.Argum
     _add_service_time_arg(fractional_capacity)
     _add_aht_arg(fractional_capacity)
     _add_interval_arg(fractional_capacity)
+    _add_whole_contacts_arg(fractional_capacity)
     _set_handler(
         fractional_capacity,
         "staffing.fractional_capacity",
         "contacts_per_interval",
         "fractional_contact_capacity",
-        fractional_contact_capacity,
+        _lazy("agents.capacity", "fractional_contact_capacity"),
+        # 1.2: ``value`` passou a ser fracionário; --whole-contacts devolve o antigo.
+        schema_version="1.2",
+    )
+
+    table = commands.add_parser(
+        "table",
+        help="Precompute the agents-required breakpoints of one SLA objective for fast repeated lookups.",
+    )
+    _add_output_arg(table)
+    table.add_argument("--max-agents", dest="max_agents", type=int, required=True, help="Largest agent count in the table.")
+    _add_sla_arg(table)
+    _add_service_time_arg(table)
+    _add_aht_arg(table)
+    table.add_argument("--output", required=True, help="Path of the table file to write.")
+    table.set_defaults(handler=_handle_staffing_table, calculation="staffing.table")
+
+    plan = commands.add_parser(
+        "plan",
+        help="Calculate the headcount chain for every interval of a day, plus daily totals.",
+    )
+    _add_output_arg(plan)
+    plan.add_argument(
+        "--input",
+        required=True,
+        help=(
+            "CSV (.csv) or JSON file with one row per interval, in order, with "
+            "contacts_per_interval and aht columns/keys."
+        ),
     )
+    plan.add_argument(
+        "--aht",
+        type=int,
+        default=None,
+        help="Average handle time in seconds for rows that leave aht empty.",
+    )
+    _add_sla_arg(plan)
+    _add_service_time_arg(plan)
+    _add_interval_arg(plan)
+    _add_patience_arg(plan)
+    _add_max_occupancy_arg(plan)
+    _add_shrinkage_arg(plan)
+    _add_shifts_arg(plan)
+    plan.set_defaults(handler=_handle_staffing_plan, calculation="staffing.plan")
+
+    plan_file = commands.add_parser(
+        "plan-file",
+        help="Stream a forecast CSV into a staffing requirement CSV with bounded memory.",
+        description=(
+            "Read a forecast CSV (queue, date, interval_start, contacts_per_interval, aht — queue, date "
+            "and any other columns are optional and copied through) and write the same rows plus "
+            "productive_agents, scheduled_agents and, with --shifts, rostered_agents. Rows are read, "
+            "solved and written one at a time; consecutive rows of the same queue and date share the "
+            "warm-started search. Throughput is reported on stderr."
+        ),
+    )
+    plan_file.add_argument("--input", required=True, help="Forecast CSV path, or '-' for stdin.")
+    plan_file.add_argument("--output", default="-", help="Output CSV path, or '-' for stdout (default).")
+    plan_file.add_argument(
+        "--aht",
+        type=int,
+        default=None,
+        help="Average handle time in seconds for rows that leave aht empty.",
+    )
+    _add_sla_arg(plan_file)
+    _add_service_time_arg(plan_file)
+    _add_interval_arg(plan_file)
+    _add_patience_arg(plan_file)
+    _add_max_occupancy_arg(plan_file)
+    _add_shrinkage_arg(plan_file)
+    _add_shifts_arg(plan_file)
+    plan_file.set_defaults(stream=_stream_plan_file)
 
 
 def _add_sla_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -198,7 +419,7 @@ def _add_sla_commands(categories: argparse._SubParsersAction[argparse.ArgumentPa
     _add_aht_arg(achieved)
     _add_interval_arg(achieved)
     _add_patience_arg(achieved)
-    _set_handler(achieved, "sla.achieved", "ratio", "sla_metric", sla_metric)
+    _set_handler(achieved, "sla.achieved", "ratio", "sla_metric", _lazy("queues.queues", "sla_metric"))
 
     target_time = commands.add_parser("target-time", help="Calculate answer time needed for a target SLA.")
     _add_output_arg(target_time)
@@ -208,7 +429,7 @@ def _add_sla_commands(categories: argparse._SubParsersAction[argparse.ArgumentPa
     _add_aht_arg(target_time)
     _add_interval_arg(target_time)
     _add_patience_arg(target_time)
-    _set_handler(target_time, "sla.target_time", "seconds", "service_time", service_time)
+    _set_handler(target_time, "sla.target_time", "seconds", "service_time", _lazy("queues.queues", "service_time"))
 
 
 def _add_queue_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -223,7 +444,7 @@ def _add_queue_commands(categories: argparse._SubParsersAction[argparse.Argument
     _add_aht_arg(wait_parser)
     _add_interval_arg(wait_parser)
     _add_patience_arg(wait_parser)
-    _set_handler(wait_parser, "queue.wait", "seconds", "queue_time", queue_time)
+    _set_handler(wait_parser, "queue.wait", "seconds", "queue_time", _lazy("queues.queues", "queue_time"))
 
     size_parser = commands.add_parser("size", help="Calculate average queue size in contacts.")
     _add_output_arg(size_parser)
@@ -232,7 +453,7 @@ def _add_queue_commands(categories: argparse._SubParsersAction[argparse.Argument
     _add_aht_arg(size_parser)
     _add_interval_arg(size_parser)
     _add_patience_arg(size_parser)
-    _set_handler(size_parser, "queue.size", "contacts", "queue_size", queue_size)
+    _set_handler(size_parser, "queue.size", "contacts", "queue_size", _lazy("queues.queues", "queue_size"))
 
     probability_parser = commands.add_parser("probability", help="Calculate probability that contacts queue.")
     _add_output_arg(probability_parser)
@@ -241,7 +462,33 @@ def _add_queue_commands(categories: argparse._SubParsersAction[argparse.Argument
     _add_aht_arg(probability_parser)
     _add_interval_arg(probability_parser)
     _add_patience_arg(probability_parser)
-    _set_handler(probability_parser, "queue.probability", "ratio", "queued", queued)
+    _set_handler(probability_parser, "queue.probability", "ratio", "queued", _lazy("queues.queues", "queued"))
+
+    snapshot_parser = commands.add_parser(
+        "snapshot",
+        help="Calculate every queue metric (Pw, ASA, size, wait, SLA, occupancy, abandonment) in one pass.",
+    )
+    _add_output_arg(snapshot_parser)
+    _add_agents_arg(snapshot_parser)
+    _add_contacts_arg(snapshot_parser)
+    _add_aht_arg(snapshot_parser)
+    _add_interval_arg(snapshot_parser)
+    _add_patience_arg(snapshot_parser)
+    snapshot_parser.add_argument(
+        "--service-time",
+        dest="service_times",
+        type=float,
+        action="append",
+        default=None,
+        help="Target answer time in seconds for an achieved-SLA entry; repeat for several targets.",
+    )
+    snapshot_parser.add_argument(
+        "--sla",
+        type=float,
+        default=None,
+        help="Optional SLA ratio; adds the answer time needed to reach it.",
+    )
+    _set_handler(snapshot_parser, "queue.snapshot", "metrics", "queue_snapshot", _lazy("queues.queues", "queue_snapshot"))
 
 
 def _add_telecom_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -255,7 +502,8 @@ def _add_telecom_commands(categories: argparse._SubParsersAction[argparse.Argume
     _add_contacts_arg(trunks_parser)
     _add_aht_arg(trunks_parser)
     _add_interval_arg(trunks_parser)
-    _set_handler(trunks_parser, "telecom.trunks", "trunks", "trunks_required", trunks_required)
+    _add_blocking_arg(trunks_parser)
+    _set_handler(trunks_parser, "telecom.trunks", "trunks", "trunks_required", _lazy("trunks.trunks", "trunks_required"))
 
 
 def _add_agents_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -287,7 +535,7 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_interval_arg(required)
     _add_patience_arg(required)
     _add_max_occupancy_arg(required)
-    _set_handler(required, "agents.required", "agents", "agents", agents_required)
+    _set_handler(required, "agents.required", "agents", "agents", _lazy("agents.capacity", "agents_required"))
 
     asa_parser = commands.add_parser("asa", help="Calculate average speed of answer in seconds.")
     _add_output_arg(asa_parser)
@@ -296,7 +544,7 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(asa_parser)
     _add_interval_arg(asa_parser)
     _add_patience_arg(asa_parser)
-    _set_handler(asa_parser, "agents.asa", "seconds", "asa", asa)
+    _set_handler(asa_parser, "agents.asa", "seconds", "asa", _lazy("agents.capacity", "asa"))
 
     asa_required = commands.add_parser("asa-required", help="Calculate agents required for a target ASA.")
     _add_output_arg(asa_required)
@@ -304,7 +552,7 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_contacts_arg(asa_required)
     _add_aht_arg(asa_required)
     _add_interval_arg(asa_required)
-    _set_handler(asa_required, "agents.asa_required", "agents", "agents", agents_asa)
+    _set_handler(asa_required, "agents.asa_required", "agents", "agents", _lazy("agents.capacity", "agents_asa"))
 
     nb_parser = commands.add_parser("nb-agents", help="Calculate agents required from average ASA and AHT.")
     _add_output_arg(nb_parser)
@@ -312,7 +560,7 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     nb_parser.add_argument("--avg-sa", type=float, required=True, help="Average speed of answer in seconds.")
     nb_parser.add_argument("--avg-ht", type=int, required=True, help="Average handle time in seconds.")
     _add_interval_arg(nb_parser)
-    _set_handler(nb_parser, "agents.nb_agents", "agents", "agents", nb_agents)
+    _set_handler(nb_parser, "agents.nb_agents", "agents", "agents", _lazy("agents.capacity", "nb_agents"))
 
     capacity = commands.add_parser("capacity", help="Calculate maximum contacts for a staffed SLA target.")
     _add_output_arg(capacity)
@@ -321,7 +569,7 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_service_time_arg(capacity)
     _add_aht_arg(capacity)
     _add_interval_arg(capacity)
-    _set_handler(capacity, "agents.capacity", "contacts_per_interval", "contact_capacity", contact_capacity)
+    _set_handler(capacity, "agents.capacity", "contacts_per_interval", "contact_capacity", _lazy("agents.capacity", "contact_capacity"))
 
     _RAW_FRACTIONAL_HELP = (
         "Calculate fractional on-phone agents required for a target SLA "
@@ -341,12 +589,13 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_interval_arg(fractional_required)
     _add_patience_arg(fractional_required)
     _add_max_occupancy_arg(fractional_required)
+    _add_continuous_arg(fractional_required)
     _set_handler(
         fractional_required,
         "agents.fractional_required",
         "agents",
         "fractional_agents",
-        fractional_agents,
+        _lazy("agents.capacity", "fractional_agents"),
     )
 
     fractional_capacity = commands.add_parser(
@@ -359,12 +608,15 @@ def _add_agents_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_service_time_arg(fractional_capacity)
     _add_aht_arg(fractional_capacity)
     _add_interval_arg(fractional_capacity)
+    _add_whole_contacts_arg(fractional_capacity)
     _set_handler(
         fractional_capacity,
         "agents.fractional_capacity",
         "contacts_per_interval",
         "fractional_contact_capacity",
-        fractional_contact_capacity,
+        _lazy("agents.capacity", "fractional_contact_capacity"),
+        # 1.2: ``value`` passou a ser fracionário; --whole-contacts devolve o antigo.
+        schema_version="1.2",
     )
 
 
@@ -380,7 +632,7 @@ def _add_queues_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(queued_parser)
     _add_interval_arg(queued_parser)
     _add_patience_arg(queued_parser)
-    _set_handler(queued_parser, "queues.queued", "ratio", "queued", queued)
+    _set_handler(queued_parser, "queues.queued", "ratio", "queued", _lazy("queues.queues", "queued"))
 
     size_parser = commands.add_parser("size", help="Calculate average queue size in contacts.")
     _add_output_arg(size_parser)
@@ -389,7 +641,7 @@ def _add_queues_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(size_parser)
     _add_interval_arg(size_parser)
     _add_patience_arg(size_parser)
-    _set_handler(size_parser, "queues.size", "contacts", "queue_size", queue_size)
+    _set_handler(size_parser, "queues.size", "contacts", "queue_size", _lazy("queues.queues", "queue_size"))
 
     time_parser = commands.add_parser("time", help="Calculate average queue wait time in seconds.")
     _add_output_arg(time_parser)
@@ -398,7 +650,7 @@ def _add_queues_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(time_parser)
     _add_interval_arg(time_parser)
     _add_patience_arg(time_parser)
-    _set_handler(time_parser, "queues.time", "seconds", "queue_time", queue_time)
+    _set_handler(time_parser, "queues.time", "seconds", "queue_time", _lazy("queues.queues", "queue_time"))
 
     service_parser = commands.add_parser("service-time", help="Calculate answer time needed for a target SLA.")
     _add_output_arg(service_parser)
@@ -408,7 +660,7 @@ def _add_queues_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(service_parser)
     _add_interval_arg(service_parser)
     _add_patience_arg(service_parser)
-    _set_handler(service_parser, "queues.service_time", "seconds", "service_time", service_time)
+    _set_handler(service_parser, "queues.service_time", "seconds", "service_time", _lazy("queues.queues", "service_time"))
 
     sla_parser = commands.add_parser("sla", help="Calculate achieved SLA for staffing and target answer time.")
     _add_output_arg(sla_parser)
@@ -418,7 +670,7 @@ def _add_queues_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_aht_arg(sla_parser)
     _add_interval_arg(sla_parser)
     _add_patience_arg(sla_parser)
-    _set_handler(sla_parser, "queues.sla", "ratio", "sla_metric", sla_metric)
+    _set_handler(sla_parser, "queues.sla", "ratio", "sla_metric", _lazy("queues.queues", "sla_metric"))
 
 
 def _add_erlang_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -430,20 +682,20 @@ def _add_erlang_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_output_arg(b_parser)
     _add_servers_arg(b_parser)
     _add_intensity_arg(b_parser)
-    _set_handler(b_parser, "erlang.b", "ratio", "blocking_probability", erlang_b, schema_version="1.0")
+    _set_handler(b_parser, "erlang.b", "ratio", "blocking_probability", _lazy("calculations.erlang", "erlang_b"), schema_version="1.0")
 
     b_ext_parser = commands.add_parser("b-ext", help="Calculate retry-aware extended Erlang B.")
     _add_output_arg(b_ext_parser)
     _add_servers_arg(b_ext_parser)
     _add_intensity_arg(b_ext_parser)
     b_ext_parser.add_argument("--retry", type=float, required=True, help="Retry ratio, for example 0.1 for 10%%.")
-    _set_handler(b_ext_parser, "erlang.b_ext", "ratio", "blocking_probability", erlang_b_ext, schema_version="1.0")
+    _set_handler(b_ext_parser, "erlang.b_ext", "ratio", "blocking_probability", _lazy("calculations.erlang", "erlang_b_ext"), schema_version="1.0")
 
     c_parser = commands.add_parser("c", help="Calculate Erlang C queueing probability.")
     _add_output_arg(c_parser)
     _add_servers_arg(c_parser)
     _add_intensity_arg(c_parser)
-    _set_handler(c_parser, "erlang.c", "ratio", "queue_probability", erlang_c, schema_version="1.0")
+    _set_handler(c_parser, "erlang.c", "ratio", "queue_probability", _lazy("calculations.erlang", "erlang_c"), schema_version="1.0")
 
     a_parser = commands.add_parser("a", help="Calculate Erlang A abandonment metrics.")
     _add_output_arg(a_parser)
@@ -459,7 +711,7 @@ def _add_erlang_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_servers_arg(engset_parser)
     engset_parser.add_argument("--events", type=float, required=True, help="Number of finite sources/events.")
     _add_intensity_arg(engset_parser)
-    _set_handler(engset_parser, "erlang.engset_b", "ratio", "blocking_probability", engset_b, schema_version="1.0")
+    _set_handler(engset_parser, "erlang.engset_b", "ratio", "blocking_probability", _lazy("calculations.erlang", "engset_b"), schema_version="1.0")
 
 
 def _add_traffic_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -471,7 +723,32 @@ def _add_traffic_commands(categories: argparse._SubParsersAction[argparse.Argume
     _add_output_arg(intensity_parser)
     _add_servers_arg(intensity_parser)
     intensity_parser.add_argument("--blocking", type=float, required=True, help="Target blocking probability.")
-    _set_handler(intensity_parser, "traffic.intensity", "erlangs", "traffic_intensity", traffic, schema_version="1.0")
+    intensity_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Absolute tolerance of the inverted intensity, in erlangs. Default: 1e-9.",
+    )
+    intensity_parser.add_argument(
+        "--table",
+        default=None,
+        help="Answer from a precomputed table written by 'traffic table' instead of inverting Erlang B.",
+    )
+    intensity_parser.set_defaults(handler=_handle_traffic_intensity, calculation="traffic.intensity")
+
+    table_parser = commands.add_parser("table", help="Precompute a traffic intensity table for fast repeated lookups.")
+    _add_output_arg(table_parser)
+    table_parser.add_argument("--max-servers", dest="max_servers", type=int, required=True, help="Largest server count in the table.")
+    table_parser.add_argument(
+        "--blocking",
+        dest="blockings",
+        type=float,
+        action="append",
+        default=None,
+        help="Blocking level to precompute; repeat for several. Default: 0.001, 0.005, 0.01, 0.02, 0.05.",
+    )
+    table_parser.add_argument("--output", required=True, help="Path of the table file to write.")
+    table_parser.set_defaults(handler=_handle_traffic_table, calculation="traffic.table")
 
 
 def _add_trunks_commands(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -485,17 +762,96 @@ def _add_trunks_commands(categories: argparse._SubParsersAction[argparse.Argumen
     _add_contacts_arg(required_parser)
     _add_aht_arg(required_parser)
     _add_interval_arg(required_parser)
-    _set_handler(required_parser, "trunks.required", "trunks", "trunks_required", trunks_required)
+    _add_blocking_arg(required_parser)
+    _set_handler(required_parser, "trunks.required", "trunks", "trunks_required", _lazy("trunks.trunks", "trunks_required"))
 
     number_parser = commands.add_parser("number", help="Calculate trunks required for servers and traffic intensity.")
     _add_output_arg(number_parser)
     _add_servers_arg(number_parser)
     _add_intensity_arg(number_parser)
-    _set_handler(number_parser, "trunks.number", "trunks", "number_trunks", number_trunks, schema_version="1.0")
+    _add_blocking_arg(number_parser)
+    _set_handler(number_parser, "trunks.number", "trunks", "number_trunks", _lazy("trunks.trunks", "number_trunks"), schema_version="1.0")
+
+
+def _add_batch_command(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    parser = categories.add_parser(
+        "batch",
+        help="Run many scenarios from stdin in one process, streaming one JSON result per line.",
+        description=(
+            "Read one scenario per line from stdin and write one JSON payload per line to stdout. "
+            "NDJSON lines are {\"calculation\": ..., \"inputs\": {...}}; CSV has a header row with a "
+            "'calculation' column plus one column per input (empty cells are omitted). Inputs use the "
+            "names of the --json payload. A failing line yields {\"line\": n, \"error\": ...} and the "
+            "stream continues; the exit status is 2 if any line failed."
+        ),
+    )
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="Input format. Default: ndjson.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Worker processes. 1 (default) runs in this process; 0 uses one per CPU. "
+            "Output order and bytes are the same as a serial run."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Scenarios sent to a worker at a time (with --workers). Default: {DEFAULT_CHUNK_SIZE}.",
+    )
+    parser.set_defaults(stream=_stream_batch)
+
+
+def _add_serve_command(categories: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    parser = categories.add_parser(
+        "serve",
+        help="Keep one warm process answering JSON requests over stdio or a Unix socket.",
+        description=(
+            "Answer newline-delimited JSON requests {\"calculation\": ..., \"inputs\": {...}, \"id\": ...} "
+            "with the same payload the --json flag prints, one response line per request. The optional "
+            "'id' is echoed back. Failures answer {\"error\": ...} and the connection stays open. "
+            "Reads stdin until EOF unless --socket is given."
+        ),
+    )
+    parser.add_argument("--socket", default=None, help="Listen on this Unix domain socket path instead of stdio.")
+    parser.set_defaults(stream=_serve)
+
+
+# Ordem de exibição na ajuda geral.
+_CATEGORY_COMMANDS: dict[str, Callable[[argparse._SubParsersAction[argparse.ArgumentParser]], None]] = {
+    "staffing": _add_staffing_commands,
+    "sla": _add_sla_commands,
+    "queue": _add_queue_commands,
+    "telecom": _add_telecom_commands,
+    "agents": _add_agents_commands,
+    "queues": _add_queues_commands,
+    "erlang": _add_erlang_commands,
+    "traffic": _add_traffic_commands,
+    "trunks": _add_trunks_commands,
+    "batch": _add_batch_command,
+    "serve": _add_serve_command,
+}
 
 
 def _add_output_arg(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--json", action="store_true", help="Emit deterministic JSON for agent/tool use.")
+    parser.add_argument(
+        "--profile",
+        action="store_const",
+        const="-",
+        default=None,
+        help=(
+            "Time each stage (import, parser, parsing, inputs, calculation, serialization). "
+            "Prints the spans to stderr; --profile=TRACE writes a Chrome trace (chrome://tracing, Perfetto) instead."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Count kernel calls, recurrence iterations and search probes, and add them as a 'diagnostics' block.",
+    )
 
 
 def _add_agents_arg(parser: argparse.ArgumentParser) -> None:
@@ -540,6 +896,35 @@ def _add_interval_arg(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _add_blocking_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--blocking",
+        type=float,
+        default=None,
+        help="Grade of service: maximum blocking probability per trunk group, in (0, 1). Default: 0.001.",
+    )
+
+
+def _add_whole_contacts_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--whole-contacts",
+        dest="whole_contacts",
+        action="store_true",
+        default=None,
+        help="Round the capacity down to whole contacts, as earlier releases did.",
+    )
+
+
+def _add_continuous_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--continuous",
+        dest="continuous",
+        action="store_true",
+        default=None,
+        help="Solve on the continuous (real-server) Erlang curve instead of interpolating between whole agents.",
+    )
+
+
 def _add_patience_arg(parser: argparse.ArgumentParser, required: bool = False) -> None:
     parser.add_argument(
         "--patience",
@@ -612,7 +997,10 @@ def _handle_function(
     func: Callable[..., Any],
     schema_version: str = "1.1",
 ) -> dict[str, Any]:
-    result = func(**_function_inputs(args))
+    with _span("inputs"):
+        inputs = _function_inputs(args)
+    with _span("calculate"):
+        result = func(**inputs)
     return {
         "schema_version": schema_version,
         "calculation": calculation,
@@ -632,9 +1020,12 @@ def _handle_headcount_chain(
     scheduled_func: Callable[[Any, float], Any],
     rostered_func: Callable[[Any, float], Any],
 ) -> dict[str, Any]:
-    inputs = _function_inputs(args, exclude={"shrinkage", "shifts"})
-    productive = required_func(**inputs)
-    scheduled = scheduled_func(productive, args.shrinkage)
+    with _span("inputs"):
+        inputs = _function_inputs(args, exclude={"shrinkage", "shifts", "table"})
+    with _span("erlang search"):
+        productive = required_func(**inputs)
+    with _span("shrinkage"):
+        scheduled = scheduled_func(productive, args.shrinkage)
     value: dict[str, Any] = {
         "productive_agents": productive,
         "scheduled_agents": scheduled,
@@ -642,7 +1033,8 @@ def _handle_headcount_chain(
     # --shifts é opcional: sem a flag, a pergunta de escala não foi feita e o
     # campo rostered_agents não aparece (issue #26).
     if args.shifts is not None:
-        value["rostered_agents"] = rostered_func(scheduled, args.shifts)
+        with _span("roster"):
+            value["rostered_agents"] = rostered_func(scheduled, args.shifts)
     return {
         "schema_version": "2.2",
         "calculation": calculation,
@@ -655,7 +1047,174 @@ def _handle_headcount_chain(
     }
 
 
+def _handle_staffing_required(args: argparse.Namespace) -> dict[str, Any]:
+    if args.table is None:
+        required_func = _lazy("agents.capacity", "agents_required")
+    else:
+        from mod_turbotab.agents.capacity import StaffingTable
+
+        if args.patience is not None:
+            raise InputValidationError("--patience cannot be combined with --table; staffing tables are Erlang C.")
+        table = StaffingTable.load(args.table)
+        if (table.sla, table.service_time, table.aht) != (args.sla, args.service_time, args.aht):
+            raise InputValidationError(
+                f"--sla, --service-time and --aht must match the table objective "
+                f"(sla={table.sla}, service_time={table.service_time}, aht={table.aht})."
+            )
+
+        def required_func(contacts_per_interval: float, interval: float, max_occupancy: float | None = None, **_: Any) -> int:
+            return table.agents_required(contacts_per_interval, interval, max_occupancy)
+
+    return _handle_headcount_chain(
+        args,
+        "staffing.required",
+        required_func,
+        _lazy("agents.shrinkage", "scheduled_agents"),
+        _lazy("agents.roster", "rostered_agents"),
+    )
+
+
+def _handle_staffing_table(args: argparse.Namespace) -> dict[str, Any]:
+    from mod_turbotab.agents.capacity import StaffingTable
+
+    table = StaffingTable(args.max_agents, args.sla, args.service_time, args.aht)
+    table.save(args.output)
+    return {
+        "schema_version": "1.1",
+        "calculation": "staffing.table",
+        "inputs": _public_inputs(args),
+        "result": {
+            "name": "staffing_table",
+            "value": {
+                "path": args.output,
+                "max_agents": table.max_agents,
+                "max_traffic": table.max_traffic,
+            },
+            "unit": "file",
+        },
+    }
+
+
+def _read_plan_rows(path: str, default_aht: int | None) -> tuple[list[float], list[int]]:
+    """Lê os volumes e AHTs de um plano intradiário (CSV ou JSON, uma linha por intervalo)."""
+    if path.endswith(".csv"):
+        import csv
+
+        with open(path, newline="", encoding="utf-8") as handle:
+            rows: list[Any] = list(csv.DictReader(handle))
+    else:
+        with open(path, encoding="utf-8") as handle:
+            rows = json.load(handle)
+        if not isinstance(rows, list):
+            raise InputValidationError("Plan JSON must be a list of interval objects.")
+    contacts: list[float] = []
+    ahts: list[int] = []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            raise InputValidationError(f"Interval {number}: expected an object with contacts_per_interval and aht.")
+        volume = row.get("contacts_per_interval")
+        aht = row.get("aht")
+        if aht in (None, ""):
+            aht = default_aht
+        if volume in (None, "") or aht is None:
+            raise InputValidationError(f"Interval {number}: missing contacts_per_interval or aht.")
+        try:
+            contacts.append(float(volume))
+            ahts.append(int(aht))
+        except (TypeError, ValueError) as exc:
+            raise InputValidationError(f"Interval {number}: {exc}") from exc
+    return contacts, ahts
+
+
+def _handle_staffing_plan(args: argparse.Namespace) -> dict[str, Any]:
+    from mod_turbotab.agents.planning import plan_intraday
+
+    try:
+        contacts, ahts = _read_plan_rows(args.input, args.aht)
+    except OSError as exc:
+        raise InputValidationError(f"Cannot read plan input: {exc}") from exc
+    inputs = _function_inputs(args, exclude={"input", "aht"})
+    return {
+        "schema_version": "2.2",
+        "calculation": "staffing.plan",
+        "inputs": _public_inputs(args),
+        "result": {
+            "name": "plan",
+            "value": plan_intraday(contacts, ahts, **inputs),
+            "unit": "agents",
+        },
+    }
+
+
+# Colunas que delimitam o estado aquecido do planejamento em plan-file.
+_PLAN_GROUP_COLUMNS = ("queue", "date")
+_PLAN_RESULT_COLUMNS = ("productive_agents", "scheduled_agents", "rostered_agents")
+
+
+def _stream_plan_file(args: argparse.Namespace) -> int:
+    import contextlib
+    import csv
+    import itertools
+    from collections import deque
+
+    from mod_turbotab.agents.planning import iter_plan_intraday
+
+    started = time.perf_counter()
+    rows = 0
+    with contextlib.ExitStack() as stack:
+        try:
+            source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input, newline="", encoding="utf-8"))
+            target = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w", newline="", encoding="utf-8"))
+        except OSError as exc:
+            print(f"turbotab: error: {exc}", file=sys.stderr)
+            return 2
+        reader = csv.DictReader(source)
+        fields = list(reader.fieldnames or [])
+        if "contacts_per_interval" not in fields or ("aht" not in fields and args.aht is None):
+            print("turbotab: error: the forecast CSV needs contacts_per_interval and aht columns (or --aht).", file=sys.stderr)
+            return 2
+        results = _PLAN_RESULT_COLUMNS if args.shifts is not None else _PLAN_RESULT_COLUMNS[:2]
+        writer = csv.DictWriter(
+            target,
+            fieldnames=fields + [column for column in results if column not in fields],
+            lineterminator="\n",
+        )
+        writer.writeheader()
+        settings = _function_inputs(args, exclude={"input", "output", "aht", "stream"})
+        # A linha em resolução fica na fila até o resultado sair do gerador:
+        # no máximo uma linha do arquivo em memória.
+        pending: deque = deque()
+
+        def intervals(group: Iterable[dict[str, str]]) -> Iterator[tuple[float, int]]:
+            for row in group:
+                pending.append(row)
+                aht = row.get("aht") or args.aht
+                try:
+                    yield float(row["contacts_per_interval"]), int(aht)
+                except (TypeError, ValueError) as exc:
+                    raise InputValidationError(f"invalid contacts_per_interval or aht ({exc})") from exc
+
+        try:
+            groups = itertools.groupby(reader, key=lambda row: tuple(row.get(column) for column in _PLAN_GROUP_COLUMNS))
+            for _, group in groups:
+                for headcount in iter_plan_intraday(intervals(group), **settings):
+                    row = pending.popleft()
+                    for column in results:
+                        row[column] = headcount[column]
+                    writer.writerow(row)
+                    rows += 1
+        except (InputValidationError, CalculationError) as exc:
+            print(f"turbotab: error: line {reader.line_num}: {exc}", file=sys.stderr)
+            return 2
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"turbotab: planned {rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
 def _handle_erlang_a(args: argparse.Namespace) -> dict[str, Any]:
+    from mod_turbotab.calculations.erlang import erlang_a
+
     inputs = _function_inputs(args, exclude={"target_time"})
     metrics = erlang_a(**inputs)
     result: dict[str, Any] = {
@@ -678,11 +1237,361 @@ def _handle_erlang_a(args: argparse.Namespace) -> dict[str, Any]:
     }
 
 
+def _handle_traffic_intensity(args: argparse.Namespace) -> dict[str, Any]:
+    from mod_turbotab.calculations.traffic import TrafficTable, traffic
+
+    if args.table is None:
+        value = traffic(**_function_inputs(args, exclude={"table"}))
+    else:
+        if args.tolerance is not None:
+            raise InputValidationError("--tolerance cannot be combined with --table; the table fixes its own tolerance.")
+        value = TrafficTable.load(args.table).lookup(args.servers, args.blocking)
+    return {
+        "schema_version": "1.0",
+        "calculation": "traffic.intensity",
+        "inputs": _public_inputs(args),
+        "result": {
+            "name": "traffic_intensity",
+            "value": value,
+            "unit": "erlangs",
+        },
+    }
+
+
+def _handle_traffic_table(args: argparse.Namespace) -> dict[str, Any]:
+    from mod_turbotab.calculations.traffic import DEFAULT_BLOCKINGS, TrafficTable
+
+    table = TrafficTable(args.max_servers, args.blockings or DEFAULT_BLOCKINGS)
+    table.save(args.output)
+    return {
+        "schema_version": "1.0",
+        "calculation": "traffic.table",
+        "inputs": _public_inputs(args),
+        "result": {
+            "name": "traffic_table",
+            "value": {
+                "path": args.output,
+                "max_servers": table.max_servers,
+                "blockings": list(table.blockings),
+            },
+            "unit": "file",
+        },
+    }
+
+
+# Cálculos puros aceitos por batch e serve. Os subcomandos que leem ou escrevem
+# arquivos (``*.table``, ``staffing.plan``) ficam de fora, assim como a opção
+# ``--table`` dos que a aceitam: um cenário não toca o sistema de arquivos.
+_SCENARIO_CALCULATIONS = frozenset(
+    {
+        "agents.asa",
+        "agents.asa_required",
+        "agents.capacity",
+        "agents.fractional_capacity",
+        "agents.fractional_required",
+        "agents.nb_agents",
+        "agents.required",
+        "erlang.a",
+        "erlang.b",
+        "erlang.b_ext",
+        "erlang.c",
+        "erlang.engset_b",
+        "queue.probability",
+        "queue.size",
+        "queue.snapshot",
+        "queue.wait",
+        "queues.queued",
+        "queues.service_time",
+        "queues.size",
+        "queues.sla",
+        "queues.time",
+        "sla.achieved",
+        "sla.target_time",
+        "staffing.asa",
+        "staffing.capacity",
+        "staffing.fractional_capacity",
+        "staffing.fractional_required",
+        "staffing.required",
+        "telecom.trunks",
+        "traffic.intensity",
+        "trunks.number",
+        "trunks.required",
+    }
+)
+_SCENARIO_PATH_INPUTS = ("table",)
+
+
+def _scenario_parsers(parser: argparse.ArgumentParser) -> dict[str, argparse.ArgumentParser]:
+    """Indexa os subcomandos de cálculo pelo nome ``calculation`` do payload JSON."""
+    parsers: dict[str, argparse.ArgumentParser] = {}
+    pending = [parser]
+    while pending:
+        current = pending.pop()
+        for action in current._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                pending.extend(action.choices.values())
+        calculation = current.get_default("calculation")
+        if calculation is not None and current.get_default("handler") is not None:
+            parsers[calculation] = current
+    return parsers
+
+
+def _scenario_args(parser: argparse.ArgumentParser, inputs: dict[str, Any]) -> argparse.Namespace:
+    """Monta o Namespace de um subcomando a partir de ``inputs`` (nomes do payload JSON).
+
+    Aplica as mesmas conversões de tipo, defaults e obrigatoriedade que o
+    argparse aplicaria à linha de comando equivalente.
+    """
+    aliases = {
+        "no_agents": "agents",
+        "service_time_val": "service_time",
+    }
+    remaining = dict(inputs)
+    args = argparse.Namespace(
+        handler=parser.get_default("handler"),
+        calculation=parser.get_default("calculation"),
+        json=True,
+    )
+    for action in parser._actions:
+        if action.dest in ("help", "json", "stats", "profile"):
+            continue
+        if action.dest in _SCENARIO_PATH_INPUTS:
+            # Fica no default; informado no cenário, cai em "Unknown inputs".
+            setattr(args, action.dest, action.default)
+            continue
+        public = aliases.get(action.dest, action.dest)
+        key = public if public in remaining else action.dest
+        if key not in remaining:
+            if action.required:
+                raise InputValidationError(f"Missing input '{public}'.")
+            setattr(args, action.dest, action.default)
+            continue
+        value = remaining.pop(key)
+        if isinstance(action, argparse._AppendAction):
+            values = value if isinstance(value, list) else [value]
+            setattr(args, action.dest, [_scenario_value(action, public, item) for item in values])
+        else:
+            setattr(args, action.dest, _scenario_value(action, public, value))
+    if remaining:
+        raise InputValidationError(f"Unknown inputs for '{args.calculation}': {', '.join(sorted(remaining))}.")
+    return args
+
+
+def _scenario_value(action: argparse.Action, name: str, value: Any) -> Any:
+    if isinstance(action, argparse._StoreTrueAction):
+        return _scenario_flag(action, name, value)
+    convert = action.type or str
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise InputValidationError(f"Invalid value for '{name}': {value!r}.")
+    if convert is int and isinstance(value, float) and not value.is_integer():
+        raise InputValidationError(f"Invalid value for '{name}': expected an integer, got {value!r}.")
+    try:
+        return convert(int(value) if convert is int and isinstance(value, float) else value)
+    except ValueError as exc:
+        raise InputValidationError(f"Invalid value for '{name}': {value!r}.") from exc
+
+
+def _scenario_flag(action: argparse.Action, name: str, value: Any) -> Any:
+    # Flags (``--whole-contacts``, ``--continuous``): bool no JSON, true/false/1/0
+    # no CSV. Falso equivale a omitir a flag, como na linha de comando.
+    if isinstance(value, str):
+        value = {"true": True, "1": True, "false": False, "0": False}.get(value.strip().lower(), value)
+    if not isinstance(value, bool):
+        raise InputValidationError(f"Invalid value for '{name}': expected true or false, got {value!r}.")
+    return True if value else action.default
+
+
+def _run_scenario(parsers: dict[str, argparse.ArgumentParser], scenario: Any) -> dict[str, Any]:
+    """Executa um cenário ``{"calculation": ..., "inputs": {...}}`` pelo handler do subcomando."""
+    if not isinstance(scenario, dict):
+        raise InputValidationError("A scenario must be a JSON object with 'calculation' and 'inputs'.")
+    calculation = scenario.get("calculation")
+    if not isinstance(calculation, str):
+        raise InputValidationError(f"Unknown calculation {calculation!r}.")
+    parser = parsers.get(calculation)
+    if parser is None:
+        raise InputValidationError(f"Unknown calculation {calculation!r}.")
+    if calculation not in _SCENARIO_CALCULATIONS:
+        raise InputValidationError(f"Calculation {calculation!r} reads or writes files and is not available here.")
+    inputs = scenario.get("inputs", {})
+    if not isinstance(inputs, dict):
+        raise InputValidationError("'inputs' must be a JSON object.")
+    args = _scenario_args(parser, inputs)
+    return args.handler(args)
+
+
+def _read_scenarios(lines: Iterable[str], input_format: str) -> Iterator[tuple[int, Any]]:
+    """Gera ``(linha, cenário)`` um a um; erros de leitura viram o próprio cenário (uma exceção)."""
+    if input_format == "csv":
+        import csv
+
+        reader = csv.DictReader(lines)
+        for row in reader:
+            calculation = row.pop("calculation", None)
+            inputs = {key: value for key, value in row.items() if key is not None and value not in (None, "")}
+            yield reader.line_num, {"calculation": calculation, "inputs": inputs}
+        return
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, InputValidationError(f"Invalid JSON: {exc}")
+
+
+def _stream_batch(args: argparse.Namespace) -> int:
+    if args.workers < 0 or args.chunk_size < 1:
+        print("turbotab: error: --workers must be >= 0 and --chunk-size >= 1.", file=sys.stderr)
+        return 2
+    scenarios = _read_scenarios(sys.stdin, args.format)
+    if args.workers == 1:
+        # Cada linha é resolvida e escrita antes da próxima ser lida: a memória
+        # fica limitada a um cenário, qualquer que seja o tamanho da entrada.
+        parsers = _scenario_parsers(build_parser())
+        results: Iterable[tuple[bool, str]] = (_batch_line(parsers, number, scenario) for number, scenario in scenarios)
+    else:
+        results = _parallel_batch_lines(scenarios, args.workers or None, args.chunk_size)
+    failed = False
+    for line_failed, line in results:
+        failed = failed or line_failed
+        sys.stdout.write(line)
+    return 2 if failed else 0
+
+
+def _scenario_error(exc: Exception) -> str:
+    """Mensagem de erro de um cenário; falhas inesperadas levam o tipo da exceção."""
+    if isinstance(exc, (InputValidationError, CalculationError, ValueError, ZeroDivisionError)):
+        return str(exc)
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _batch_line(parsers: dict[str, argparse.ArgumentParser], number: int, scenario: Any) -> tuple[bool, str]:
+    """Resolve um cenário do batch e devolve ``(falhou, linha NDJSON)``."""
+    try:
+        if isinstance(scenario, Exception):
+            raise scenario
+        payload = _run_scenario(parsers, scenario)
+    except Exception as exc:
+        # Qualquer falha fica restrita à linha: o batch segue com as próximas.
+        return True, json.dumps({"line": number, "error": _scenario_error(exc)}, sort_keys=True, ensure_ascii=False) + "\n"
+    return False, json.dumps(payload, sort_keys=True, ensure_ascii=False) + "\n"
+
+
+# Parsers de cenário de cada processo do pool, montados uma vez no initializer.
+_worker_parsers: dict[str, argparse.ArgumentParser] = {}
+
+
+def _init_batch_worker() -> None:
+    _worker_parsers.update(_scenario_parsers(build_parser()))
+
+
+def _run_batch_chunk(chunk: list[tuple[int, Any]]) -> list[tuple[bool, str]]:
+    # Os workers devolvem as linhas já serializadas: o processo pai só as
+    # escreve, e a saída é byte a byte a da execução serial.
+    return [_batch_line(_worker_parsers, number, scenario) for number, scenario in chunk]
+
+
+def _parallel_batch_lines(
+    scenarios: Iterator[tuple[int, Any]], workers: int | None, chunk_size: int
+) -> Iterator[tuple[bool, str]]:
+    """Distribui os cenários em blocos por um pool de processos, devolvendo-os na ordem de entrada.
+
+    No máximo ``2 × workers`` blocos ficam em voo: a leitura da entrada
+    acompanha a escrita, e a memória não cresce com o tamanho do batch.
+    """
+    import itertools
+    import os
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Referências pelo módulo importável: com ``python -m`` este arquivo roda
+    # como __main__, que os processos filhos (spawn) não conseguem resolver.
+    cli = importlib.import_module("mod_turbotab.cli")
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=cli._init_batch_worker) as pool:
+        pending: deque = deque()
+        while True:
+            chunk = list(itertools.islice(scenarios, chunk_size))
+            if chunk:
+                pending.append(pool.submit(cli._run_batch_chunk, chunk))
+            while pending and (len(pending) >= 2 * workers or not chunk):
+                yield from pending.popleft().result()
+            if not chunk:
+                return
+
+
+def _answer_request(parsers: dict[str, argparse.ArgumentParser], line: str) -> dict[str, Any]:
+    """Responde uma requisição do ``serve``; erros viram ``{"error": ...}`` em vez de exceção."""
+    try:
+        request = json.loads(line)
+    except ValueError as exc:
+        return {"error": f"Invalid JSON: {exc}"}
+    try:
+        payload = _run_scenario(
+            parsers,
+            {key: value for key, value in request.items() if key != "id"} if isinstance(request, dict) else request,
+        )
+    except Exception as exc:
+        # Uma requisição com falha responde com erro; o servidor (e a conexão) seguem.
+        payload = {"error": _scenario_error(exc)}
+    if isinstance(request, dict) and "id" in request:
+        payload = {**payload, "id": request["id"]}
+    return payload
+
+
+def _serve_lines(parsers: dict[str, argparse.ArgumentParser], lines: Iterable[str], output: IO[str]) -> None:
+    for line in lines:
+        if not line.strip():
+            continue
+        output.write(json.dumps(_answer_request(parsers, line), sort_keys=True, ensure_ascii=False) + "\n")
+        # Quem chama espera a resposta antes de mandar a próxima requisição.
+        output.flush()
+
+
+def _serve(args: argparse.Namespace) -> int:
+    # O parser é montado uma única vez; cada requisição só monta um Namespace
+    # e chama o handler, sem custo de inicialização do interpretador.
+    parsers = _scenario_parsers(build_parser())
+    if args.socket is None:
+        _serve_lines(parsers, sys.stdin, sys.stdout)
+        return 0
+
+    import os
+    import signal
+    import socketserver
+    import stat
+
+    class _Connection(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            with self.connection.makefile("r", encoding="utf-8") as reader, \
+                    self.connection.makefile("w", encoding="utf-8") as writer:
+                _serve_lines(parsers, reader, writer)
+
+    try:
+        if stat.S_ISSOCK(os.stat(args.socket).st_mode):
+            os.unlink(args.socket)
+    except FileNotFoundError:
+        pass
+    # SIGTERM encerra como Ctrl+C, para o arquivo do socket ser removido.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with socketserver.ThreadingUnixStreamServer(args.socket, _Connection) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+    return 0
+
+
 def _function_inputs(args: argparse.Namespace, exclude: set[str] | None = None) -> dict[str, Any]:
     excluded = {
         "handler",
         "help_parser",
         "json",
+        "stats",
+        "profile",
         "category",
         "calculation",
         "staffing_command",
@@ -724,7 +1633,13 @@ def _format_text(payload: dict[str, Any]) -> str:
         rendered_value = details
     else:
         rendered_value = str(value)
-    return f"{payload['calculation']}: {result['name']}={rendered_value} {result['unit']}"
+    text = f"{payload['calculation']}: {result['name']}={rendered_value} {result['unit']}"
+    if "diagnostics" in payload:
+        text += "\ndiagnostics: " + json.dumps(payload["diagnostics"], sort_keys=True)
+    return text
+
+
+_IMPORT_FINISHED = time.perf_counter_ns()
 
 
 if __name__ == "__main__":
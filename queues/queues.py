@@ -3,7 +3,11 @@ Módulo para cálculos relacionados a filas e métricas de atendimento.
 """
 
 import math
+from typing import Callable, Sequence
+
+from mod_turbotab.calculations import instrumentation as _kernel_stats
 from mod_turbotab.calculations.erlang import erlang_c, erlang_a
+from mod_turbotab.calculations.instrumentation import timed
 from mod_turbotab.utils import secs, min_max
 from mod_turbotab.exceptions import CalculationError, InputValidationError
 def queued(agents: float, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None) -> float:
@@ -109,6 +113,25 @@ def queue_time(agents: float, contacts_per_interval: float, aht: int, interval:
     except Exception as e:
         raise CalculationError(f"Error in queue_time: {str(e)}") from e
 
+def _erlang_a_service_time(sla_func: Callable[[float], float], sla: float, aht: int) -> int:
+    """Menor tempo alvo inteiro (em segundos) em que ``sla_func`` atinge ``sla`` (Erlang A).
+
+    Compartilhado por :func:`service_time` e :func:`queue_snapshot`, que
+    precisam devolver o mesmo valor.
+    """
+    lo: int = 0
+    hi: int = int(aht * 10)
+    while sla_func(hi) < sla and hi < 100000:
+        hi *= 2
+    while lo < hi:
+        mid: int = (lo + hi) // 2
+        if sla_func(mid) >= sla:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+@timed
 def service_time(agents: float, sla: float, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None) -> int:
     """Calcula o tempo médio de espera para que uma dada porcentagem de contatos seja atendida.
 
@@ -139,17 +162,10 @@ def service_time(agents: float, sla: float, contacts_per_interval: float, aht: i
         if patience is not None:
             ea: dict = erlang_a(agents, traffic_rate, patience, aht)
             sla_func = ea['sla']
-            lo: int = 0
-            hi: int = int(aht * 10)
-            while sla_func(hi) < sla and hi < 100000:
-                hi *= 2
-            while lo < hi:
-                mid: int = (lo + hi) // 2
-                if sla_func(mid) >= sla:
-                    hi = mid
-                else:
-                    lo = mid + 1
-            return lo
+            recorder = _kernel_stats._active
+            if recorder is not None:
+                sla_func = recorder.counting('service_time', sla_func)
+            return _erlang_a_service_time(sla_func, sla, aht)
         c: float = erlang_c(agents, traffic_rate)
         if c <= 0 or c < (1 - sla):
             return 0
@@ -199,3 +215,89 @@ def sla_metric(agents: float, service_time_val: float, contacts_per_interval: fl
         return min_max(sl_queued, 0.0, 1.0)
     except Exception as e:
         raise CalculationError(f"Error in sla_metric: {str(e)}") from e
+
+def _target_key(t: float) -> float:
+    """Chave do tempo alvo no mapa ``sla``: ``20.0`` vira ``20`` (JSON ``"20"``, não ``"20.0"``)."""
+    return int(t) if float(t).is_integer() else t
+
+@timed
+def queue_snapshot(agents: float, contacts_per_interval: float, aht: int, interval: float = 600.0, patience: float = None, service_times: Sequence[float] = (), sla: float = None) -> dict:
+    """Calcula todas as métricas de fila de um cenário com uma única avaliação do kernel.
+
+    Painéis pedem as mesmas métricas para a mesma tupla (agentes, volume,
+    AHT); chamar :func:`queued`, :func:`queue_size`, :func:`queue_time`,
+    :func:`sla_metric`, :func:`service_time` e
+    :func:`~mod_turbotab.agents.capacity.asa` em sequência refaz a mesma
+    recorrência de Erlang em cada uma. Aqui ``erlang_c`` (ou ``erlang_a``,
+    com ``patience``) roda uma vez e cada métrica é igual, bit a bit, à da
+    função correspondente.
+
+    Args:
+        agents (float): Número de agentes.
+        contacts_per_interval (float): Contatos por intervalo.
+        aht (int): Duração média do contato (em segundos).
+        interval (float, optional): Intervalo de planejamento em segundos. Padrão: 600 (10 minutos).
+        patience (float, optional): Paciência média do cliente em segundos (Erlang A).
+            Se None, usa Erlang C puro.
+        service_times (Sequence[float], optional): Tempos alvo de atendimento (em
+            segundos) em que o SLA alcançado é calculado. Padrão: nenhum.
+        sla (float, optional): SLA alvo; se informado, inclui ``service_time``
+            (None quando o sistema está sobrecarregado, onde :func:`service_time`
+            levantaria erro).
+
+    Returns:
+        dict: ``traffic_intensity``, ``occupancy``, ``queued`` (Pw), ``asa``,
+            ``queue_size``, ``queue_time``, ``abandon_rate`` (0.0 em Erlang C),
+            ``sla`` (``{tempo alvo: SLA alcançado}``, com tempos inteiros
+            como ``int``) e, com ``sla``, ``service_time``.
+
+    Raises:
+        InputValidationError: Se os parâmetros forem inválidos.
+        CalculationError: Se ocorrer erro durante o cálculo.
+    """
+    if agents <= 0 or contacts_per_interval < 0 or aht <= 0 or any(t < 0 for t in service_times) or (sla is not None and sla < 0):
+        raise InputValidationError("Invalid parameters for queue_snapshot.")
+    try:
+        birth_rate: float = contacts_per_interval
+        death_rate: float = interval / aht
+        traffic_rate: float = birth_rate / death_rate
+        utilisation: float = traffic_rate / agents
+        if utilisation >= 1:
+            utilisation = 0.99
+        snapshot: dict = {
+            'traffic_intensity': traffic_rate,
+            'occupancy': traffic_rate / agents,
+        }
+        if patience is not None:
+            ea: dict = erlang_a(agents, traffic_rate, patience, aht)
+            sla_func = ea['sla']
+            snapshot['queued'] = min_max(ea['pw'], 0.0, 1.0)
+            snapshot['asa'] = int(ea['asa'] + 0.5)
+            snapshot['queue_size'] = int(birth_rate * ea['asa'] + 0.5)
+            snapshot['queue_time'] = int(ea['asa'] + 0.5)
+            snapshot['abandon_rate'] = ea['abandon_rate']
+            snapshot['sla'] = {_target_key(t): min_max(sla_func(t), 0.0, 1.0) for t in service_times}
+        else:
+            c: float = erlang_c(agents, traffic_rate)
+            snapshot['queued'] = min_max(c, 0.0, 1.0)
+            snapshot['asa'] = secs(c / (agents * death_rate * (1 - utilisation)))
+            snapshot['queue_size'] = int((utilisation * c) / (1 - utilisation) + 0.5)
+            snapshot['queue_time'] = secs(1 / (agents * death_rate * (1 - utilisation)))
+            snapshot['abandon_rate'] = 0.0
+            snapshot['sla'] = {
+                _target_key(t): min_max(1 - c * math.exp((traffic_rate - agents) * t / aht), 0.0, 1.0)
+                for t in service_times
+            }
+        if sla is not None:
+            snapshot['service_time'] = None
+            if traffic_rate < agents:
+                if patience is not None:
+                    snapshot['service_time'] = _erlang_a_service_time(sla_func, sla, aht)
+                elif c <= 0 or c < (1 - sla):
+                    snapshot['service_time'] = 0
+                else:
+                    t: float = aht * math.log((1 - sla) / c) / (traffic_rate - agents)
+                    snapshot['service_time'] = int(max(t, 0.0) + 0.5)
+        return snapshot
+    except Exception as e:
+        raise CalculationError(f"Error in queue_snapshot: {str(e)}") from e
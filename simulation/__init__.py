@@ -0,0 +1,3 @@
+"""
+Simulação de eventos discretos do contact center.
+"""
@@ -0,0 +1,364 @@
+"""Simulação Monte Carlo multi-skill (Opção B do dimensionamento multi-skill).
+
+Complementa a heurística de sharing factor de
+:func:`~mod_turbotab.calculations.multi_skill.agents_required_multi`, que
+perde precisão justamente quando o overlap entre pools é grande: aqui o
+cenário é simulado contato a contato, com o mesmo formato de
+``skill_groups`` e ``agent_pools``.
+
+O modelo:
+
+- Chegadas Poisson por skill (taxa ``contacts_per_interval / interval``) e
+  atendimento exponencial de média ``aht`` — as hipóteses do Erlang C, de
+  modo que com uma skill e um pool o resultado converge para
+  :func:`~mod_turbotab.queues.queues.sla_metric` e
+  :func:`~mod_turbotab.agents.capacity.asa`.
+- Paciência exponencial opcional (``patience``), como no Erlang A: quem
+  espera além dela abandona.
+- Cada pool é um conjunto de agentes idênticos com as skills numa máscara
+  de bits; elegibilidade é um ``&`` de inteiros.
+- Roteamento: o contato que chega vai para um agente livre do pool
+  elegível mais especializado (menos skills, depois ordem de
+  ``agent_pools``), preservando os agentes flexíveis. O agente que fica
+  livre puxa a fila de maior prioridade entre as skills que atende (menor
+  ``priority``; padrão 0) e, no empate, o contato que espera há mais tempo.
+- Eventos num heap (``heapq``) ordenado por instante. Chegadas param no fim
+  do horizonte, mas quem já chegou é atendido ou abandona antes do fim da
+  replicação; só contam os contatos que chegam depois do aquecimento.
+
+As replicações usam fluxos ``random.Random`` independentes, derivados de
+``seed`` e do número da replicação, e podem rodar num pool de processos: o
+resultado é o mesmo com qualquer número de workers. As métricas de cada
+skill vêm com a média entre replicações e o intervalo de confiança de
+Student.
+"""
+
+import heapq
+import math
+import random
+from collections import deque
+
+from mod_turbotab.calculations.instrumentation import timed
+from mod_turbotab.calculations.multi_skill import _validate_topology
+from mod_turbotab.exceptions import InputValidationError
+
+# Tipos de evento do heap.
+_ARRIVAL: int = 0
+_DEPARTURE: int = 1
+_ABANDON: int = 2
+
+# Estados de um contato na fila (abandonos saem da fila de forma preguiçosa).
+_WAITING: int = 0
+_SERVED: int = 1
+_ABANDONED: int = 2
+
+
+@timed
+def simulate_multi_skill(
+    skill_groups: list,
+    agent_pools: list,
+    service_time: int,
+    interval: float = 600.0,
+    patience: float = None,
+    intervals: int = 10,
+    warmup_intervals: float = 1.0,
+    replications: int = 20,
+    seed: int = 0,
+    workers: int = 1,
+    confidence: float = 0.95,
+) -> dict:
+    """Simula o cenário multi-skill e estima SLA, ASA e abandono por skill.
+
+    Args:
+        skill_groups (list[dict]): Grupos de skill no formato de
+            :func:`~mod_turbotab.calculations.multi_skill.agents_required_multi`
+            (``name``, ``contacts_per_interval``, ``aht`` e ``priority``
+            opcional — menor valor é atendido primeiro).
+        agent_pools (list[dict]): Pools ``{"skills": list[str], "count": int}``.
+        service_time (int): Tempo alvo de atendimento, em segundos.
+        interval (float, optional): Intervalo de planejamento em segundos.
+            Padrão 600 (10 minutos).
+        patience (float, optional): Paciência média do cliente em segundos
+            (abandono exponencial, como no Erlang A). Padrão None (sem
+            abandono).
+        intervals (int, optional): Intervalos medidos por replicação.
+            Padrão 10.
+        warmup_intervals (float, optional): Intervalos simulados antes da
+            medição, para a fila sair do sistema vazio. Padrão 1.
+        replications (int, optional): Número de replicações (>= 2).
+            Padrão 20.
+        seed (int, optional): Semente dos fluxos aleatórios. Padrão 0.
+        workers (int, optional): Processos para as replicações; 1 roda no
+            próprio processo, 0 usa todas as CPUs. Padrão 1.
+        confidence (float, optional): Nível dos intervalos de confiança
+            (0 < x < 1). Padrão 0.95.
+
+    Returns:
+        dict: Estrutura ``{"per_skill": [...], "per_pool": [...], ...}``:
+
+            ``per_skill`` — uma entrada por skill, com ``name``,
+            ``contacts`` (média de chegadas medidas por replicação) e as
+            estimativas ``service_level`` (atendidos em até
+            ``service_time`` sobre as chegadas; abandonos contam como fora
+            do SLA), ``asa`` (espera média dos atendidos, em segundos) e
+            ``abandon_rate``.
+
+            ``per_pool`` — ``skills``, ``count`` e a estimativa de
+            ``occupancy`` de cada pool.
+
+            Cada estimativa é ``{"mean", "ci_low", "ci_high"}`` sobre as
+            replicações em que a métrica existe (``None`` quando não há
+            observações suficientes). O dict ecoa ainda ``replications``,
+            ``confidence`` e ``seed``.
+
+    Raises:
+        InputValidationError: Se as entradas forem inválidas.
+    """
+    _validate_topology(skill_groups, agent_pools)
+    if service_time < 0:
+        raise InputValidationError("service_time must be >= 0.")
+    if interval <= 0:
+        raise InputValidationError("interval must be > 0.")
+    if patience is not None and patience <= 0:
+        raise InputValidationError("patience must be > 0 when provided.")
+    if intervals <= 0 or warmup_intervals < 0:
+        raise InputValidationError("intervals must be > 0 and warmup_intervals >= 0.")
+    if replications < 2:
+        raise InputValidationError("replications must be >= 2.")
+    if workers < 0:
+        raise InputValidationError("workers must be >= 0.")
+    if not 0 < confidence < 1:
+        raise InputValidationError("confidence must be in (0, 1).")
+
+    names: list = [sg["name"] for sg in skill_groups]
+    bit: dict = {name: 1 << k for k, name in enumerate(names)}
+    model: tuple = (
+        [float(sg["contacts_per_interval"]) / interval for sg in skill_groups],
+        [float(sg["aht"]) for sg in skill_groups],
+        [sg.get("priority", 0) for sg in skill_groups],
+        [sum(bit[sk] for sk in pool["skills"]) for pool in agent_pools],
+        [int(pool["count"]) for pool in agent_pools],
+        float(service_time),
+        patience,
+        warmup_intervals * interval,
+        (warmup_intervals + intervals) * interval,
+    )
+    tasks: list = [(model, _stream_seed(seed, replication)) for replication in range(replications)]
+
+    if workers == 1:
+        runs: list = [_replicate(task) for task in tasks]
+    else:
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            runs = list(pool.map(_replicate, tasks))
+
+    per_skill: list = []
+    for k, name in enumerate(names):
+        per_skill.append(
+            {
+                "name": name,
+                "contacts": sum(run["offered"][k] for run in runs) / len(runs),
+                "service_level": _estimate([run["service_level"][k] for run in runs], confidence),
+                "asa": _estimate([run["asa"][k] for run in runs], confidence),
+                "abandon_rate": _estimate([run["abandon_rate"][k] for run in runs], confidence),
+            }
+        )
+    per_pool: list = [
+        {
+            "skills": list(pool["skills"]),
+            "count": pool["count"],
+            "occupancy": _estimate([run["occupancy"][p] for run in runs], confidence),
+        }
+        for p, pool in enumerate(agent_pools)
+    ]
+    return {
+        "per_skill": per_skill,
+        "per_pool": per_pool,
+        "replications": replications,
+        "confidence": confidence,
+        "seed": seed,
+    }
+
+
+def _stream_seed(seed: int, replication: int) -> str:
+    # Sementes str passam por SHA-512 em random.seed: fluxos distintos por
+    # replicação, reprodutíveis em qualquer processo.
+    return f"mod_turbotab.simulation.multi_skill:{seed}:{replication}"
+
+
+def _replicate(task: tuple) -> dict:
+    """Roda uma replicação e devolve as métricas por skill e a ocupação por pool."""
+    model, stream = task
+    rates, ahts, priorities, masks, counts, target, patience, warmup, end = model
+    rng = random.Random(stream)
+    expovariate = rng.expovariate
+    skills: int = len(rates)
+
+    # Pools elegíveis por skill, dos mais especializados para os mais flexíveis.
+    eligible: list = [
+        sorted(
+            (p for p, mask in enumerate(masks) if mask >> k & 1),
+            key=lambda p: (bin(masks[p]).count("1"), p),
+        )
+        for k in range(skills)
+    ]
+    idle: list = list(counts)
+    queues: list = [deque() for _ in range(skills)]
+    waiting_mask: int = 0
+    arrival_of: list = []
+    skill_of: list = []
+    state: list = []
+
+    offered: list = [0] * skills
+    answered: list = [0] * skills
+    within: list = [0] * skills
+    abandoned: list = [0] * skills
+    wait_total: list = [0.0] * skills
+    busy: list = [0.0] * len(masks)
+
+    events: list = []
+    sequence: int = 0
+    for k, rate in enumerate(rates):
+        if rate > 0:
+            first: float = expovariate(rate)
+            if first < end:
+                events.append((first, sequence, _ARRIVAL, k))
+                sequence += 1
+    heapq.heapify(events)
+
+    while events:
+        now, _, kind, subject = heapq.heappop(events)
+
+        if kind == _ABANDON:
+            if state[subject] == _WAITING:
+                state[subject] = _ABANDONED
+                if arrival_of[subject] >= warmup:
+                    abandoned[skill_of[subject]] += 1
+            continue
+
+        if kind == _ARRIVAL:
+            k = subject
+            arrived: float = now
+            if arrived >= warmup:
+                offered[k] += 1
+            following: float = now + expovariate(rates[k])
+            if following < end:
+                heapq.heappush(events, (following, sequence, _ARRIVAL, k))
+                sequence += 1
+            for p in eligible[k]:
+                if idle[p]:
+                    idle[p] -= 1
+                    break
+            else:
+                contact: int = len(state)
+                arrival_of.append(now)
+                skill_of.append(k)
+                state.append(_WAITING)
+                queues[k].append(contact)
+                waiting_mask |= 1 << k
+                if patience is not None:
+                    heapq.heappush(events, (now + expovariate(1.0 / patience), sequence, _ABANDON, contact))
+                    sequence += 1
+                continue
+        else:
+            # Agente do pool ``subject`` livre: puxa a fila de maior prioridade
+            # (e, no empate, o contato mais antigo) entre as skills que atende.
+            p = subject
+            candidates: int = masks[p] & waiting_mask
+            k = -1
+            best: tuple = ()
+            while candidates:
+                lowest: int = candidates & -candidates
+                candidates ^= lowest
+                skill: int = lowest.bit_length() - 1
+                queue: deque = queues[skill]
+                while queue and state[queue[0]] != _WAITING:
+                    queue.popleft()
+                if not queue:
+                    waiting_mask &= ~lowest
+                    continue
+                key: tuple = (priorities[skill], arrival_of[queue[0]])
+                if k < 0 or key < best:
+                    k = skill
+                    best = key
+            if k < 0:
+                idle[p] += 1
+                continue
+            contact = queues[k].popleft()
+            state[contact] = _SERVED
+            arrived = arrival_of[contact]
+
+        # Início de atendimento do contato de skill ``k`` pelo pool ``p``.
+        if arrived >= warmup:
+            wait: float = now - arrived
+            answered[k] += 1
+            wait_total[k] += wait
+            if wait <= target:
+                within[k] += 1
+        finish: float = now + expovariate(1.0 / ahts[k])
+        busy[p] += max(0.0, min(finish, end) - max(now, warmup))
+        heapq.heappush(events, (finish, sequence, _DEPARTURE, p))
+        sequence += 1
+
+    measured: float = end - warmup
+    return {
+        "offered": offered,
+        "service_level": [within[k] / offered[k] if offered[k] else None for k in range(skills)],
+        "asa": [wait_total[k] / answered[k] if answered[k] else None for k in range(skills)],
+        "abandon_rate": [abandoned[k] / offered[k] if offered[k] else None for k in range(skills)],
+        "occupancy": [busy[p] / (counts[p] * measured) if counts[p] else None for p in range(len(masks))],
+    }
+
+
+def _estimate(values: list, confidence: float) -> dict:
+    """Média e intervalo de confiança de Student das replicações com valor."""
+    observed: list = [value for value in values if value is not None]
+    if not observed:
+        return {"mean": None, "ci_low": None, "ci_high": None}
+    n: int = len(observed)
+    mean: float = sum(observed) / n
+    if n < 2:
+        return {"mean": mean, "ci_low": None, "ci_high": None}
+    variance: float = sum((value - mean) ** 2 for value in observed) / (n - 1)
+    half_width: float = _t_quantile(0.5 + confidence / 2, n - 1) * math.sqrt(variance / n)
+    return {"mean": mean, "ci_low": mean - half_width, "ci_high": mean + half_width}
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """CDF da t de Student com ``df`` inteiro (séries finitas, A&S 26.7.3-4)."""
+    theta: float = math.atan2(t, math.sqrt(df))
+    sine: float = math.sin(theta)
+    cosine2: float = math.cos(theta) ** 2
+    if df % 2:
+        term: float = math.cos(theta)
+        total: float = 0.0
+        for power in range(1, df - 1, 2):
+            if power > 1:
+                term *= cosine2 * (power - 1) / power
+            total += term
+        two_sided: float = 2.0 / math.pi * (theta + sine * total)
+    else:
+        term = 1.0
+        total = 1.0
+        for power in range(2, df - 1, 2):
+            term *= cosine2 * (power - 1) / power
+            total += term
+        two_sided = sine * total
+    return 0.5 + two_sided / 2
+
+
+def _t_quantile(probability: float, df: int) -> float:
+    """Quantil ``probability`` (> 0.5) da t de Student, por bisseção da CDF."""
+    high: float = 1.0
+    while _t_cdf(high, df) < probability:
+        high *= 2
+    low: float = 0.0
+    for _ in range(100):
+        middle: float = (low + high) / 2
+        if _t_cdf(middle, df) < probability:
+            low = middle
+        else:
+            high = middle
+    return high
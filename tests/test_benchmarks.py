@@ -0,0 +1,92 @@
+"""Testes do executor de benchmarks (medição, formato e comparação com baseline)."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.benchmarks.cases import all_cases
+from mod_turbotab.benchmarks.run import RESULTS_FORMAT, compare, main, measure, run_cases
+
+
+def document(**best: float) -> dict:
+    results = {name: {"best": value, "median": value, "number": 1, "repeat": 1} for name, value in best.items()}
+    return {"format": RESULTS_FORMAT, "version": 1, "environment": {}, "results": results}
+
+
+class MeasureTests(unittest.TestCase):
+    def test_calibrates_number_until_min_time(self) -> None:
+        calls = []
+        result = measure(lambda: calls.append(None), repeat=3, min_time=0.001)
+
+        number = result["number"]
+        # Calibração (1 + 2 + ... + number) mais as outras duas repetições.
+        self.assertEqual(len(calls), (2 * number - 1) + 2 * number)
+        self.assertLessEqual(result["best"], result["median"])
+
+    def test_run_cases_builds_results_document(self) -> None:
+        cases = [("noop", lambda: lambda: None)]
+        produced = run_cases(cases, repeat=1, min_time=0.0)
+
+        self.assertEqual(produced["format"], RESULTS_FORMAT)
+        self.assertEqual(list(produced["results"]), ["noop"])
+        self.assertIn("python", produced["environment"])
+        json.dumps(produced)
+
+    def test_case_names_are_unique_and_cover_requested_surfaces(self) -> None:
+        names = [name for name, _ in all_cases()]
+
+        self.assertEqual(len(names), len(set(names)))
+        for prefix in ("erlang.b.huge", "erlang.a.small", "staffing.agents_required", "staffing.fractional_agents",
+                       "staffing.contact_capacity", "trunks.number_trunks", "traffic.traffic",
+                       "multi_skill.agents_required_multi", "multi_skill.allocation", "cli.cold_start", "cli.batch.workers"):
+            self.assertTrue(any(name.startswith(prefix) for name in names), prefix)
+
+
+class CompareTests(unittest.TestCase):
+    def test_statuses(self) -> None:
+        rows = compare(
+            document(same=1.0, slower=1.5, faster=0.5, added=1.0),
+            document(same=1.05, slower=1.0, faster=1.0, dropped=1.0),
+            threshold=0.10,
+        )
+        status = {row["name"]: row["status"] for row in rows}
+
+        self.assertEqual(
+            status,
+            {"same": "ok", "slower": "regression", "faster": "improvement", "added": "new", "dropped": "missing"},
+        )
+        self.assertEqual(next(row for row in rows if row["name"] == "slower")["ratio"], 1.5)
+
+    def test_rejects_foreign_documents(self) -> None:
+        with self.assertRaises(ValueError):
+            compare(document(a=1.0), {"results": {}})
+
+    def test_main_exits_one_on_regression(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / "baseline.json"
+            # Baseline impossível de bater: qualquer medição real é regressão.
+            baseline.write_text(json.dumps(document(**{"erlang.b.small": 1e-12})))
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                status = main([
+                    "--select", "erlang.b.small", "--repeat", "1", "--min-time", "0",
+                    "--baseline", str(baseline),
+                ])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(list(json.loads(stdout.getvalue())["results"]), ["erlang.b.small"])
+        self.assertIn("regression", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
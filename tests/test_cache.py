@@ -0,0 +1,104 @@
+"""Testes do cache opcional dos kernels Erlang."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.calculations.cache import KernelCache, active_cache, disable_cache, enable_cache
+from mod_turbotab.calculations.erlang import erlang_a, erlang_b, erlang_c
+from mod_turbotab.exceptions import InputValidationError
+from mod_turbotab.queues.queues import queue_size
+
+
+class KernelCacheTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable_cache()
+
+    def test_disabled_by_default(self) -> None:
+        self.assertIsNone(active_cache())
+
+    def test_cached_results_match_uncached(self) -> None:
+        expected_b = erlang_b(11, 7.5)
+        expected_c = erlang_c(11, 7.5)
+        expected_a = erlang_a(11, 7.5, 60, 180)
+        with KernelCache() as cache:
+            for _ in range(2):
+                self.assertEqual(erlang_b(11, 7.5), expected_b)
+                self.assertEqual(erlang_c(11, 7.5), expected_c)
+                metrics = erlang_a(11, 7.5, 60, 180)
+                self.assertEqual(metrics["pw"], expected_a["pw"])
+                self.assertEqual(metrics["sla"](20), expected_a["sla"](20))
+        stats = cache.stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertEqual(stats["evictions"], 0)
+
+    def test_keys_are_normalised(self) -> None:
+        with KernelCache() as cache:
+            erlang_b(10, 8)
+            erlang_b(10.0, 8.0)
+            # Erlang B só usa a parte inteira de servers.
+            erlang_b(10.7, 8)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_lru_eviction(self) -> None:
+        with KernelCache(maxsize=2) as cache:
+            erlang_b(1, 1.0)
+            erlang_b(2, 1.0)
+            erlang_b(1, 1.0)  # renova (1, 1.0)
+            erlang_b(3, 1.0)  # remove (2, 1.0)
+            erlang_b(1, 1.0)
+            erlang_b(2, 1.0)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["evictions"], 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_fifo_eviction_ignores_recency(self) -> None:
+        with KernelCache(maxsize=2, policy="fifo") as cache:
+            erlang_b(1, 1.0)
+            erlang_b(2, 1.0)
+            erlang_b(1, 1.0)
+            erlang_b(3, 1.0)  # remove (1, 1.0), a mais antiga
+            erlang_b(1, 1.0)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_context_manager_restores_previous_cache(self) -> None:
+        outer = enable_cache(maxsize=8)
+        with KernelCache(maxsize=8) as inner:
+            queue_size(11, 25, 180)
+            self.assertIs(active_cache(), inner)
+        self.assertIs(active_cache(), outer)
+        self.assertEqual(outer.stats()["misses"], 0)
+        self.assertGreater(inner.stats()["misses"], 0)
+
+    def test_erlang_a_result_is_not_shared(self) -> None:
+        with KernelCache():
+            first = erlang_a(11, 7.5, 60, 180)
+            first["pw"] = -1.0
+            self.assertNotEqual(erlang_a(11, 7.5, 60, 180)["pw"], -1.0)
+
+    def test_clear_resets_entries_and_counters(self) -> None:
+        cache = enable_cache()
+        erlang_c(11, 7.5)
+        cache.clear()
+        self.assertEqual(
+            cache.stats(),
+            {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 4096, "hit_rate": 0.0},
+        )
+
+    def test_invalid_configuration_raises(self) -> None:
+        with self.assertRaises(InputValidationError):
+            KernelCache(maxsize=0)
+        with self.assertRaises(InputValidationError):
+            KernelCache(policy="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,8 +5,11 @@ from __future__ import annotations
 import json
 import os
 import re
+import socket
 import subprocess
 import sys
+import tempfile
+import time
 import unittest
 from pathlib import Path
 
@@ -15,13 +18,14 @@ REPO_DIR = Path(__file__).resolve().parents[1]
 WORKSPACE_DIR = REPO_DIR.parent
 
 
-def run_cli(*args: str) -> subprocess.CompletedProcess[str]:
+def run_cli(*args: str, stdin: str | None = None) -> subprocess.CompletedProcess[str]:
     env = os.environ.copy()
     env["PYTHONPATH"] = str(WORKSPACE_DIR)
     return subprocess.run(
         [sys.executable, "-m", "mod_turbotab.cli", *args],
         cwd=WORKSPACE_DIR,
         env=env,
+        input=stdin,
         text=True,
         capture_output=True,
         check=False,
@@ -356,6 +360,33 @@ class CliTests(unittest.TestCase):
             payload["result"]["value"]["productive_agents"], 30 / 0.85
         )
 
+    def test_staffing_fractional_required_continuous_json(self) -> None:
+        args = [
+            "staffing",
+            "fractional-required",
+            "--sla",
+            "0.80",
+            "--service-time",
+            "20",
+            "--contacts-per-interval",
+            "25",
+            "--aht",
+            "180",
+            "--shrinkage",
+            "0",
+            "--json",
+        ]
+        interpolated = run_cli(*args)
+        result = run_cli(*args, "--continuous")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        payload = json.loads(result.stdout)
+        self.assertIs(payload["inputs"]["continuous"], True)
+        self.assertNotIn("continuous", json.loads(interpolated.stdout)["inputs"])
+        productive = payload["result"]["value"]["productive_agents"]
+        self.assertAlmostEqual(productive, 10.230664834967683, places=6)
+        self.assertLess(productive, json.loads(interpolated.stdout)["result"]["value"]["productive_agents"])
+
     def test_staffing_fractional_required_invalid_max_occupancy_exits_nonzero(self) -> None:
         result = run_cli(
             "staffing",
@@ -520,6 +551,525 @@ class CliTests(unittest.TestCase):
         self.assertEqual(json.loads(queue_result.stdout)["calculation"], "queue.wait")
         self.assertEqual(json.loads(telecom_result.stdout)["calculation"], "telecom.trunks")
 
+    def test_queue_snapshot_json(self) -> None:
+        result = run_cli(
+            "queue",
+            "snapshot",
+            "--agents",
+            "11",
+            "--contacts-per-interval",
+            "25",
+            "--aht",
+            "180",
+            "--service-time",
+            "20",
+            "--service-time",
+            "60",
+            "--sla",
+            "0.80",
+            "--json",
+        )
+        wait = run_cli("queue", "wait", "--agents", "11", "--contacts-per-interval", "25", "--aht", "180", "--json")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        payload = json.loads(result.stdout)
+        self.assertEqual(payload["calculation"], "queue.snapshot")
+        self.assertEqual(payload["inputs"]["service_times"], [20.0, 60.0])
+        value = payload["result"]["value"]
+        self.assertEqual(value["queue_time"], json.loads(wait.stdout)["result"]["value"])
+        self.assertEqual(sorted(value["sla"]), ["20", "60"])
+        self.assertAlmostEqual(value["queued"], 0.17580693788241417)
+        self.assertEqual(value["service_time"], 0)
+
+    def test_trunks_number_blocking_flag(self) -> None:
+        default = run_cli("trunks", "number", "--servers", "11", "--intensity", "8.9", "--json")
+        loose = run_cli(
+            "trunks", "number", "--servers", "11", "--intensity", "8.9", "--blocking", "0.01", "--json"
+        )
+
+        self.assertEqual(default.returncode, 0, default.stderr)
+        self.assertEqual(loose.returncode, 0, loose.stderr)
+        default_payload = json.loads(default.stdout)
+        loose_payload = json.loads(loose.stdout)
+        # Sem a flag, o payload 1.0 não ganha a chave blocking.
+        self.assertNotIn("blocking", default_payload["inputs"])
+        self.assertEqual(default_payload["result"]["value"], 20)
+        self.assertEqual(loose_payload["inputs"]["blocking"], 0.01)
+        self.assertEqual(loose_payload["result"]["value"], 17)
+
+    def test_traffic_intensity_from_precomputed_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "table.json")
+            built = run_cli(
+                "traffic", "table", "--max-servers", "20", "--blocking", "0.01", "--output", path, "--json"
+            )
+            looked_up = run_cli(
+                "traffic", "intensity", "--servers", "10", "--blocking", "0.01", "--table", path, "--json"
+            )
+            missing = run_cli("traffic", "intensity", "--servers", "10", "--blocking", "0.02", "--table", path)
+        direct = run_cli("traffic", "intensity", "--servers", "10", "--blocking", "0.01", "--json")
+
+        self.assertEqual(built.returncode, 0, built.stderr)
+        self.assertEqual(json.loads(built.stdout)["result"]["value"]["blockings"], [0.01])
+        self.assertEqual(looked_up.returncode, 0, looked_up.stderr)
+        self.assertAlmostEqual(
+            json.loads(looked_up.stdout)["result"]["value"],
+            json.loads(direct.stdout)["result"]["value"],
+            delta=1e-8,
+        )
+        # Sem --table, o payload 1.0 segue sem chaves novas.
+        self.assertEqual(set(json.loads(direct.stdout)["inputs"]), {"blocking", "servers"})
+        self.assertEqual(missing.returncode, 2)
+        self.assertIn("not in the table", missing.stderr)
+
+    def test_staffing_required_from_precomputed_table(self) -> None:
+        objective = ["--sla", "0.80", "--service-time", "20", "--aht", "180"]
+        chain = ["--contacts-per-interval", "250", "--shrinkage", "0.3", "--json"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "staffing.json")
+            built = run_cli("staffing", "table", "--max-agents", "120", *objective, "--output", path, "--json")
+            looked_up = run_cli("staffing", "required", *objective, *chain, "--table", path)
+            mismatched = run_cli("staffing", "required", "--sla", "0.90", "--service-time", "20", "--aht", "180", *chain, "--table", path)
+        direct = run_cli("staffing", "required", *objective, *chain)
+
+        self.assertEqual(built.returncode, 0, built.stderr)
+        self.assertEqual(json.loads(built.stdout)["result"]["value"]["max_agents"], 120)
+        self.assertEqual(looked_up.returncode, 0, looked_up.stderr)
+        self.assertEqual(json.loads(looked_up.stdout)["result"], json.loads(direct.stdout)["result"])
+        self.assertNotIn("table", json.loads(direct.stdout)["inputs"])
+        self.assertEqual(mismatched.returncode, 2)
+        self.assertIn("table objective", mismatched.stderr)
+
+    def test_stats_flag_adds_diagnostics_block(self) -> None:
+        command = [
+            "staffing", "required", "--sla", "0.80", "--service-time", "20",
+            "--contacts-per-interval", "25", "--aht", "180", "--shrinkage", "0.3", "--json",
+        ]
+        plain = run_cli(*command)
+        result = run_cli(*command, "--stats")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        payload = json.loads(result.stdout)
+        diagnostics = payload.pop("diagnostics")
+        self.assertEqual(payload, json.loads(plain.stdout))
+        self.assertNotIn("stats", payload["inputs"])
+        self.assertEqual(diagnostics["search_probes"], {"agents_required": 3})
+        self.assertNotIn("erlang_c_from_b", diagnostics["kernel_calls"])
+        self.assertGreater(diagnostics["recurrence_iterations"], 0)
+        self.assertEqual(diagnostics["timings"]["agents_required"]["calls"], 1)
+
+    def test_profile_flag_reports_stage_spans(self) -> None:
+        command = [
+            "staffing", "required", "--sla", "0.80", "--service-time", "20",
+            "--contacts-per-interval", "25", "--aht", "180", "--shrinkage", "0.3", "--shifts", "2", "--json",
+        ]
+        plain = run_cli(*command)
+        profiled = run_cli(*command, "--profile")
+
+        self.assertEqual(profiled.returncode, 0, profiled.stderr)
+        self.assertEqual(profiled.stdout, plain.stdout)
+        self.assertNotIn("profile", json.loads(profiled.stdout)["inputs"])
+        lines = profiled.stderr.splitlines()
+        self.assertEqual(lines[0], "turbotab: profile (ms)")
+        stages = [line.strip().rsplit(None, 1)[0] for line in lines[1:]]
+        for stage in ("import mod_turbotab.cli", "build parser", "parse args", "handle staffing.required",
+                      "inputs", "erlang search", "shrinkage", "roster", "serialize", "write output"):
+            self.assertIn(stage, stages)
+        # Estágios do handler aparecem aninhados (indentados) sob ele.
+        handler = next(line for line in lines if "handle staffing.required" in line)
+        search = next(line for line in lines if "erlang search" in line)
+        self.assertGreater(len(search) - len(search.lstrip()), len(handler) - len(handler.lstrip()))
+
+    def test_profile_flag_writes_chrome_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = Path(tmp) / "trace.json"
+            result = run_cli("erlang", "b", "--servers", "10", "--intensity", "8", f"--profile={trace_path}", "--json")
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stderr, "")
+        self.assertEqual(json.loads(result.stdout)["result"]["name"], "blocking_probability")
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        names = [event["name"] for event in spans]
+        self.assertEqual(names[:2], ["import mod_turbotab.cli", "main"])
+        self.assertIn("calculate", names)
+        self.assertIn("import mod_turbotab.calculations.erlang", names)
+        self.assertTrue(all(event["dur"] >= 0 and event["ts"] >= 0 for event in spans))
+
+    def test_profile_path_needs_an_equals_sign(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            leading = subprocess.run(
+                [sys.executable, "-m", "mod_turbotab.cli", "--profile", "erlang", "b", "--servers", "10", "--intensity", "8", "--json"],
+                cwd=workdir,
+                env={**os.environ, "PYTHONPATH": str(WORKSPACE_DIR)},
+                text=True,
+                capture_output=True,
+                check=False,
+            )
+            self.assertEqual(list(workdir.iterdir()), [])
+
+        self.assertEqual(leading.returncode, 0, leading.stderr)
+        self.assertEqual(json.loads(leading.stdout)["calculation"], "erlang.b")
+        self.assertTrue(leading.stderr.startswith("turbotab: profile (ms)"))
+        spaced = run_cli("erlang", "b", "--servers", "10", "--intensity", "8", "--profile", "trace.json")
+        self.assertEqual(spaced.returncode, 2)
+        self.assertIn("unrecognized arguments: trace.json", spaced.stderr)
+
+    def test_staffing_plan_file_streams_csv(self) -> None:
+        forecast = (
+            "queue,date,interval_start,contacts_per_interval,aht\n"
+            "billing,2026-01-05,09:00,25,180\n"
+            "billing,2026-01-05,09:30,40,240\n"
+            "tech,2026-01-05,09:00,25,\n"
+        )
+        settings = ["--sla", "0.80", "--service-time", "20", "--shrinkage", "0.3", "--shifts", "1.5"]
+        result = run_cli("staffing", "plan-file", "--input", "-", "--aht", "300", *settings, stdin=forecast)
+        broken = run_cli("staffing", "plan-file", "--input", "-", *settings, stdin=forecast)
+        single = run_cli(
+            "staffing", "required", "--contacts-per-interval", "25", "--aht", "300", *settings, "--json"
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("planned 3 rows", result.stderr)
+        lines = result.stdout.splitlines()
+        self.assertEqual(
+            lines[0],
+            "queue,date,interval_start,contacts_per_interval,aht,productive_agents,scheduled_agents,rostered_agents",
+        )
+        self.assertEqual(lines[1], "billing,2026-01-05,09:00,25,180,11,16,24")
+        expected = json.loads(single.stdout)["result"]["value"]
+        self.assertEqual(
+            lines[3].split(",")[-3:],
+            [str(expected["productive_agents"]), str(expected["scheduled_agents"]), str(expected["rostered_agents"])],
+        )
+        self.assertEqual(broken.returncode, 2)
+        self.assertIn("line 4", broken.stderr)
+
+    def test_staffing_plan_from_csv_and_json(self) -> None:
+        common = ["--sla", "0.80", "--service-time", "20", "--shrinkage", "0.3", "--json"]
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "day.csv"
+            csv_path.write_text("contacts_per_interval,aht\n25,180\n40,\n", encoding="utf-8")
+            json_path = Path(tmp) / "day.json"
+            json_path.write_text(
+                json.dumps([{"contacts_per_interval": 25, "aht": 180}, {"contacts_per_interval": 40, "aht": 240}]),
+                encoding="utf-8",
+            )
+            from_csv = run_cli("staffing", "plan", "--input", str(csv_path), "--aht", "240", *common)
+            from_json = run_cli("staffing", "plan", "--input", str(json_path), *common)
+            missing_aht = run_cli("staffing", "plan", "--input", str(csv_path), *common)
+        single = run_cli(
+            "staffing", "required", "--contacts-per-interval", "40", "--aht", "240", *common
+        )
+
+        self.assertEqual(from_csv.returncode, 0, from_csv.stderr)
+        payload = json.loads(from_csv.stdout)
+        self.assertEqual(payload["calculation"], "staffing.plan")
+        self.assertEqual(payload["schema_version"], "2.2")
+        self.assertEqual(payload["result"]["value"], json.loads(from_json.stdout)["result"]["value"])
+        intervals = payload["result"]["value"]["intervals"]
+        self.assertEqual(intervals[1]["scheduled_agents"], json.loads(single.stdout)["result"]["value"]["scheduled_agents"])
+        self.assertEqual(
+            payload["result"]["value"]["totals"]["scheduled_agents"],
+            sum(row["scheduled_agents"] for row in intervals),
+        )
+        self.assertEqual(missing_aht.returncode, 2)
+        self.assertIn("Interval 2", missing_aht.stderr)
+
+    def test_telecom_trunks_invalid_blocking_exits_nonzero(self) -> None:
+        result = run_cli(
+            "telecom",
+            "trunks",
+            "--agents",
+            "11",
+            "--contacts-per-interval",
+            "25",
+            "--aht",
+            "180",
+            "--blocking",
+            "1.5",
+            "--json",
+        )
+
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("'blocking'", result.stderr)
+
+    def test_batch_ndjson_matches_single_commands_and_reports_line_errors(self) -> None:
+        scenarios = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "calculation": "staffing.required",
+                        "inputs": {
+                            "sla": 0.80,
+                            "service_time": 20,
+                            "contacts_per_interval": 25,
+                            "aht": 180,
+                            "shrinkage": 0.30,
+                        },
+                    }
+                ),
+                "",
+                "not json",
+                json.dumps({"calculation": "staffing.capacity", "inputs": {"agents": 11, "sla": 0.8, "service_time": 20, "aht": 180}}),
+                json.dumps({"calculation": "trunks.number", "inputs": {"servers": 11, "intensity": 8.9, "typo": 1}}),
+            ]
+        )
+        result = run_cli("batch", stdin=scenarios)
+        single = run_cli(
+            "staffing", "required", "--sla", "0.80", "--service-time", "20",
+            "--contacts-per-interval", "25", "--aht", "180", "--shrinkage", "0.30", "--json",
+        )
+        capacity = run_cli(
+            "staffing", "capacity", "--agents", "11", "--sla", "0.8", "--service-time", "20", "--aht", "180", "--json"
+        )
+
+        self.assertEqual(result.returncode, 2)
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], json.loads(single.stdout))
+        self.assertEqual(lines[1]["line"], 3)
+        self.assertIn("Invalid JSON", lines[1]["error"])
+        self.assertEqual(lines[2], json.loads(capacity.stdout))
+        self.assertEqual(lines[3]["line"], 5)
+        self.assertIn("typo", lines[3]["error"])
+
+    def test_batch_workers_match_serial_output_byte_for_byte(self) -> None:
+        scenarios = []
+        for volume in range(0, 60, 3):
+            scenarios.append(json.dumps({
+                "calculation": "staffing.required",
+                "inputs": {"sla": 0.80, "service_time": 20, "contacts_per_interval": volume, "aht": 180, "shrinkage": 0.30},
+            }))
+            scenarios.append(json.dumps({"calculation": "trunks.number", "inputs": {"servers": volume + 1, "intensity": 8.9}}))
+        scenarios.insert(7, "not json")
+        stdin = "\n".join(scenarios) + "\n"
+        serial = run_cli("batch", stdin=stdin)
+        parallel = run_cli("batch", "--workers", "2", "--chunk-size", "3", stdin=stdin)
+        invalid = run_cli("batch", "--chunk-size", "0", stdin=stdin)
+
+        self.assertEqual(parallel.returncode, serial.returncode)
+        self.assertEqual(parallel.returncode, 2)
+        self.assertEqual(parallel.stdout, serial.stdout)
+        self.assertEqual(len(parallel.stdout.splitlines()), 41)
+        self.assertEqual(invalid.returncode, 2)
+        self.assertIn("--chunk-size", invalid.stderr)
+
+    def test_batch_csv_omits_empty_cells(self) -> None:
+        result = run_cli(
+            "batch",
+            "--format",
+            "csv",
+            stdin="calculation,servers,intensity,blocking\ntrunks.number,11,8.9,\ntrunks.number,11,8.9,0.01\n",
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        first, second = (json.loads(line) for line in result.stdout.splitlines())
+        self.assertNotIn("blocking", first["inputs"])
+        self.assertEqual(first["result"]["value"], 20)
+        self.assertEqual(second["result"]["value"], 17)
+
+    def test_batch_flags_accept_json_bools_and_csv_text(self) -> None:
+        capacity = ["staffing", "fractional-capacity", "--agents", "11", "--sla", "0.8", "--service-time", "20", "--aht", "180", "--json"]
+        fractional = json.loads(run_cli(*capacity).stdout)
+        whole = json.loads(run_cli(*capacity, "--whole-contacts").stdout)
+        self.assertEqual((fractional["schema_version"], whole["schema_version"]), ("1.2", "1.2"))
+        self.assertEqual(
+            json.loads(run_cli("agents", "fractional-capacity", "--no-agents", "11", "--sla", "0.8", "--service-time", "20", "--aht", "180", "--json").stdout)["schema_version"],
+            "1.2",
+        )
+        required = [
+            "staffing", "fractional-required", "--sla", "0.8", "--service-time", "20",
+            "--contacts-per-interval", "25", "--aht", "180", "--shrinkage", "0", "--json",
+        ]
+        interpolated = json.loads(run_cli(*required).stdout)
+        continuous = json.loads(run_cli(*required, "--continuous").stdout)
+        capacity_inputs = {"agents": 11, "sla": 0.8, "service_time": 20, "aht": 180}
+        required_inputs = {"sla": 0.8, "service_time": 20, "contacts_per_interval": 25, "aht": 180, "shrinkage": 0}
+
+        ndjson = run_cli(
+            "batch",
+            stdin="\n".join(
+                json.dumps(scenario)
+                for scenario in (
+                    {"calculation": "staffing.fractional_capacity", "inputs": {**capacity_inputs, "whole_contacts": True}},
+                    {"calculation": "staffing.fractional_capacity", "inputs": {**capacity_inputs, "whole_contacts": False}},
+                    {"calculation": "staffing.fractional_required", "inputs": {**required_inputs, "continuous": True}},
+                    {"calculation": "staffing.fractional_required", "inputs": {**required_inputs, "continuous": "yes"}},
+                )
+            ),
+        )
+        lines = [json.loads(line) for line in ndjson.stdout.splitlines()]
+        self.assertEqual(lines[:3], [whole, fractional, continuous])
+        self.assertEqual(lines[3]["line"], 4)
+        self.assertIn("expected true or false", lines[3]["error"])
+
+        csv = run_cli(
+            "batch",
+            "--format",
+            "csv",
+            stdin=(
+                "calculation,agents,sla,service_time,aht,whole_contacts\n"
+                "staffing.fractional_capacity,11,0.8,20,180,true\n"
+                "staffing.fractional_capacity,11,0.8,20,180,false\n"
+                "staffing.fractional_capacity,11,0.8,20,180,0\n"
+                "staffing.fractional_capacity,11,0.8,20,180,maybe\n"
+            ),
+        )
+        rows = [json.loads(line) for line in csv.stdout.splitlines()]
+        self.assertEqual(rows[:3], [whole, fractional, fractional])
+        self.assertIn("expected true or false", rows[3]["error"])
+        continuous_csv = run_cli(
+            "batch",
+            "--format",
+            "csv",
+            stdin=(
+                "calculation,sla,service_time,contacts_per_interval,aht,shrinkage,continuous\n"
+                "staffing.fractional_required,0.8,20,25,180,0,1\n"
+                "staffing.fractional_required,0.8,20,25,180,0,FALSE\n"
+            ),
+        )
+        self.assertEqual([json.loads(line) for line in continuous_csv.stdout.splitlines()], [continuous, interpolated])
+
+    def test_batch_missing_required_input_is_a_line_error(self) -> None:
+        result = run_cli(
+            "batch",
+            stdin=json.dumps({"calculation": "staffing.required", "inputs": {"sla": 0.8, "service_time": 20, "contacts_per_interval": 25, "aht": 180}}),
+        )
+
+        self.assertEqual(result.returncode, 2)
+        self.assertEqual(json.loads(result.stdout), {"line": 1, "error": "Missing input 'shrinkage'."})
+
+    def test_batch_unexpected_errors_stay_on_their_line(self) -> None:
+        valid = json.dumps({"calculation": "erlang.b", "inputs": {"servers": 10, "intensity": 8}})
+        scenarios = "\n".join(
+            [
+                json.dumps({"calculation": "erlang.b", "inputs": {"servers": 0.5, "intensity": 1}}),
+                valid,
+                json.dumps({"calculation": ["x"], "inputs": {}}),
+                valid,
+            ]
+        )
+        result = run_cli("batch", stdin=scenarios)
+        single = json.loads(run_cli("erlang", "b", "--servers", "10", "--intensity", "8", "--json").stdout)
+
+        self.assertEqual(result.returncode, 2)
+        self.assertNotIn("Traceback", result.stderr)
+        first, second, third, fourth = (json.loads(line) for line in result.stdout.splitlines())
+        self.assertEqual(first["line"], 1)
+        self.assertIn("error", first)
+        self.assertEqual(second, single)
+        self.assertEqual(third, {"line": 3, "error": "Unknown calculation ['x']."})
+        self.assertEqual(fourth, single)
+
+    def test_serve_stdio_answers_each_request_and_echoes_id(self) -> None:
+        requests = "\n".join(
+            [
+                json.dumps({"id": 7, "calculation": "erlang.b", "inputs": {"servers": 10, "intensity": 8}}),
+                "{broken",
+                json.dumps({"id": "x", "calculation": "erlang.z", "inputs": {}}),
+            ]
+        )
+        result = run_cli("serve", stdin=requests)
+        single = run_cli("erlang", "b", "--servers", "10", "--intensity", "8", "--json")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        answered, broken, unknown = (json.loads(line) for line in result.stdout.splitlines())
+        self.assertEqual(answered, {**json.loads(single.stdout), "id": 7})
+        self.assertIn("Invalid JSON", broken["error"])
+        self.assertEqual(unknown, {"error": "Unknown calculation 'erlang.z'.", "id": "x"})
+
+    def test_serve_survives_unexpected_request_errors(self) -> None:
+        requests = "\n".join(
+            [
+                json.dumps({"id": 1, "calculation": ["x"], "inputs": {}}),
+                json.dumps({"id": 2, "calculation": "erlang.b", "inputs": {"servers": 0.5, "intensity": 1}}),
+                json.dumps({"id": 3, "calculation": "erlang.b", "inputs": {"servers": 10, "intensity": 8}}),
+            ]
+        )
+        result = run_cli("serve", stdin=requests)
+        single = run_cli("erlang", "b", "--servers", "10", "--intensity", "8", "--json")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+        listed, fractional, answered = (json.loads(line) for line in result.stdout.splitlines())
+        self.assertEqual(listed, {"error": "Unknown calculation ['x'].", "id": 1})
+        self.assertEqual(fractional["id"], 2)
+        self.assertIn("error", fractional)
+        self.assertEqual(answered, {**json.loads(single.stdout), "id": 3})
+
+    def test_serve_flags_match_the_plain_command(self) -> None:
+        capacity = ["staffing", "fractional-capacity", "--agents", "11", "--sla", "0.8", "--service-time", "20", "--aht", "180", "--json"]
+        inputs = {"agents": 11, "sla": 0.8, "service_time": 20, "aht": 180}
+        requests = "\n".join(
+            json.dumps({"id": number, "calculation": "staffing.fractional_capacity", "inputs": {**inputs, "whole_contacts": flag}})
+            for number, flag in ((1, True), (2, False), (3, "sometimes"))
+        )
+        result = run_cli("serve", stdin=requests)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        whole, fractional, invalid = (json.loads(line) for line in result.stdout.splitlines())
+        self.assertEqual(whole, {**json.loads(run_cli(*capacity, "--whole-contacts").stdout), "id": 1})
+        self.assertEqual(fractional, {**json.loads(run_cli(*capacity).stdout), "id": 2})
+        self.assertIn("expected true or false", invalid["error"])
+
+    def test_serve_and_batch_never_touch_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "gos.json")
+            requests = [
+                {"id": 1, "calculation": "traffic.table", "inputs": {"max_servers": 5, "blockings": [0.01], "output": path}},
+                {"id": 2, "calculation": "staffing.table", "inputs": {"max_agents": 5, "sla": 0.8, "service_time": 20, "aht": 180, "output": path}},
+                {"id": 3, "calculation": "staffing.plan", "inputs": {"input": path, "aht": 180, "sla": 0.8, "service_time": 20}},
+                {"id": 4, "calculation": "traffic.intensity", "inputs": {"servers": 10, "blocking": 0.01, "table": path}},
+                {"id": 5, "calculation": "traffic.intensity", "inputs": {"servers": 10, "blocking": 0.01}},
+            ]
+            served = run_cli("serve", stdin="\n".join(json.dumps(request) for request in requests))
+            batched = run_cli("batch", stdin="\n".join(json.dumps(request) for request in requests))
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(served.returncode, 0, served.stderr)
+        answers = [json.loads(line) for line in served.stdout.splitlines()]
+        for answer, calculation in zip(answers, ("traffic.table", "staffing.table", "staffing.plan")):
+            self.assertEqual(answer["error"], f"Calculation '{calculation}' reads or writes files and is not available here.")
+        self.assertEqual(answers[3]["error"], "Unknown inputs for 'traffic.intensity': table.")
+        self.assertEqual(answers[4]["calculation"], "traffic.intensity")
+        self.assertEqual(batched.returncode, 2)
+        self.assertEqual(
+            [line.get("error") for line in map(json.loads, batched.stdout.splitlines())],
+            [answer.get("error") for answer in answers],
+        )
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets not available")
+    def test_serve_unix_socket_keeps_connection_open(self) -> None:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(WORKSPACE_DIR)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "turbotab.sock")
+            server = subprocess.Popen(
+                [sys.executable, "-m", "mod_turbotab.cli", "serve", "--socket", path],
+                cwd=WORKSPACE_DIR,
+                env=env,
+            )
+            try:
+                deadline = time.monotonic() + 10
+                while not os.path.exists(path) and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                with socket.socket(socket.AF_UNIX) as client, client.makefile("rw", encoding="utf-8") as stream:
+                    client.connect(path)
+                    answers = []
+                    for servers in (10, 11):
+                        stream.write(json.dumps({"calculation": "trunks.number", "inputs": {"servers": servers, "intensity": 8.9}}) + "\n")
+                        stream.flush()
+                        answers.append(json.loads(stream.readline()))
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+
+            self.assertEqual([answer["schema_version"] for answer in answers], ["1.0", "1.0"])
+            self.assertEqual(answers[1]["result"]["value"], 20)
+            self.assertFalse(os.path.exists(path))
+
     def test_invalid_input_exits_nonzero(self) -> None:
         result = run_cli(
             "agents",
@@ -574,6 +1124,39 @@ class CliTests(unittest.TestCase):
             result.stderr,
         )
 
+    def test_startup_imports_only_the_requested_calculation(self) -> None:
+        # Guarda de tempo de inicialização: contar módulos é determinístico,
+        # ao contrário de cronometrar o subprocesso.
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(WORKSPACE_DIR)
+        script = (
+            "import sys; from mod_turbotab.cli import main; "
+            "main(['erlang', 'b', '--servers', '10', '--intensity', '8']); "
+            "print(' '.join(sorted(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=WORKSPACE_DIR,
+            env=env,
+            text=True,
+            capture_output=True,
+            check=False,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        loaded = set(result.stdout.splitlines()[-1].split())
+        self.assertIn("mod_turbotab.calculations.erlang", loaded)
+        for module in (
+            "mod_turbotab.agents.capacity",
+            "mod_turbotab.calculations.traffic",
+            "mod_turbotab.queues.queues",
+            "mod_turbotab.trunks.trunks",
+            "importlib.metadata",
+            "socketserver",
+            "csv",
+        ):
+            self.assertNotIn(module, loaded)
+
     def test_existing_python_api_import_still_works(self) -> None:
         env = os.environ.copy()
         env["PYTHONPATH"] = str(WORKSPACE_DIR)
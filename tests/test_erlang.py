@@ -0,0 +1,425 @@
+"""Testes de regressão dos kernels Erlang e das buscas construídas sobre eles."""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import struct
+import sys
+import tempfile
+import unittest
+from array import array
+from decimal import Decimal, localcontext
+from itertools import islice
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.agents.capacity import (
+    StaffingTable,
+    agents_asa,
+    agents_required,
+    contact_capacity,
+    fractional_agents,
+    fractional_contact_capacity,
+    nb_agents,
+)
+from mod_turbotab.calculations.erlang import (
+    erlang_a,
+    erlang_a_from_c,
+    erlang_a_many,
+    erlang_b,
+    erlang_b_continuous,
+    erlang_b_iter,
+    erlang_b_large,
+    erlang_b_many,
+    erlang_b_profile,
+    erlang_c,
+    erlang_c_continuous,
+    erlang_c_from_b,
+    erlang_c_large,
+    erlang_c_many,
+    erlang_c_profile,
+    extend_erlang_b_profile,
+)
+from mod_turbotab.exceptions import InputValidationError
+from mod_turbotab.utils import int_ceiling
+
+try:
+    import numpy
+except ImportError:  # numpy é opcional
+    numpy = None
+
+INTENSITIES = [0.0, 0.37, 2.5, 7.5, 11.9, 30.0, 48.2, 123.4]
+
+
+class ErlangBIterTests(unittest.TestCase):
+    def test_matches_scalar_kernel_bit_for_bit(self) -> None:
+        for intensity in (0.0, 0.37, 7.5, 30.0, 123.4):
+            for n, b in islice(erlang_b_iter(intensity), 200):
+                self.assertEqual(b, erlang_b(n, intensity))
+
+    def test_start_resumes_recurrence(self) -> None:
+        n, b = next(erlang_b_iter(30.0, start=42))
+        self.assertEqual(n, 42)
+        self.assertEqual(b, erlang_b(42, 30.0))
+
+    def test_c_and_a_from_precomputed_blocking(self) -> None:
+        b = erlang_b(11, 7.5)
+        self.assertEqual(erlang_c_from_b(11, 7.5, b), erlang_c(11, 7.5))
+        direct = erlang_a(11, 7.5, 60, 180)
+        reused = erlang_a_from_c(11, 7.5, 60, 180, erlang_c(11, 7.5))
+        self.assertEqual(reused["pw"], direct["pw"])
+        self.assertEqual(reused["asa"], direct["asa"])
+        self.assertEqual(reused["sla"](20), direct["sla"](20))
+
+
+class BatchKernelTests(unittest.TestCase):
+    def test_b_and_c_match_scalar_bit_for_bit(self) -> None:
+        for servers in (1, 11, 50.7):
+            self.assertEqual(
+                list(erlang_b_many(servers, INTENSITIES)),
+                [erlang_b(servers, a) for a in INTENSITIES],
+            )
+            self.assertEqual(
+                list(erlang_c_many(servers, array("d", INTENSITIES))),
+                [erlang_c(servers, a) for a in INTENSITIES],
+            )
+
+    def test_per_element_servers(self) -> None:
+        servers = [1, 3, 11, 40, 2, 60, 50, 130]
+        self.assertEqual(
+            list(erlang_c_many(servers, INTENSITIES)),
+            [erlang_c(n, a) for n, a in zip(servers, INTENSITIES)],
+        )
+
+    def test_returns_compact_array(self) -> None:
+        result = erlang_b_many(11, INTENSITIES)
+        self.assertIsInstance(result, array)
+        self.assertEqual(result.typecode, "d")
+
+    def test_erlang_a_many_matches_scalar(self) -> None:
+        batch = erlang_a_many(60, INTENSITIES, 60, 180, target_time=20)
+        for i, a in enumerate(INTENSITIES):
+            scalar = erlang_a(60, a, 60, 180)
+            self.assertEqual(batch["pw"][i], scalar["pw"])
+            self.assertEqual(batch["asa"][i], scalar["asa"])
+            self.assertEqual(batch["abandon_rate"][i], scalar["abandon_rate"])
+            self.assertEqual(batch["sla"][i], scalar["sla"](20))
+
+    def test_mismatched_lengths_raise(self) -> None:
+        with self.assertRaises(InputValidationError):
+            erlang_b_many([1, 2], INTENSITIES)
+
+    @unittest.skipIf(numpy is None, "numpy não instalado")
+    def test_numpy_input_matches_scalar(self) -> None:
+        result = erlang_c_many(numpy.array([11.0] * len(INTENSITIES)), numpy.array(INTENSITIES))
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.tolist(), [erlang_c(11, a) for a in INTENSITIES])
+
+
+class ProfileTests(unittest.TestCase):
+    def test_profiles_match_scalar_kernels(self) -> None:
+        for intensity in (0.0, 7.5, 48.2):
+            blocking = erlang_b_profile(80, intensity)
+            queueing = erlang_c_profile(80, intensity)
+            self.assertEqual(len(blocking), 81)
+            self.assertEqual(blocking[0], 1.0)
+            self.assertEqual(queueing[0], 1.0)
+            for n in range(1, 81):
+                self.assertEqual(blocking[n], erlang_b(n, intensity))
+                self.assertEqual(queueing[n], erlang_c(n, intensity))
+
+    def test_extend_continues_recurrence(self) -> None:
+        profile = erlang_b_profile(10, 30.0)
+        extend_erlang_b_profile(profile, 30.0, 60)
+        self.assertEqual(list(profile), list(erlang_b_profile(60, 30.0)))
+
+    def test_negative_inputs_raise(self) -> None:
+        with self.assertRaises(InputValidationError):
+            erlang_b_profile(-1, 5.0)
+        with self.assertRaises(InputValidationError):
+            erlang_c_profile(10, -5.0)
+
+
+class SinglePassSearchTests(unittest.TestCase):
+    def test_agents_required_reference_values(self) -> None:
+        self.assertEqual(agents_required(0.80, 20, 25, 180), 11)
+        self.assertEqual(agents_required(0.80, 20, 100, 180), 35)
+        self.assertEqual(agents_required(0.80, 20, 100, 180, patience=60, max_occupancy=0.85), 36)
+
+    def test_agents_required_zero_volume(self) -> None:
+        self.assertEqual(agents_required(0.80, 20, 0, 180), 1)
+
+    def test_fractional_agents_reference_value(self) -> None:
+        self.assertAlmostEqual(fractional_agents(0.80, 20, 25, 180), 10.285163130544403)
+
+    def test_agents_asa_meets_target(self) -> None:
+        self.assertEqual(agents_asa(20, 25, 180), 11)
+
+    def test_nb_agents_reference_value(self) -> None:
+        self.assertEqual(nb_agents(25, 20, 180), 11)
+
+
+def _decrement_contact_capacity(no_agents: float, sla: float, service_time: int, aht: int, interval: float) -> float:
+    """Varredura de um em um de contact_capacity, mantida como oráculo dos testes."""
+    contacts = int_ceiling(interval / aht) * int(no_agents)
+    while agents_required(sla, service_time, contacts, aht, interval=interval) > int(no_agents) and contacts > 0:
+        contacts -= 1
+    return float(contacts)
+
+
+class ContactCapacitySearchTests(unittest.TestCase):
+    def test_reference_value(self) -> None:
+        self.assertEqual(contact_capacity(11, 0.80, 20, 180), 27.0)
+
+    def test_matches_decrement_scan(self) -> None:
+        for no_agents in (0, 1, 2, 5, 11, 11.7, 30):
+            for sla in (0.0, 0.8, 0.95, 1.0):
+                for aht, interval in ((180, 600), (60, 600), (300, 3600), (900, 600)):
+                    with self.subTest(no_agents=no_agents, sla=sla, aht=aht, interval=interval):
+                        self.assertEqual(
+                            contact_capacity(no_agents, sla, 20, aht, interval=interval),
+                            _decrement_contact_capacity(no_agents, sla, 20, aht, interval),
+                        )
+
+    def test_large_staffing_stays_logarithmic(self) -> None:
+        capacity = contact_capacity(500, 0.80, 20, 180, interval=3600)
+        self.assertLessEqual(agents_required(0.80, 20, capacity, 180, interval=3600), 500)
+        self.assertGreater(agents_required(0.80, 20, capacity + 1, 180, interval=3600), 500)
+
+
+
+def _decrement_fractional_contact_capacity(no_agents: float, sla: float, service_time: int, aht: int, interval: float) -> float:
+    """Varredura de um em um de fractional_contact_capacity, mantida como oráculo dos testes."""
+    contacts = int_ceiling((interval / aht) * no_agents)
+    while fractional_agents(sla, service_time, contacts, aht, interval=interval) > no_agents and contacts > 0:
+        contacts -= 1
+    return float(contacts)
+
+
+class FractionalContactCapacityTests(unittest.TestCase):
+    def test_reference_values(self) -> None:
+        self.assertAlmostEqual(fractional_contact_capacity(11, 0.80, 20, 180), 27.266544550657272, places=6)
+        self.assertEqual(fractional_contact_capacity(11, 0.80, 20, 180, whole_contacts=True), 27.0)
+
+    def test_whole_contacts_matches_decrement_scan(self) -> None:
+        # Inclui casos em que fractional_agents não é monótono no volume
+        # (SLA baixo, AHT curto): a varredura antiga parava nesses mergulhos.
+        for no_agents in (0, 0.5, 0.9, 1.5, 2.5, 3.25, 11, 20.9):
+            for sla in (0.0, 0.5, 0.8, 0.95):
+                for service_time, aht, interval in ((20, 180, 600), (60, 30, 1800), (5, 60, 3600), (30, 900, 600)):
+                    with self.subTest(no_agents=no_agents, sla=sla, aht=aht, interval=interval):
+                        self.assertEqual(
+                            fractional_contact_capacity(
+                                no_agents, sla, service_time, aht, interval=interval, whole_contacts=True
+                            ),
+                            _decrement_fractional_contact_capacity(no_agents, sla, service_time, aht, interval),
+                        )
+
+    def test_fractional_capacity_is_the_staffing_boundary(self) -> None:
+        for no_agents in (2.5, 10.285163130544403, 37.4):
+            with self.subTest(no_agents=no_agents):
+                capacity = fractional_contact_capacity(no_agents, 0.80, 20, 180)
+                whole = fractional_contact_capacity(no_agents, 0.80, 20, 180, whole_contacts=True)
+                self.assertLessEqual(whole, capacity)
+                self.assertLess(capacity, whole + 1)
+                self.assertLessEqual(fractional_agents(0.80, 20, capacity, 180), no_agents)
+                self.assertGreater(fractional_agents(0.80, 20, capacity + 1e-6, 180), no_agents)
+
+
+class ContinuousKernelTests(unittest.TestCase):
+    @staticmethod
+    def _half_server_b(intensity: float) -> float:
+        """Forma fechada de ``B(1/2, A)``: ``Γ(3/2, A) = √π/2 erfc(√A) + √A e^-A``."""
+        return 1 / (math.exp(intensity) * intensity ** -0.5 * (math.sqrt(math.pi) / 2 * math.erfc(math.sqrt(intensity))) + 1)
+
+    def test_matches_closed_form_on_both_branches(self) -> None:
+        # A < 2.5 usa a série de γ; acima, a fração contínua.
+        for intensity in (0.01, 0.5, 1.0, 2.4, 2.6, 10.0, 50.0, 300.0):
+            expected = self._half_server_b(intensity)
+            with self.subTest(intensity=intensity):
+                self.assertAlmostEqual(erlang_b_continuous(0.5, intensity) / expected, 1.0, delta=1e-14)
+                # A recorrência vale para servidores reais.
+                b = erlang_b_continuous(3.5, intensity)
+                self.assertAlmostEqual(b, intensity * erlang_b_continuous(2.5, intensity) / (3.5 + intensity * erlang_b_continuous(2.5, intensity)), delta=1e-15)
+
+    def test_integers_are_bit_identical(self) -> None:
+        for intensity in INTENSITIES:
+            for servers in (1, 2, 7, 30, 130):
+                with self.subTest(servers=servers, intensity=intensity):
+                    self.assertEqual(erlang_b_continuous(servers, intensity), erlang_b(servers, intensity))
+                    self.assertEqual(erlang_c_continuous(servers, intensity), erlang_c(servers, intensity))
+
+    def test_strictly_decreasing_in_servers(self) -> None:
+        for intensity in (0.37, 7.5, 48.2):
+            values = [erlang_b_continuous(step / 50, intensity) for step in range(0, 1500)]
+            with self.subTest(intensity=intensity):
+                self.assertTrue(all(a > b for a, b in zip(values, values[1:])))
+
+    def test_edge_cases(self) -> None:
+        self.assertEqual(erlang_b_continuous(0, 5.0), 1.0)
+        self.assertEqual(erlang_b_continuous(2.5, 0.0), 0.0)
+        self.assertEqual(erlang_b_continuous(-1, 5.0), 0.0)
+        self.assertEqual(erlang_c_continuous(0, 5.0), 1.0)
+        self.assertEqual(erlang_c_continuous(4.5, 7.5), 1.0)
+
+
+class ContinuousStaffingTests(unittest.TestCase):
+    def test_reference_value(self) -> None:
+        self.assertAlmostEqual(fractional_agents(0.80, 20, 25, 180, continuous=True), 10.230664834967683, places=6)
+
+    def test_solves_the_continuous_sla(self) -> None:
+        for contacts, aht, sla in ((25, 180, 0.8), (100, 180, 0.8), (2, 300, 0.95), (3000, 180, 0.8)):
+            with self.subTest(contacts=contacts, aht=aht, sla=sla):
+                agents = fractional_agents(sla, 20, contacts, aht, continuous=True)
+                traffic = contacts * aht / 600
+                achieved = 1 - erlang_c_continuous(agents, traffic) * math.exp((traffic - agents) * 20 / aht)
+                self.assertAlmostEqual(achieved, sla, delta=1e-7)
+                # A resposta cai no mesmo intervalo inteiro da interpolação.
+                self.assertEqual(math.ceil(agents), agents_required(sla, 20, contacts, aht))
+
+    def test_monotone_in_volume(self) -> None:
+        previous = 0.0
+        for contacts in range(1, 300):
+            agents = fractional_agents(0.80, 20, contacts, 180, continuous=True)
+            with self.subTest(contacts=contacts):
+                self.assertGreater(agents, previous)
+            previous = agents
+
+    def test_default_keeps_linear_interpolation(self) -> None:
+        self.assertEqual(fractional_agents(0.80, 20, 25, 180), fractional_agents(0.80, 20, 25, 180, continuous=False))
+        self.assertAlmostEqual(fractional_agents(0.80, 20, 25, 180), 10.285163130544403, places=9)
+
+
+def _next_float(value: float, steps: int) -> float:
+    bits = struct.unpack("<q", struct.pack("<d", value))[0] + steps
+    return struct.unpack("<d", struct.pack("<q", max(bits, 0)))[0]
+
+
+class StaffingTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.table = StaffingTable(120, 0.80, 20, 180)
+
+    def test_identical_to_direct_search_around_every_breakpoint(self) -> None:
+        for objective in ((0.80, 20, 180), (0.90, 30, 300), (0.70, 60, 240), (1.0, 20, 180), (0.0, 20, 180)):
+            table = StaffingTable(60, *objective)
+            sla, service_time, aht = objective
+            for breakpoint in table._breakpoints:
+                for steps in (-1, 0, 1):
+                    contacts = _next_float(breakpoint, steps) * 600 / aht
+                    if contacts / (600 / aht) > table.max_traffic:
+                        continue
+                    with self.subTest(objective=objective, breakpoint=breakpoint, steps=steps):
+                        self.assertEqual(
+                            table.agents_required(contacts), agents_required(sla, service_time, contacts, aht)
+                        )
+
+    def test_identical_to_direct_search_on_random_volumes(self) -> None:
+        generator = random.Random(18)
+        for _ in range(500):
+            contacts = generator.uniform(0, self.table.max_traffic * 600 / 180)
+            max_occupancy = generator.choice((None, 0.85))
+            with self.subTest(contacts=contacts, max_occupancy=max_occupancy):
+                self.assertEqual(
+                    self.table.agents_required(contacts, max_occupancy=max_occupancy),
+                    agents_required(0.80, 20, contacts, 180, max_occupancy=max_occupancy),
+                )
+
+    def test_uncovered_lookups_raise(self) -> None:
+        with self.assertRaises(InputValidationError):
+            self.table.lookup(self.table.max_traffic * 1.01)
+        with self.assertRaises(InputValidationError):
+            self.table.lookup(-1.0)
+        with self.assertRaises(InputValidationError):
+            StaffingTable(0, 0.80, 20, 180)
+        with self.assertRaises(InputValidationError):
+            StaffingTable(10, 0.80, 20, 0)
+
+    def test_save_load_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "table.json")
+            self.table.save(path)
+            loaded = StaffingTable.load(path)
+            self.assertEqual(loaded._breakpoints, self.table._breakpoints)
+            self.assertEqual((loaded.sla, loaded.service_time, loaded.aht, loaded.max_agents), (0.80, 20, 180, 120))
+
+            Path(path).write_text(json.dumps({"format": "other"}), encoding="utf-8")
+            with self.assertRaises(InputValidationError):
+                StaffingTable.load(path)
+
+    def test_load_rejects_malformed_documents(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "table.json")
+            self.table.save(path)
+            valid = json.loads(Path(path).read_text(encoding="utf-8"))
+            documents = [
+                [valid],
+                "table",
+                {key: value for key, value in valid.items() if key != "breakpoints"},
+                {key: value for key, value in valid.items() if key != "sla"},
+                {**valid, "breakpoints": 3},
+                {**valid, "breakpoints": ["x"]},
+                {**valid, "sla": None},
+            ]
+            for document in documents:
+                with self.subTest(document=str(document)[:60]):
+                    Path(path).write_text(json.dumps(document), encoding="utf-8")
+                    with self.assertRaises(InputValidationError):
+                        StaffingTable.load(path)
+
+
+class LargeScaleKernelTests(unittest.TestCase):
+    @staticmethod
+    def _reference_b(servers: int, intensity: float) -> float:
+        """Recorrência exata em Decimal de 50 dígitos."""
+        with localcontext() as context:
+            context.prec = 50
+            traffic = Decimal(repr(intensity))
+            inverse = Decimal(1)
+            for count in range(1, servers + 1):
+                inverse = 1 + inverse * count / traffic
+            return float(1 / inverse)
+
+    def test_matches_high_precision_recurrence(self) -> None:
+        for intensity in (0.37, 7.5, 123.4, 2500.0, 20000.0):
+            root = intensity ** 0.5
+            for servers in {1, int(intensity) // 2, int(intensity), int(intensity + 3 * root) + 1,
+                            int(intensity + 12 * root) + 30, int(2 * intensity) + 40}:
+                if servers < 1:
+                    continue
+                expected = self._reference_b(servers, intensity)
+                if expected == 0.0:
+                    continue
+                with self.subTest(servers=servers, intensity=intensity):
+                    self.assertLess(abs(erlang_b_large(servers, intensity) - expected) / expected, 1e-12)
+
+    def test_agrees_with_exact_kernel(self) -> None:
+        for intensity in INTENSITIES:
+            for servers in range(1, 160, 7):
+                with self.subTest(servers=servers, intensity=intensity):
+                    self.assertAlmostEqual(erlang_b_large(servers, intensity), erlang_b(servers, intensity), delta=1e-13)
+                    self.assertAlmostEqual(erlang_c_large(servers, intensity), erlang_c(servers, intensity), delta=1e-13)
+
+    def test_edge_cases(self) -> None:
+        self.assertEqual(erlang_b_large(0, 5.0), 1.0)
+        self.assertEqual(erlang_b_large(10, 0.0), 0.0)
+        self.assertEqual(erlang_b_large(-1, 5.0), 0.0)
+        self.assertEqual(erlang_b_large(10.9, 8.0), erlang_b_large(10, 8.0))
+        self.assertEqual(erlang_c_large(5, 7.5), 1.0)
+        # Muito acima da moda o resultado vem do ramo em espaço log.
+        self.assertGreater(erlang_b_large(2000, 1000.0), 0.0)
+        self.assertLess(erlang_b_large(2000, 1000.0), 1e-100)
+
+    def test_million_erlangs(self) -> None:
+        intensity = 1e6
+        servers = int(intensity + 3 * intensity ** 0.5)
+        self.assertAlmostEqual(erlang_b_large(servers, intensity) / erlang_b(servers, intensity), 1.0, delta=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
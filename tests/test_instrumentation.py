@@ -0,0 +1,130 @@
+"""Testes da instrumentação opcional de kernels e buscas."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.agents.capacity import agents_required, contact_capacity
+from mod_turbotab.calculations.cache import KernelCache
+from mod_turbotab.calculations.erlang import erlang_a, erlang_b, erlang_b_iter, erlang_c
+from mod_turbotab.calculations.instrumentation import KernelStats, active_stats, timed
+from mod_turbotab.calculations.traffic import traffic
+from mod_turbotab.trunks.trunks import number_trunks
+
+
+class KernelStatsTests(unittest.TestCase):
+    def test_disabled_by_default(self) -> None:
+        self.assertIsNone(active_stats())
+
+    def test_counts_kernel_calls_and_iterations(self) -> None:
+        with KernelStats() as stats:
+            erlang_b(10, 8)
+            erlang_c(20, 15)
+            erlang_a(20, 15, 60, 180)
+        counters = stats.stats()
+
+        self.assertEqual(counters["kernel_calls"]["erlang_b"], 3)
+        self.assertEqual(counters["kernel_calls"]["erlang_c"], 2)
+        self.assertEqual(counters["kernel_calls"]["erlang_a"], 1)
+        self.assertEqual(counters["recurrence_iterations"], 10 + 20 + 20)
+        self.assertGreaterEqual(counters["wall_time"], 0.0)
+
+    def test_iterator_steps_counted_when_search_stops(self) -> None:
+        with KernelStats() as stats:
+            steps = erlang_b_iter(5.0, start=3)
+            for _ in range(4):
+                next(steps)
+            steps.close()
+        counters = stats.stats()
+
+        # Prefixo B(2) por erlang_b, mais os quatro passos gerados.
+        self.assertEqual(counters["kernel_calls"], {"erlang_b": 1, "erlang_b_iter": 1})
+        self.assertEqual(counters["recurrence_iterations"], 2 + 4)
+
+    def test_cache_hits_count_calls_without_iterations(self) -> None:
+        with KernelCache(), KernelStats() as stats:
+            erlang_b(30, 20)
+            erlang_b(30, 20)
+        counters = stats.stats()
+
+        self.assertEqual(counters["kernel_calls"]["erlang_b"], 2)
+        self.assertEqual(counters["recurrence_iterations"], 30)
+
+    def test_search_probes_and_timings(self) -> None:
+        with KernelStats() as stats:
+            required = agents_required(0.80, 20, 25, 180)
+            capacity = contact_capacity(11, 0.80, 20, 180)
+            trunks = number_trunks(11, 7.5)
+            intensity = traffic(10, 0.01)
+        counters = stats.stats()
+
+        self.assertEqual(
+            (required, capacity, trunks, intensity),
+            (agents_required(0.80, 20, 25, 180), contact_capacity(11, 0.80, 20, 180), number_trunks(11, 7.5), traffic(10, 0.01)),
+        )
+        probes = counters["search_probes"]
+        # ⌈A⌉ + 1 = 9 até 11 agentes: três sondas na chamada direta.
+        self.assertGreaterEqual(probes["agents_required"], 3)
+        self.assertEqual(probes["contact_capacity"], 6)
+        self.assertEqual(probes["number_trunks"], trunks - 11 + 1)
+        self.assertGreater(probes["traffic"], 1)
+        # Só a chamada mais externa é cronometrada: as buscas internas de
+        # contact_capacity não aparecem como chamadas de agents_required.
+        self.assertEqual(counters["timings"]["agents_required"]["calls"], 1)
+        self.assertEqual(counters["timings"]["contact_capacity"]["calls"], 1)
+        self.assertEqual(set(counters["timings"]), {"agents_required", "contact_capacity", "number_trunks", "traffic"})
+
+    def test_context_manager_restores_previous_collector(self) -> None:
+        with KernelStats() as outer:
+            with KernelStats() as inner:
+                erlang_b(5, 3)
+                self.assertIs(active_stats(), inner)
+            self.assertIs(active_stats(), outer)
+            erlang_b(5, 3)
+        self.assertIsNone(active_stats())
+        self.assertEqual(inner.stats()["kernel_calls"], {"erlang_b": 1})
+        self.assertEqual(outer.stats()["kernel_calls"], {"erlang_b": 1})
+
+    def test_nested_timing_is_tracked_per_thread(self) -> None:
+        entered = threading.Event()
+        release = threading.Event()
+
+        @timed
+        def slow_request() -> None:
+            entered.set()
+            release.wait(10)
+
+        with KernelStats() as stats:
+            worker = threading.Thread(target=slow_request)
+            worker.start()
+            entered.wait(10)
+            # Outra thread dentro de uma chamada cronometrada não esconde esta.
+            agents_required(0.80, 20, 25, 180)
+            release.set()
+            worker.join()
+        timings = stats.stats()["timings"]
+
+        self.assertEqual(timings["slow_request"]["calls"], 1)
+        self.assertEqual(timings["agents_required"]["calls"], 1)
+
+    def test_clear_resets_counters(self) -> None:
+        with KernelStats() as stats:
+            agents_required(0.80, 20, 25, 180)
+            stats.clear()
+            erlang_b(5, 3)
+        counters = stats.stats()
+
+        self.assertEqual(counters["kernel_calls"], {"erlang_b": 1})
+        self.assertEqual(counters["search_probes"], {})
+        self.assertEqual(counters["timings"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import random
 import sys
 import unittest
 from pathlib import Path
@@ -10,7 +11,7 @@ from pathlib import Path
 # (package-dir mapeia o pacote para a raiz do repo).
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from mod_turbotab.calculations.multi_skill import agents_required_multi
+from mod_turbotab.calculations.multi_skill import MultiSkillPlanner, _allocate_pools, agents_required_multi
 from mod_turbotab.exceptions import InputValidationError
 
 GROUPS = [
@@ -134,6 +135,212 @@ class SharingTests(unittest.TestCase):
         self.assertTrue(result["totals"]["fits_in_pool_capacity"])
 
 
+def reference_max_flow(per_skill, pools):
+    """Edmonds-Karp ingênuo (a implementação anterior), usado como oráculo."""
+    sink = ("sink",)
+    capacity = {}
+
+    def add(u, v, cap):
+        capacity.setdefault(u, {})[v] = capacity.get(u, {}).get(v, 0) + cap
+        capacity.setdefault(v, {}).setdefault(u, 0)
+
+    for i, pool in enumerate(pools):
+        add("source", i, pool["count"])
+        for sk in pool["skills"]:
+            add(i, sk, pool["count"])
+    for s in per_skill:
+        add(s["name"], sink, s["adjusted_hc"])
+    flow = 0
+    while True:
+        parent = {"source": None}
+        queue = ["source"]
+        while queue and sink not in parent:
+            u = queue.pop(0)
+            for v, cap in capacity.get(u, {}).items():
+                if cap > 0 and v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        if sink not in parent:
+            return flow
+        path = []
+        v = sink
+        while parent[v] is not None:
+            path.append((parent[v], v))
+            v = parent[v]
+        bottleneck = min(capacity[u][v] for u, v in path)
+        for u, v in path:
+            capacity[u][v] -= bottleneck
+            capacity[v][u] += bottleneck
+        flow += bottleneck
+
+
+def random_instance(rng, skills, pools):
+    per_skill = [{"name": f"s{i}", "adjusted_hc": rng.randint(0, 30)} for i in range(skills)]
+    agent_pools = [
+        {"skills": rng.sample([s["name"] for s in per_skill], rng.randint(1, min(4, skills))), "count": rng.randint(0, 15)}
+        for _ in range(pools)
+    ]
+    return per_skill, agent_pools
+
+
+def check_allocation(test, per_skill, pools, allocation):
+    """Confere a alocação contra pools e demandas; retorna o total alocado."""
+    test.assertEqual(len(allocation), len(pools))
+    received = {s["name"]: 0 for s in per_skill}
+    for pool, entry in zip(pools, allocation):
+        test.assertEqual(set(entry["assigned"]), set(pool["skills"]))
+        test.assertTrue(all(n >= 0 for n in entry["assigned"].values()))
+        test.assertEqual(sum(entry["assigned"].values()) + entry["idle"], pool["count"])
+        test.assertGreaterEqual(entry["idle"], 0)
+        for sk, n in entry["assigned"].items():
+            received[sk] += n
+    for s in per_skill:
+        test.assertLessEqual(received[s["name"]], s["adjusted_hc"])
+    return sum(received.values())
+
+
+class AllocationTests(unittest.TestCase):
+    def assert_valid_allocation(self, per_skill, pools, flow, allocation) -> None:
+        self.assertEqual(check_allocation(self, per_skill, pools, allocation), flow)
+
+    def test_allocation_covers_requirement_when_it_fits(self) -> None:
+        result = run()
+        self.assertTrue(result["totals"]["fits_in_pool_capacity"])
+        by_skill = {s["name"]: 0 for s in result["per_skill"]}
+        for entry in result["allocation"]:
+            for sk, n in entry["assigned"].items():
+                by_skill[sk] += n
+        self.assertEqual(by_skill, {s["name"]: s["adjusted_hc"] for s in result["per_skill"]})
+        self.assertEqual(
+            sum(e["idle"] for e in result["allocation"]),
+            result["totals"]["pool_capacity_hc"] - result["totals"]["adjusted_total_hc"],
+        )
+
+    def test_partial_allocation_when_shared_pool_is_short(self) -> None:
+        per_skill = [{"name": "a", "adjusted_hc": 10}, {"name": "b", "adjusted_hc": 10}]
+        pools = [{"skills": ["a", "b"], "count": 10}]
+        flow, allocation = _allocate_pools(per_skill, pools)
+        self.assertEqual(flow, 10)
+        self.assertEqual(allocation[0]["idle"], 0)
+        self.assert_valid_allocation(per_skill, pools, flow, allocation)
+
+    def test_matches_reference_max_flow_on_random_instances(self) -> None:
+        rng = random.Random(23)
+        for _ in range(200):
+            per_skill, pools = random_instance(rng, rng.randint(1, 8), rng.randint(1, 12))
+            flow, allocation = _allocate_pools(per_skill, pools)
+            self.assertEqual(flow, reference_max_flow(per_skill, pools))
+            self.assert_valid_allocation(per_skill, pools, flow, allocation)
+
+    def test_thousands_of_pools(self) -> None:
+        # Escala do pedido: 1.800 pools (combinações distintas) e 120 skills.
+        per_skill, pools = random_instance(random.Random(1800), 120, 1800)
+        for s in per_skill:
+            s["adjusted_hc"] = s["adjusted_hc"] * 20
+        flow, allocation = _allocate_pools(per_skill, pools)
+        self.assert_valid_allocation(per_skill, pools, flow, allocation)
+        # Fluxo máximo do Edmonds-Karp de referência nesta instância (lento
+        # demais para rodar aqui; o tempo fica no caso multi_skill.allocation
+        # de benchmarks/).
+        self.assertEqual(flow, 12639)
+
+
+class PlannerTests(unittest.TestCase):
+    def assert_matches_fresh_solve(self, planner, groups) -> None:
+        current = planner.result()
+        pools = [{"skills": e["skills"], "count": e["count"]} for e in current["allocation"]]
+        fresh = run(groups, pools)
+        self.assertEqual(current["per_skill"], fresh["per_skill"])
+        self.assertEqual(current["totals"], fresh["totals"])
+        self.assertEqual(planner.fits, fresh["totals"]["fits_in_pool_capacity"])
+        allocated = check_allocation(self, current["per_skill"], pools, current["allocation"])
+        # O valor do fluxo máximo é único, mesmo quando a alocação não é.
+        self.assertEqual(allocated, sum(sum(e["assigned"].values()) for e in fresh["allocation"]))
+
+    def planner(self, groups=GROUPS, pools=POOLS_CROSS) -> MultiSkillPlanner:
+        return MultiSkillPlanner(groups, pools, sla=0.80, service_time=20)
+
+    def test_initial_state_matches_agents_required_multi(self) -> None:
+        planner = self.planner()
+        self.assertEqual(planner.result(), run())
+        self.assertTrue(planner.fits)
+
+    def test_pool_count_what_if(self) -> None:
+        planner = self.planner()
+        # Sem o pool compartilhado, as skills perdem o sharing factor (11 + 11)
+        # e os dedicados (8 + 9) não bastam.
+        self.assertFalse(planner.set_pool_count(2, 0))
+        self.assertEqual([s["adjusted_hc"] for s in planner.result()["per_skill"]], [11, 11])
+        self.assert_matches_fresh_solve(planner, GROUPS)
+        self.assertTrue(planner.set_pool_count(2, 6))
+        self.assertEqual(planner.result()["totals"], run()["totals"])
+
+    def test_shrinking_a_pool_reroutes_through_shared_pool(self) -> None:
+        planner = self.planner()
+        self.assertTrue(planner.set_pool_count(0, 7))
+        allocation = planner.result()["allocation"]
+        self.assertEqual(allocation[0]["assigned"], {"billing": 7})
+        self.assertEqual(allocation[2]["assigned"]["billing"], 3)
+        self.assertFalse(planner.set_pool_count(0, 4))
+
+    def test_skill_volume_and_edges(self) -> None:
+        groups = [dict(g) for g in GROUPS]
+        planner = self.planner(groups)
+        self.assertFalse(planner.set_skill_volume("tech", 40))
+        groups[1]["contacts_per_interval"] = 40
+        self.assert_matches_fresh_solve(planner, groups)
+
+        self.assertFalse(planner.remove_pool_skill(2, "billing"))
+        self.assert_matches_fresh_solve(planner, groups)
+        planner.add_pool_skill(0, "tech")
+        self.assert_matches_fresh_solve(planner, groups)
+        index = planner.add_pool(["tech"], 12)
+        self.assertEqual(index, 3)
+        self.assert_matches_fresh_solve(planner, groups)
+
+    def test_random_what_if_sessions_match_fresh_solves(self) -> None:
+        rng = random.Random(24)
+        names = [f"s{i}" for i in range(6)]
+        for _ in range(15):
+            groups = [{"name": n, "contacts_per_interval": rng.randint(0, 40), "aht": rng.choice([120, 180, 300])} for n in names]
+            pools = [{"skills": rng.sample(names, rng.randint(1, 3)), "count": rng.randint(0, 12)} for _ in range(8)]
+            planner = self.planner(groups, pools)
+            for _ in range(25):
+                op = rng.randrange(4)
+                pool = rng.randrange(len(planner.result()["allocation"]))
+                skills = planner.result()["allocation"][pool]["skills"]
+                if op == 0:
+                    planner.set_pool_count(pool, rng.randint(0, 12))
+                elif op == 1:
+                    name = rng.choice(names)
+                    volume = rng.randint(0, 40)
+                    planner.set_skill_volume(name, volume)
+                    next(g for g in groups if g["name"] == name)["contacts_per_interval"] = volume
+                elif op == 2 and len(skills) < len(names):
+                    planner.add_pool_skill(pool, rng.choice([n for n in names if n not in skills]))
+                elif op == 3 and len(skills) > 1:
+                    planner.remove_pool_skill(pool, rng.choice(skills))
+                self.assert_matches_fresh_solve(planner, groups)
+
+    def test_invalid_changes_rejected(self) -> None:
+        planner = self.planner()
+        with self.assertRaises(InputValidationError):
+            planner.set_pool_count(3, 1)
+        with self.assertRaises(InputValidationError):
+            planner.set_pool_count(0, -1)
+        with self.assertRaises(InputValidationError):
+            planner.set_skill_volume("sales", 10)
+        with self.assertRaises(InputValidationError):
+            planner.add_pool_skill(2, "tech")
+        with self.assertRaises(InputValidationError):
+            planner.remove_pool_skill(0, "billing")
+        with self.assertRaises(InputValidationError):
+            planner.add_pool(["sales"], 3)
+        with self.assertRaises(InputValidationError):
+            MultiSkillPlanner(GROUPS, [], sla=0.80, service_time=20)
+        self.assertEqual(planner.result(), run())
+
+
 class ValidationTests(unittest.TestCase):
     def test_invalid_sharing_factor(self) -> None:
         for bad in (0, -0.5, 1.5):
@@ -0,0 +1,112 @@
+"""Testes do planejamento intradiário (cadeia de headcount por intervalo)."""
+
+from __future__ import annotations
+
+import math
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.agents import planning
+from mod_turbotab.agents.capacity import agents_required
+from mod_turbotab.agents.planning import iter_plan_intraday, plan_intraday
+from mod_turbotab.agents.roster import rostered_agents
+from mod_turbotab.agents.shrinkage import agents_required_with_shrinkage
+from mod_turbotab.exceptions import InputValidationError
+
+
+def _day(peak: float, intervals: int = 96) -> list[float]:
+    return [round(peak * (0.1 + math.sin(i / intervals * math.pi) ** 2), 1) for i in range(intervals)]
+
+
+class PlanIntradayTests(unittest.TestCase):
+    def test_matches_per_interval_chain(self) -> None:
+        contacts = _day(120.0)
+        ahts = [180 if i % 3 else 240 for i in range(len(contacts))]
+        for patience, max_occupancy in ((None, None), (90, None), (None, 0.85)):
+            plan = plan_intraday(
+                contacts, ahts, 0.80, 20, shrinkage=0.3, shifts=1.5, patience=patience, max_occupancy=max_occupancy
+            )
+            for index, (volume, aht, row) in enumerate(zip(contacts, ahts, plan["intervals"])):
+                with self.subTest(patience=patience, max_occupancy=max_occupancy, interval=index):
+                    expected = agents_required_with_shrinkage(
+                        0.80, 20, volume, aht, 0.3, patience=patience, max_occupancy=max_occupancy
+                    )
+                    self.assertEqual(row["scheduled_agents"], expected)
+                    self.assertEqual(row["rostered_agents"], rostered_agents(expected, 1.5))
+
+    def test_warm_start_matches_cold_search_across_scales(self) -> None:
+        for peak in (3.0, 40.0, 900.0):
+            for sla in (0.5, 0.9, 0.99, 1.0):
+                contacts = _day(peak, intervals=48)
+                plan = plan_intraday(contacts, 210, sla, 15)
+                with self.subTest(peak=peak, sla=sla):
+                    self.assertEqual(
+                        [row["productive_agents"] for row in plan["intervals"]],
+                        [agents_required(sla, 15, volume, 210) for volume in contacts],
+                    )
+
+    def test_repeated_intervals_reuse_the_search(self) -> None:
+        with mock.patch.object(planning, "_first_agents_meeting", wraps=planning._first_agents_meeting) as search:
+            plan = plan_intraday([25, 25, 0, 0, 25, 40], 180, 0.80, 20)
+        self.assertEqual(search.call_count, 3)
+        self.assertEqual([row["productive_agents"] for row in plan["intervals"]], [11, 11, 1, 1, 11, 16])
+
+    def test_reuse_is_bounded_to_recent_intervals(self) -> None:
+        with mock.patch.object(planning, "_SOLVED_MAX_ENTRIES", 2), mock.patch.object(
+            planning, "_first_agents_meeting", wraps=planning._first_agents_meeting
+        ) as search:
+            rows = list(iter_plan_intraday([(25, 180), (30, 180), (25, 180), (35, 180), (30, 180)], 0.80, 20))
+        # 25 é reusado; 30 sai do LRU quando 35 entra e é recalculado.
+        self.assertEqual(search.call_count, 4)
+        self.assertEqual(rows[4]["productive_agents"], rows[1]["productive_agents"])
+
+    def test_totals(self) -> None:
+        plan = plan_intraday([25, 40], [180, 180], 0.80, 20, shrinkage=0.3)
+        self.assertEqual(
+            plan["totals"],
+            {"contacts_per_interval": 65, "productive_agents": 27, "scheduled_agents": 39},
+        )
+        self.assertNotIn("rostered_agents", plan["intervals"][0])
+
+    def test_iter_plan_is_lazy_and_matches_plan(self) -> None:
+        contacts = _day(60.0, intervals=24)
+        consumed: list[int] = []
+
+        def intervals():
+            for index, volume in enumerate(contacts):
+                consumed.append(index)
+                yield volume, 180
+
+        rows = iter_plan_intraday(intervals(), 0.80, 20, shrinkage=0.3)
+        self.assertEqual(consumed, [])
+        first = next(rows)
+        self.assertEqual(consumed, [0])
+        self.assertEqual([first, *rows], plan_intraday(contacts, 180, 0.80, 20, shrinkage=0.3)["intervals"])
+
+    def test_iter_plan_reports_the_bad_interval(self) -> None:
+        rows = iter_plan_intraday([(25, 180), (-1, 180)], 0.80, 20)
+        next(rows)
+        with self.assertRaisesRegex(InputValidationError, "interval 1"):
+            next(rows)
+
+    def test_invalid_parameters_raise(self) -> None:
+        for args, kwargs in (
+            (([25, 40], [180]), {}),
+            (([25, -1], 180), {}),
+            (([25], [0]), {}),
+            (([25], 180), {"shrinkage": 1.0}),
+            (([25], 180), {"max_occupancy": 0.0}),
+        ):
+            with self.subTest(args=args, kwargs=kwargs):
+                with self.assertRaises(InputValidationError):
+                    plan_intraday(*args, 0.80, 20, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
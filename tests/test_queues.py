@@ -0,0 +1,81 @@
+"""Testes do snapshot de métricas de fila."""
+
+from __future__ import annotations
+
+import itertools
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.agents.capacity import asa, occupancy
+from mod_turbotab.exceptions import CalculationError, InputValidationError
+from mod_turbotab.queues import queues
+from mod_turbotab.queues.queues import queue_size, queue_snapshot, queue_time, queued, service_time, sla_metric
+
+SERVICE_TIMES = (0, 10, 20, 60)
+
+
+def _or_none(func, *args):
+    try:
+        return func(*args)
+    except CalculationError:
+        return None
+
+
+class QueueSnapshotTests(unittest.TestCase):
+    def test_matches_individual_metrics(self) -> None:
+        scenarios = itertools.product((1, 3, 7.5, 11, 40), (0, 5, 25, 140), (30, 180, 600), (None, 45, 300))
+        for agents, contacts, aht, patience in scenarios:
+            snapshot = queue_snapshot(agents, contacts, aht, patience=patience, service_times=SERVICE_TIMES, sla=0.8)
+            with self.subTest(agents=agents, contacts=contacts, aht=aht, patience=patience):
+                self.assertEqual(snapshot["queued"], queued(agents, contacts, aht, 600.0, patience))
+                self.assertEqual(snapshot["asa"], asa(agents, contacts, aht, 600.0, patience))
+                self.assertEqual(snapshot["queue_size"], queue_size(agents, contacts, aht, 600.0, patience))
+                self.assertEqual(snapshot["queue_time"], queue_time(agents, contacts, aht, 600.0, patience))
+                self.assertEqual(snapshot["occupancy"], occupancy(agents, contacts, aht))
+                # service_time levanta erro em sobrecarga; o snapshot devolve None.
+                self.assertEqual(snapshot["service_time"], _or_none(service_time, agents, 0.8, contacts, aht, 600.0, patience))
+                for target in SERVICE_TIMES:
+                    self.assertEqual(snapshot["sla"][target], sla_metric(agents, target, contacts, aht, 600.0, patience))
+
+    def test_evaluates_the_kernel_once(self) -> None:
+        with mock.patch.object(queues, "erlang_c", wraps=queues.erlang_c) as kernel:
+            queue_snapshot(11, 25, 180, service_times=(20, 30, 60), sla=0.8)
+        self.assertEqual(kernel.call_count, 1)
+        with mock.patch.object(queues, "erlang_a", wraps=queues.erlang_a) as kernel:
+            snapshot = queue_snapshot(11, 25, 180, patience=120, service_times=(20, 30), sla=0.8)
+        self.assertEqual(kernel.call_count, 1)
+        self.assertGreater(snapshot["abandon_rate"], 0.0)
+
+    def test_sla_keys_keep_integral_targets_whole(self) -> None:
+        snapshot = queue_snapshot(11, 25, 180, service_times=(20.0, 30, 12.5))
+        self.assertEqual([type(key) for key in snapshot["sla"]], [int, int, float])
+        self.assertEqual(list(snapshot["sla"]), [20, 30, 12.5])
+
+    def test_optional_fields(self) -> None:
+        snapshot = queue_snapshot(11, 25, 180)
+        self.assertEqual(snapshot["sla"], {})
+        self.assertNotIn("service_time", snapshot)
+        self.assertEqual(snapshot["abandon_rate"], 0.0)
+        self.assertEqual(snapshot["traffic_intensity"], 7.5)
+
+    def test_invalid_parameters_raise(self) -> None:
+        for args, kwargs in (
+            ((0, 25, 180), {}),
+            ((11, -1, 180), {}),
+            ((11, 25, 0), {}),
+            ((11, 25, 180), {"service_times": (-5,)}),
+            ((11, 25, 180), {"sla": -0.1}),
+        ):
+            with self.subTest(args=args, kwargs=kwargs):
+                with self.assertRaises(InputValidationError):
+                    queue_snapshot(*args, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Testes da simulação Monte Carlo multi-skill (Opção B)."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.calculations.erlang import erlang_c
+from mod_turbotab.exceptions import InputValidationError
+from mod_turbotab.queues.queues import sla_metric
+from mod_turbotab.simulation.multi_skill import _t_quantile, simulate_multi_skill
+
+GROUPS = [
+    {"name": "billing", "contacts_per_interval": 25, "aht": 180},
+    {"name": "tech", "contacts_per_interval": 20, "aht": 240},
+]
+POOLS_CROSS = [
+    {"skills": ["billing"], "count": 8},
+    {"skills": ["tech"], "count": 9},
+    {"skills": ["billing", "tech"], "count": 6},
+]
+
+
+def within(estimate, value) -> bool:
+    return estimate["ci_low"] <= value <= estimate["ci_high"]
+
+
+class ErlangCLimitTests(unittest.TestCase):
+    def test_single_skill_matches_erlang_c(self) -> None:
+        for agents, contacts, aht in ((11, 25, 180), (5, 12, 200)):
+            with self.subTest(agents=agents, contacts=contacts):
+                traffic = contacts * aht / 600
+                result = simulate_multi_skill(
+                    [{"name": "a", "contacts_per_interval": contacts, "aht": aht}],
+                    [{"skills": ["a"], "count": agents}],
+                    service_time=20,
+                    intervals=100,
+                    replications=10,
+                )
+                skill = result["per_skill"][0]
+                self.assertTrue(within(skill["service_level"], sla_metric(agents, 20, contacts, aht)))
+                self.assertTrue(within(skill["asa"], erlang_c(agents, traffic) * aht / (agents - traffic)))
+                self.assertTrue(within(result["per_pool"][0]["occupancy"], traffic / agents))
+                self.assertEqual(skill["abandon_rate"]["mean"], 0.0)
+
+    def test_patience_causes_abandonment(self) -> None:
+        groups = [{"name": "a", "contacts_per_interval": 40, "aht": 180}]
+        pools = [{"skills": ["a"], "count": 12}]
+        patient = simulate_multi_skill(groups, pools, service_time=20, replications=5)
+        impatient = simulate_multi_skill(groups, pools, service_time=20, patience=30, replications=5)
+        self.assertGreater(impatient["per_skill"][0]["abandon_rate"]["mean"], 0.05)
+        self.assertLess(impatient["per_skill"][0]["asa"]["mean"], patient["per_skill"][0]["asa"]["mean"])
+
+
+class MultiSkillTests(unittest.TestCase):
+    def test_cross_pool_serves_both_skills(self) -> None:
+        result = simulate_multi_skill(GROUPS, POOLS_CROSS, service_time=20, replications=5)
+        dedicated = simulate_multi_skill(GROUPS, POOLS_CROSS[:2], service_time=20, replications=5)
+        for shared, alone in zip(result["per_skill"], dedicated["per_skill"]):
+            self.assertGreater(shared["service_level"]["mean"], alone["service_level"]["mean"])
+        self.assertGreater(result["per_pool"][2]["occupancy"]["mean"], 0.0)
+        self.assertEqual(result["per_pool"][2]["skills"], ["billing", "tech"])
+
+    def test_priority_routes_shared_agents(self) -> None:
+        groups = [
+            {"name": "vip", "contacts_per_interval": 20, "aht": 180, "priority": 0},
+            {"name": "regular", "contacts_per_interval": 20, "aht": 180, "priority": 1},
+        ]
+        pools = [{"skills": ["vip", "regular"], "count": 13}]
+        result = simulate_multi_skill(groups, pools, service_time=20, replications=5)
+        vip, regular = result["per_skill"]
+        self.assertGreater(vip["service_level"]["mean"], regular["service_level"]["mean"])
+        self.assertLess(vip["asa"]["mean"], regular["asa"]["mean"])
+
+    def test_seeded_and_independent_of_workers(self) -> None:
+        kwargs = dict(service_time=20, intervals=2, replications=4, seed=7)
+        serial = simulate_multi_skill(GROUPS, POOLS_CROSS, **kwargs)
+        self.assertEqual(simulate_multi_skill(GROUPS, POOLS_CROSS, **kwargs), serial)
+        self.assertEqual(simulate_multi_skill(GROUPS, POOLS_CROSS, workers=2, **kwargs), serial)
+        self.assertNotEqual(simulate_multi_skill(GROUPS, POOLS_CROSS, **{**kwargs, "seed": 8}), serial)
+
+    def test_zero_volume_skill_has_no_estimates(self) -> None:
+        groups = GROUPS + [{"name": "idle", "contacts_per_interval": 0, "aht": 100}]
+        pools = POOLS_CROSS + [{"skills": ["idle"], "count": 0}]
+        result = simulate_multi_skill(groups, pools, service_time=20, intervals=2, replications=3)
+        self.assertEqual(result["per_skill"][2]["contacts"], 0)
+        self.assertEqual(result["per_skill"][2]["service_level"], {"mean": None, "ci_low": None, "ci_high": None})
+        self.assertIsNone(result["per_pool"][3]["occupancy"]["mean"])
+
+
+class StatisticsTests(unittest.TestCase):
+    def test_t_quantiles(self) -> None:
+        for df, expected in ((1, 12.7062), (2, 4.3027), (4, 2.7764), (9, 2.2622), (29, 2.0452)):
+            self.assertAlmostEqual(_t_quantile(0.975, df), expected, places=4)
+        self.assertAlmostEqual(_t_quantile(0.95, 5), 2.0150, places=4)
+
+
+class ValidationTests(unittest.TestCase):
+    def test_invalid_inputs(self) -> None:
+        cases = [
+            dict(service_time=-1),
+            dict(service_time=20, patience=0),
+            dict(service_time=20, intervals=0),
+            dict(service_time=20, replications=1),
+            dict(service_time=20, workers=-1),
+            dict(service_time=20, confidence=1.0),
+        ]
+        for kwargs in cases:
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(InputValidationError):
+                    simulate_multi_skill(GROUPS, POOLS_CROSS, **kwargs)
+        with self.assertRaises(InputValidationError):
+            simulate_multi_skill(GROUPS, [{"skills": ["sales"], "count": 1}], service_time=20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Testes de regressão da inversão de Erlang B (intensidade de tráfego)."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.calculations import traffic as traffic_module
+from mod_turbotab.calculations.erlang import erlang_b
+from mod_turbotab.calculations.instrumentation import KernelStats
+from mod_turbotab.calculations.traffic import TrafficTable, traffic
+from mod_turbotab.exceptions import InputValidationError
+
+
+class TrafficInversionTests(unittest.TestCase):
+    def test_inverts_erlang_b(self) -> None:
+        for servers in (1, 2, 10, 30, 100, 500):
+            for blocking in (0.001, 0.01, 0.05, 0.2, 0.9):
+                with self.subTest(servers=servers, blocking=blocking):
+                    intensity = traffic(servers, blocking)
+                    self.assertAlmostEqual(erlang_b(servers, intensity), blocking, places=10)
+
+    def test_single_server_closed_form(self) -> None:
+        # B(1, A) = A / (1 + A)  =>  A = b / (1 - b).
+        self.assertAlmostEqual(traffic(1, 0.05), 0.05 / 0.95, places=12)
+
+    def test_loose_tolerance_still_within_bound(self) -> None:
+        exact = traffic(30, 0.01)
+        self.assertAlmostEqual(traffic(30, 0.01, tolerance=1e-3), exact, delta=1e-3)
+
+    def test_converges_in_few_kernel_evaluations(self) -> None:
+        calls = []
+        original = traffic_module.erlang_b
+
+        def counting(servers: float, intensity: float) -> float:
+            calls.append(intensity)
+            return original(servers, intensity)
+
+        traffic_module.erlang_b = counting
+        try:
+            traffic(100, 0.01)
+        finally:
+            traffic_module.erlang_b = original
+        self.assertLess(len(calls), 20)
+
+    def test_degenerate_inputs(self) -> None:
+        self.assertEqual(traffic(0, 0.01), 0.0)
+        self.assertEqual(traffic(10, 0), 0.0)
+        self.assertEqual(traffic(10, -0.1), 0.0)
+
+    def test_invalid_inputs_raise(self) -> None:
+        with self.assertRaises(InputValidationError):
+            traffic(10, 1.0)
+        with self.assertRaises(InputValidationError):
+            traffic(10, 0.01, tolerance=0)
+
+
+class TrafficTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.table = TrafficTable(60, blockings=(0.01, 0.05))
+
+    def test_matches_direct_inversion(self) -> None:
+        for servers in (1, 2, 10, 37, 60):
+            for blocking in (0.01, 0.05):
+                with self.subTest(servers=servers, blocking=blocking):
+                    self.assertAlmostEqual(
+                        self.table.lookup(servers, blocking), traffic(servers, blocking), delta=1e-8
+                    )
+
+    def test_build_needs_a_few_kernel_calls_per_entry(self) -> None:
+        with KernelStats() as stats:
+            table = TrafficTable(400, blockings=(0.01,))
+        # Newton aquecido pelo incremento anterior: sem bisseção até a tolerância.
+        self.assertLess(stats.stats()["search_probes"]["traffic"], 5 * 400)
+        for servers in (100, 250, 400):
+            self.assertAlmostEqual(table.lookup(servers, 0.01), traffic(servers, 0.01), delta=1e-8)
+
+    def test_fractional_servers_interpolate(self) -> None:
+        low = self.table.lookup(10, 0.01)
+        high = self.table.lookup(11, 0.01)
+        self.assertAlmostEqual(self.table.lookup(10.25, 0.01), low + 0.25 * (high - low), places=12)
+        self.assertEqual(self.table.lookup(0, 0.01), 0.0)
+
+    def test_uncovered_lookups_raise(self) -> None:
+        with self.assertRaises(InputValidationError):
+            self.table.lookup(10, 0.02)
+        with self.assertRaises(InputValidationError):
+            self.table.lookup(61, 0.01)
+        with self.assertRaises(InputValidationError):
+            self.table.lookup(-1, 0.01)
+
+    def test_invalid_construction_raises(self) -> None:
+        with self.assertRaises(InputValidationError):
+            TrafficTable(0)
+        with self.assertRaises(InputValidationError):
+            TrafficTable(10, blockings=(0.01, 1.0))
+        with self.assertRaises(InputValidationError):
+            TrafficTable(10, blockings=())
+
+    def test_save_load_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "table.json")
+            self.table.save(path)
+            loaded = TrafficTable.load(path)
+            self.assertEqual(loaded.blockings, self.table.blockings)
+            self.assertEqual(loaded.max_servers, 60)
+            self.assertEqual(loaded.lookup(37.5, 0.05), self.table.lookup(37.5, 0.05))
+
+            Path(path).write_text(json.dumps({"format": "other"}), encoding="utf-8")
+            with self.assertRaises(InputValidationError):
+                TrafficTable.load(path)
+
+    def test_load_rejects_malformed_documents(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "table.json")
+            self.table.save(path)
+            valid = json.loads(Path(path).read_text(encoding="utf-8"))
+            level = next(iter(valid["levels"].values()))
+            documents = [
+                [valid],
+                42,
+                {key: value for key, value in valid.items() if key != "levels"},
+                {key: value for key, value in valid.items() if key != "max_servers"},
+                {**valid, "levels": [level]},
+                {**valid, "levels": {"high": level}},
+                {**valid, "levels": {"0.01": 7}},
+                {**valid, "tolerance": "tight"},
+            ]
+            for document in documents:
+                with self.subTest(document=str(document)[:60]):
+                    Path(path).write_text(json.dumps(document), encoding="utf-8")
+                    with self.assertRaises(InputValidationError):
+                        TrafficTable.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Testes de regressão do dimensionamento de trunks."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+# O pacote mod_turbotab resolve a partir do diretório pai do repo
+# (package-dir mapeia o pacote para a raiz do repo).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mod_turbotab.calculations.erlang import erlang_b
+from mod_turbotab.exceptions import InputValidationError
+from mod_turbotab.trunks.trunks import number_trunks, trunks_required
+
+
+class NumberTrunksTests(unittest.TestCase):
+    def test_default_grade_of_service(self) -> None:
+        self.assertEqual(number_trunks(11, 8.9), 20)
+        self.assertEqual(trunks_required(11, 25, 180), 18)
+
+    def test_first_count_below_grade_of_service(self) -> None:
+        for blocking in (0.001, 0.01, 0.05):
+            n = number_trunks(1, 30.0, blocking=blocking)
+            self.assertLess(erlang_b(n, 30.0), blocking)
+            self.assertGreaterEqual(erlang_b(n - 1, 30.0), blocking)
+
+    def test_looser_grade_of_service_needs_fewer_trunks(self) -> None:
+        self.assertEqual(number_trunks(11, 8.9, blocking=0.01), 17)
+        self.assertEqual(trunks_required(11, 25, 180, blocking=0.02), 14)
+
+    def test_servers_floor_is_respected(self) -> None:
+        self.assertEqual(number_trunks(40, 8.9), 40)
+
+    def test_zero_servers(self) -> None:
+        self.assertEqual(number_trunks(0, 5.0), 14)
+
+    def test_large_traffic_is_linear(self) -> None:
+        # A cada candidato o kernel antigo refazia a recorrência inteira;
+        # com milhares de erlangs isso levava segundos.
+        n = number_trunks(1, 5000.0)
+        self.assertEqual(n, 5133)
+
+    def test_invalid_grade_of_service_raises(self) -> None:
+        for bad in (0, 1, -0.1, 1.5, float("nan")):
+            with self.subTest(blocking=bad):
+                with self.assertRaises(InputValidationError):
+                    number_trunks(11, 8.9, blocking=bad)
+                with self.assertRaises(InputValidationError):
+                    trunks_required(11, 25, 180, blocking=bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,38 +6,58 @@ tratamento de exceções personalizado e tipagem completa.
 """
 
 from mod_turbotab.utils import int_ceiling, secs
-from mod_turbotab.calculations.erlang import erlang_b, erlang_c
+from mod_turbotab.calculations import instrumentation as _kernel_stats
+from mod_turbotab.calculations.erlang import erlang_b_iter, erlang_c
+from mod_turbotab.calculations.instrumentation import timed
 from mod_turbotab.exceptions import CalculationError, InputValidationError
 
-def number_trunks(servers: float, intensity: float) -> int:
+# Grau de serviço (probabilidade de bloqueio) padrão do dimensionamento de trunks.
+DEFAULT_BLOCKING: float = 0.001
+
+@timed
+def number_trunks(servers: float, intensity: float, blocking: float = DEFAULT_BLOCKING) -> int:
     """Determina o número máximo de trunks requeridos para atender chamadas enfileiradas e atendidas.
 
     Args:
         servers (float): Número de agentes/servidores.
         intensity (float): Taxa de tráfego (em erlangs).
+        blocking (float, optional): Grau de serviço (GoS) — probabilidade de
+            bloqueio máxima aceita, em (0, 1). Padrão: 0.001.
 
     Returns:
         int: Número de trunks necessários.
 
     Raises:
-        InputValidationError: Se os parâmetros forem negativos.
+        InputValidationError: Se os parâmetros forem negativos ou o GoS estiver fora de (0, 1).
         CalculationError: Se não for possível determinar um valor adequado dentro dos limites.
     """
     if servers < 0 or intensity < 0:
         raise InputValidationError("The 'servers' and 'intensity' values must be non-negative.")
-    
+    if not (0 < blocking < 1):
+        raise InputValidationError("The 'blocking' value must be in the range (0, 1).")
+
     max_iterate: int = 65535
     try:
         start: int = int_ceiling(servers)
-        for count in range(start, max_iterate + 1):
-            b: float = erlang_b(float(count), intensity)
-            if b < 0.001:
+        # Uma única recorrência, estendida um trunk por vez até B < GoS:
+        # tempo linear no número de trunks, em vez de uma recorrência fria
+        # (quadrática) por candidato. B(0) = 1 nunca atende o GoS, então
+        # começar em 1 não muda o resultado.
+        first: int = max(start, 1)
+        recorder = _kernel_stats._active
+        for count, b in erlang_b_iter(intensity, start=first):
+            if count > max_iterate:
+                break
+            if b < blocking:
+                if recorder is not None:
+                    recorder.probe('number_trunks', count - first + 1)
                 return count
         raise CalculationError("Could not determine an adequate number of trunks within the maximum limit.")
     except Exception as e:
         raise CalculationError(f"Error calculating the number of trunks: {str(e)}") from e
 
-def trunks_required(agents: float, contacts_per_interval: float, aht: int, interval: float = 600.0) -> int:
+@timed
+def trunks_required(agents: float, contacts_per_interval: float, aht: int, interval: float = 600.0, blocking: float = DEFAULT_BLOCKING) -> int:
     """Calcula o número de trunks necessários para atender o volume de contatos.
 
     Args:
@@ -45,16 +65,21 @@ def trunks_required(agents: float, contacts_per_interval: float, aht: int, inter
         contacts_per_interval (float): Contatos por intervalo.
         aht (int): Duração média do contato (em segundos).
         interval (float, optional): Intervalo de planejamento em segundos. Padrão: 600 (10 minutos).
+        blocking (float, optional): Grau de serviço (GoS) repassado a
+            :func:`number_trunks`. Padrão: 0.001.
 
     Returns:
         int: Número de trunks necessários.
 
     Raises:
-        InputValidationError: Se os parâmetros forem inválidos (negativos ou AHT não positivo).
+        InputValidationError: Se os parâmetros forem inválidos (negativos, AHT não positivo
+            ou GoS fora de (0, 1)).
         CalculationError: Se ocorrer erro durante o cálculo.
     """
     if agents < 0 or contacts_per_interval < 0 or aht <= 0:
         raise InputValidationError("Invalid values for 'agents', 'contacts_per_interval', or 'aht'.")
+    if not (0 < blocking < 1):
+        raise InputValidationError("The 'blocking' value must be in the range (0, 1).")
 
     try:
         birth_rate: float = contacts_per_interval
@@ -66,7 +91,7 @@ def trunks_required(agents: float, contacts_per_interval: float, aht: int, inter
         c: float = erlang_c(agents, traffic_rate)
         answer_time: float = c / (agents * death_rate * (1 - utilisation))
         r: float = birth_rate / (interval / (aht + secs(answer_time, interval)))
-        no_trunks: int = number_trunks(agents, r)
+        no_trunks: int = number_trunks(agents, r, blocking=blocking)
         if no_trunks < 1 and traffic_rate > 0:
             no_trunks = 1
         return no_trunks